@@ -0,0 +1,80 @@
+class AircraftRegistry:
+    """Objetos de cena das aeronaves remotas, indexados pelo player_id
+
+    Instâncias de JogadorTemplate são criadas escondidas no início da cena e
+    reaproveitadas quando jogadores entram e saem, evitando addObject no meio
+    de um frame.
+    """
+
+    def __init__(self, scene, template="JogadorTemplate", pool_size=8):
+        self.scene = scene
+        self.template = template
+        self.pool_size = pool_size
+        self.pool = []
+        self.objects = {}  # {player_id: objeto}
+
+    def prewarm(self):
+        """Criar as instâncias escondidas do pool"""
+        while len(self.pool) < self.pool_size:
+            self.pool.append(self._create())
+
+    def _create(self):
+        obj = self.scene.addObject(self.template, None, 0)
+        # Marca lida por Jogador.start para não controlar a aeronave localmente
+        obj["remoto"] = True
+        self._hide(obj)
+        return obj
+
+    def _hide(self, obj):
+        obj.setVisible(False, True)
+        obj.suspendDynamics()
+
+    def get(self, player_id):
+        """Objeto do jogador, ou None"""
+        return self.objects.get(player_id)
+
+    def acquire(self, player_id):
+        """Objeto do jogador, tirando uma instância do pool se for novo"""
+        obj = self.objects.get(player_id)
+        if obj is not None:
+            return obj
+
+        # Pool vazio: criar na hora, como antes
+        obj = self.pool.pop() if self.pool else self._create()
+        obj["player_id"] = player_id
+        obj.setVisible(True, True)
+        obj.restoreDynamics()
+        self.objects[player_id] = obj
+        return obj
+
+    def acquire_many(self, player_ids):
+        """Objetos de vários jogadores; o que faltar no pool é criado numa única passada"""
+        missing = sum(1 for player_id in player_ids if player_id not in self.objects) - len(self.pool)
+        for _ in range(missing):
+            self.pool.append(self._create())
+        return [self.acquire(player_id) for player_id in player_ids]
+
+    def release(self, player_id):
+        """Devolver o objeto do jogador ao pool"""
+        obj = self.objects.pop(player_id, None)
+        if obj is None or obj.invalid:
+            return
+        self._hide(obj)
+        if len(self.pool) < self.pool_size:
+            self.pool.append(obj)
+        else:
+            obj.endObject()
+
+    def items(self):
+        """Pares (player_id, objeto) das aeronaves ativas"""
+        return self.objects.items()
+
+
+def get_registry(scene, pool_size=8):
+    """Registro da cena, criado e preenchido na primeira chamada"""
+    registry = scene.get("aeronaves")
+    if registry is None:
+        registry = AircraftRegistry(scene, pool_size=pool_size)
+        registry.prewarm()
+        scene["aeronaves"] = registry
+    return registry
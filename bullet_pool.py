@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+# Só a malha do projétil, sem componente: quem move e testa é o ProjectileManager
+TEMPLATE = "BulletVisual"
+# Template antigo, com o componente Projetil, para cenas que ainda não têm o BulletVisual
+LEGACY_TEMPLATE = "BulletTemplate"
+
+
+class BulletPool:
+    """Objetos de projétil pré-criados e reaproveitados pelo ProjectileManager
+
+    Com o pool esgotado, a política "recycle" reaproveita o projétil ativo
+    mais antigo e "drop" recusa o tiro (acquire retorna None). A física dos
+    objetos fica suspensa: o movimento é feito pelo gerenciador.
+    """
+
+    def __init__(self, scene, template=TEMPLATE, size=64, on_exhausted="recycle"):
+        self.scene = scene
+        self.template = template
+        self.size = size
+        self.on_exhausted = on_exhausted
+        self.free = []
+        self.active = OrderedDict()  # {id(objeto): objeto}, do mais antigo ao mais novo
+        self.exhausted_count = 0
+
+    def prewarm(self):
+        """Criar as instâncias escondidas do pool"""
+        while len(self.free) + len(self.active) < self.size:
+            try:
+                obj = self.scene.addObject(self.template, None, 0)
+            except ValueError:
+                if self.template == LEGACY_TEMPLATE:
+                    raise
+                print(f"Template {self.template} não está na cena; usando {LEGACY_TEMPLATE}")
+                self.template = LEGACY_TEMPLATE
+                continue
+            self._hide(obj)
+            self.free.append(obj)
+
+    def _hide(self, obj):
+        obj.setVisible(False, True)
+        obj.setLinearVelocity([0, 0, 0])
+        obj.suspendDynamics()
+
+    def acquire(self, position, orientation):
+        """Mostrar um projétil na posição e orientação do tiro"""
+        if self.free:
+            obj = self.free.pop()
+        elif self.active and self.on_exhausted == "recycle":
+            self.exhausted_count += 1
+            _, obj = self.active.popitem(last=False)
+        else:
+            self.exhausted_count += 1
+            return None
+
+        obj.worldPosition = position
+        obj.worldOrientation = orientation
+        obj.setVisible(True, True)
+        self.active[id(obj)] = obj
+        return obj
+
+    def release(self, obj):
+        """Devolver um projétil expirado ou que acertou algo"""
+        if self.active.pop(id(obj), None) is None:
+            return
+        self._hide(obj)
+        self.free.append(obj)
@@ -0,0 +1,67 @@
+import math
+
+
+def extrapolar_posicao(posicao, velocidade, dt):
+    """Prever posição após dt segundos mantendo a velocidade constante"""
+    return [
+        posicao[0] + velocidade[0] * dt,
+        posicao[1] + velocidade[1] * dt,
+        posicao[2] + velocidade[2] * dt
+    ]
+
+
+def distancia(a, b):
+    """Distância euclidiana entre duas posições"""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def diferenca_angular(a, b):
+    """Maior diferença entre dois ângulos de Euler, normalizada para [0, pi]"""
+    maior = 0.0
+    for i in range(3):
+        diff = (a[i] - b[i] + math.pi) % (2 * math.pi) - math.pi
+        maior = max(maior, abs(diff))
+    return maior
+
+
+class PreditorDeadReckoning:
+    """Predição linear a partir do último estado conhecido de uma aeronave
+
+    O mesmo preditor roda em quem envia (para decidir quando transmitir) e em
+    quem recebe (para mover a aeronave remota entre atualizações).
+    """
+
+    def __init__(self, limite_posicao=0.5, limite_rotacao=0.05, intervalo_keyframe=1.0):
+        self.limite_posicao = limite_posicao
+        self.limite_rotacao = limite_rotacao
+        self.intervalo_keyframe = intervalo_keyframe
+        self.posicao = None
+        self.rotacao = None
+        self.velocidade = [0.0, 0.0, 0.0]
+        self.tempo = 0.0
+
+    def registrar(self, posicao, rotacao, velocidade, agora):
+        """Guardar o estado de referência usado pela predição"""
+        self.posicao = list(posicao)
+        self.rotacao = list(rotacao)
+        self.velocidade = list(velocidade) if velocidade else [0.0, 0.0, 0.0]
+        self.tempo = agora
+
+    def prever(self, agora):
+        """Posição prevista no instante informado"""
+        if self.posicao is None:
+            return None
+        return extrapolar_posicao(self.posicao, self.velocidade, agora - self.tempo)
+
+    def precisa_enviar(self, posicao, rotacao, agora):
+        """Verificar se o estado real se afastou demais da predição"""
+        if self.posicao is None:
+            return True
+        if agora - self.tempo >= self.intervalo_keyframe:
+            return True
+        if distancia(posicao, self.prever(agora)) > self.limite_posicao:
+            return True
+        return diferenca_angular(rotacao, self.rotacao) > self.limite_rotacao
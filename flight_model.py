@@ -0,0 +1,172 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # O caminho em lote é opcional fora do jogo
+    np = None
+
+# Passo fixo da simulação; as constantes abaixo são por passo, como eram por frame
+DT = 1.0 / 60.0
+
+
+class FlightParams:
+    """Constantes de voo, por passo de DT segundos"""
+
+    def __init__(self, speed=0.03, rotation_speed=0.005, boost=1.5, lift=0.04,
+                 fuel_burn=0.00005, fuel_burn_boost=0.00001, yaw_factor=0.2):
+        self.speed = speed
+        self.rotation_speed = rotation_speed
+        self.boost = boost
+        self.lift = lift
+        self.fuel_burn = fuel_burn
+        self.fuel_burn_boost = fuel_burn_boost
+        self.yaw_factor = yaw_factor
+
+    def max_speed(self):
+        """Velocidade máxima em m/s, usada também na validação do servidor"""
+        forward = self.speed * self.boost
+        return math.sqrt(forward * forward + self.lift * self.lift) / DT
+
+
+class FlightState:
+    """Estado de uma aeronave: posição, orientação (matriz 3x3), combustível e motor"""
+
+    def __init__(self, position=(0.0, 0.0, 0.0), orientation=None, fuel=100.0, engine_on=False):
+        self.position = [float(position[0]), float(position[1]), float(position[2])]
+        self.orientation = [list(row) for row in orientation] if orientation else identity()
+        self.fuel = fuel
+        self.engine_on = engine_on
+
+    def copy(self):
+        return FlightState(self.position, self.orientation, self.fuel, self.engine_on)
+
+
+class FlightInput:
+    """Comandos de um passo: pitch, roll e yaw em [-1, 1] e pós-combustão"""
+
+    def __init__(self, pitch=0.0, roll=0.0, yaw=0.0, boost=False):
+        self.pitch = pitch
+        self.roll = roll
+        self.yaw = yaw
+        self.boost = boost
+
+
+def identity():
+    return [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+
+def euler_to_matrix(x, y, z):
+    """Matriz de rotação de Euler XYZ (Rz @ Ry @ Rx)"""
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+    return [
+        [cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx],
+        [sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx],
+        [-sy, cy * sx, cy * cx]
+    ]
+
+
+def mat_mul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def mat_vec(m, v):
+    return [m[i][0] * v[0] + m[i][1] * v[1] + m[i][2] * v[2] for i in range(3)]
+
+
+def step(state, inputs, params):
+    """Avançar um passo de DT; retorna um novo estado sem alterar o recebido"""
+    new = state.copy()
+    if not state.engine_on:
+        return new
+
+    # Empuxo no eixo Y local, com a sustentação fixa em Z
+    if state.fuel > 0:
+        if inputs.boost:
+            local = [0.0, params.speed * params.boost, params.lift]
+            new.fuel -= params.fuel_burn_boost
+        else:
+            local = [0.0, params.speed, params.lift]
+            new.fuel -= params.fuel_burn
+        delta = mat_vec(state.orientation, local)
+        new.position = [state.position[i] + delta[i] for i in range(3)]
+
+    # Rotação local: pitch em X, roll em Y, yaw em Z
+    rs = params.rotation_speed
+    if inputs.pitch or inputs.roll or inputs.yaw:
+        rotation = euler_to_matrix(
+            inputs.pitch * rs,
+            inputs.roll * rs,
+            inputs.yaw * rs * params.yaw_factor
+        )
+        new.orientation = mat_mul(state.orientation, rotation)
+    return new
+
+
+class FixedTimestep:
+    """Acumula o tempo real e diz quantos passos fixos simular no frame"""
+
+    def __init__(self, dt=DT, max_steps=5):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """Número de passos para o tempo decorrido; o excesso de frames lentos é descartado"""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        return steps
+
+
+def euler_to_matrix_batch(x, y, z):
+    """Versão em lote de euler_to_matrix: arrays (N,) para (N, 3, 3)"""
+    cx, sx = np.cos(x), np.sin(x)
+    cy, sy = np.cos(y), np.sin(y)
+    cz, sz = np.cos(z), np.sin(z)
+    m = np.empty(x.shape + (3, 3))
+    m[:, 0, 0] = cz * cy
+    m[:, 0, 1] = cz * sy * sx - sz * cx
+    m[:, 0, 2] = cz * sy * cx + sz * sx
+    m[:, 1, 0] = sz * cy
+    m[:, 1, 1] = sz * sy * sx + cz * cx
+    m[:, 1, 2] = sz * sy * cx - cz * sx
+    m[:, 2, 0] = -sy
+    m[:, 2, 1] = cy * sx
+    m[:, 2, 2] = cy * cx
+    return m
+
+
+def step_batch(positions, orientations, fuel, engine_on, inputs, params):
+    """Avançar N aeronaves um passo de DT, alterando os arrays no lugar
+
+    positions (N, 3), orientations (N, 3, 3), fuel (N,), engine_on (N,) bool e
+    inputs (N, 4) com colunas pitch, roll, yaw e boost (0 ou 1).
+    """
+    if np is None:
+        raise RuntimeError("step_batch precisa do NumPy")
+
+    boost = inputs[:, 3] > 0
+    thrust = engine_on & (fuel > 0)
+
+    local = np.zeros((len(positions), 3))
+    local[:, 1] = np.where(boost, params.speed * params.boost, params.speed)
+    local[:, 2] = params.lift
+    local[~thrust] = 0.0
+
+    positions += np.einsum('nij,nj->ni', orientations, local)
+    fuel -= np.where(thrust, np.where(boost, params.fuel_burn_boost, params.fuel_burn), 0.0)
+
+    rs = params.rotation_speed
+    turning = engine_on & np.any(inputs[:, :3] != 0, axis=1)
+    if turning.any():
+        rotation = euler_to_matrix_batch(
+            inputs[turning, 0] * rs,
+            inputs[turning, 1] * rs,
+            inputs[turning, 2] * rs * params.yaw_factor
+        )
+        orientations[turning] = orientations[turning] @ rotation
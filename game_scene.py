@@ -1,23 +1,64 @@
 from Range import *
+import network_session
+import profiler
+import startup
+from aircraft_registry import get_registry
+from projectile_manager import get_projectile_manager
+from input_map import get_input_map
 
 class GameScene(types.KX_PythonComponent):
-    args = []
+    args = [
+        ("pool_aeronaves", 8),  # Aeronaves remotas pré-criadas no início da cena
+        ("pool_projeteis", 64),  # Projéteis pré-criados no início da cena
+        ("pool_projeteis_esgotado", "recycle"),  # "recycle" reusa o mais antigo, "drop" recusa o tiro
+    ]
     
     def start(self, args):
         print("GameScene iniciada!")
+        self.jogador = None
+        self.descartada = False
+        profiler.instrument(self)
         
-        # Recuperar player_id e client das variáveis globais
+        scene = logic.getCurrentScene()
+        if not startup.get_pipeline().aceitar_cena(scene):
+            print("Aviso: GameScene duplicada pela troca de cena, encerrando")
+            self.descartada = True
+            scene.end()
+            return
+        
+        # Pré-criar aeronaves remotas e projéteis antes da partida começar
+        self.aeronaves = get_registry(scene, args.get("pool_aeronaves", 8))
+        self.projeteis = get_projectile_manager(
+            scene,
+            args.get("pool_projeteis", 64),
+            args.get("pool_projeteis_esgotado", "recycle")
+        )
+        
+        # Teclado lido uma vez por frame aqui; os componentes se inscrevem nas ações
+        self.input = get_input_map(scene)
+        self.input.on("perfil", self.on_perfil)
+        
+        # Lido pelo StartupPipeline, que mantém a cena suspensa até o login terminar
+        scene["carregada"] = True
+        
+        # Carregada em segundo plano, o jogador só é criado depois do login
+        if not self.criar_jogador():
+            print("Aguardando login para criar o jogador")
+    
+    def criar_jogador(self):
+        """Criar o jogador local; False enquanto não houver sessão autenticada"""
+        # Recuperar player_id e a conexão autenticada da sessão
         self.player_id = logic.globalDict.get("player_id")
-        self.client = logic.globalDict.get("game_client")
+        self.client = network_session.current_client()
         
         if not self.player_id or not self.client:
-            print("Erro: player_id ou client não encontrados!")
-            return
+            return False
             
         print(f"Criando jogador com ID: {self.player_id}")
         
-        # Criar jogador na posição inicial
         scene = logic.getCurrentScene()
+        
+        # Criar jogador na posição inicial
         spawn_point = scene.objects.get("SpawnPoint")
         if spawn_point:
             pos = spawn_point.worldPosition
@@ -28,19 +69,40 @@ class GameScene(types.KX_PythonComponent):
         # Criar jogador
         jogador = scene.addObject("JogadorTemplate", None, 0)
         jogador.worldPosition = pos
+        self.jogador = jogador
         
-        # Configurar componente do jogador
-        jogador_comp = jogador.components.get("Jogador")
-        if jogador_comp:
-            jogador_comp["player_id"] = self.player_id
+        # Propriedade lida por Jogador.start, que roda depois deste frame
+        jogador["player_id"] = self.player_id
+        if jogador.components.get("Jogador"):
             print(f"Jogador {self.player_id} criado com sucesso!")
         else:
             print("Erro: Componente Jogador não encontrado!")
+        return True
+    
+    def on_perfil(self, pressionada):
+        # Com TLA_PROFILE=1, F9 grava um dump
+        if pressionada:
+            profiler.dump("tecla")
     
     def update(self):
-        pass
+        if self.descartada:
+            return
+        
+        # Com TLA_PROFILE=1, fecha o frame do profiler
+        profiler.end_frame()
+        self.input.update()
+        
+        if not self.jogador and not self.criar_jogador():
+            return
+        
+        # Todos os projéteis numa passada, contra a lista de aeronaves do frame
+        aeronaves = [self.jogador]
+        aeronaves.extend(self.aeronaves.objects.values())
+        self.projeteis.update(aeronaves)
     
     def on_remove(self):
-        # Fechar cliente quando a cena for removida
-        if self.client:
-            self.client.close() 
\ No newline at end of file
+        # Cena duplicada, ou abandonada pelo startup no timeout: a sessão é da que a substituiu
+        if self.object.scene.get("descartada") or self.descartada:
+            return
+        # Fechar a conexão da sessão quando a partida termina
+        network_session.shutdown() 
\ No newline at end of file
@@ -0,0 +1,504 @@
+"""Verificações de comportamento do servidor e do cliente, fora do engine
+
+Cada verificação monta o que precisa (validadores, um servidor local numa
+porta livre, clientes com arquivos temporários) e falha com AssertionError
+quando o comportamento esperado não acontece.
+
+    python headless/checks.py              # todas
+    python headless/checks.py voo_normal   # só as escolhidas
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from types import SimpleNamespace
+
+import numpy as np
+import websockets
+from websockets.sync.client import connect as connect_socket
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(HERE, "stubs"))
+try:
+    import mathutils  # noqa: F401
+except ImportError:
+    sys.path.append(os.path.join(HERE, "fallback"))
+
+import server  # noqa: E402
+import jogador  # noqa: E402
+from dead_reckoning import PreditorDeadReckoning, distancia  # noqa: E402
+from projectile_manager import ProjectileManager  # noqa: E402
+from Range._engine import GameObject, Scene  # noqa: E402
+from flight_model import FlightParams, FlightState, FlightInput, FixedTimestep, step  # noqa: E402
+from movement_validation import MovementValidator  # noqa: E402
+from local_store import LocalStore  # noqa: E402
+from stats_journal import StatsJournal  # noqa: E402
+from websocket_client import GameClient  # noqa: E402
+
+CHECKS = {}
+
+
+def check(fn):
+    CHECKS[fn.__name__[len("check_"):]] = fn
+    return fn
+
+
+class LocalServer:
+    """GameServer numa thread própria, numa porta livre e num diretório temporário
+
+    O diretório vira o de trabalho enquanto o servidor roda, então o game.db
+    e o player_data.json dos clientes ficam nele.
+    """
+
+    def __enter__(self):
+        self.cwd = os.getcwd()
+        self.dir = tempfile.TemporaryDirectory()
+        os.chdir(self.dir.name)
+        self.game = server.GameServer()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=asyncio.run, args=(self._serve(),))
+        self.thread.daemon = True
+        self.thread.start()
+        assert self.ready.wait(5.0), "servidor não abriu a porta"
+        self.url = f"ws://127.0.0.1:{self.port}"
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.stopping.set)
+        self.thread.join(5.0)
+        os.chdir(self.cwd)
+        self.dir.cleanup()
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        async with websockets.serve(self.game.handle_connection, "127.0.0.1", 0) as listener:
+            self.port = listener.sockets[0].getsockname()[1]
+            ticks = asyncio.ensure_future(self.game.run_ticks())
+            self.ready.set()
+            await self.stopping.wait()
+            ticks.cancel()
+
+    def drop_connections(self):
+        """Fechar do lado do servidor todas as conexões, como numa queda de rede"""
+        def drop():
+            for websocket in list(self.game.players):
+                websocket.transport.abort()
+        self.loop.call_soon_threadsafe(drop)
+
+
+class Session:
+    """Conexão crua com o servidor, para mandar o que o GameClient não mandaria"""
+
+    def __init__(self, url, email):
+        self.ws = connect_socket(url)
+        self.send({"type": "login", "email": email, "password": "senha"})
+        self.player_id = self.receive("login_response")["player_id"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.ws.close()
+
+    def send(self, message):
+        self.ws.send(json.dumps(message))
+
+    def receive(self, kind, timeout=5.0):
+        """Próxima mensagem do tipo kind, descartando as outras"""
+        deadline = time.time() + timeout
+        while True:
+            data = json.loads(self.ws.recv(timeout=max(deadline - time.time(), 0.01)))
+            if data.get("type") == kind:
+                return data
+
+    def position(self, position):
+        self.send({
+            "type": "position", "player_id": self.player_id, "position": position,
+            "rotation": [0, 0, 0], "time": time.time()
+        })
+
+
+def connect(url):
+    client = GameClient(auto_connect=False)
+    client.server_url = url
+    client.connect()
+    assert client.connected, "cliente não conectou"
+    return client
+
+
+def wait_for(client, condition, what, timeout=5.0):
+    """Rodar os frames do cliente até condition() valer; falha depois de timeout"""
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, f"timeout esperando {what}"
+        client.process_events()
+        client.flush()
+        time.sleep(0.02)
+
+
+def fly(params, seconds, rng, drift=(0.0, 0.0, 0.0)):
+    """Voo roteirizado a 60 fps com jitter e travadas; retorna [(horário, posição)] por frame
+
+    drift, em m/s, é somado ao voo como o movimento feito pela física.
+    """
+    state = FlightState((0.0, 0.0, 1000.0), engine_on=True)  # Alto o bastante para cair sem sair do mapa
+    timestep = FixedTimestep()
+    inputs = FlightInput()
+    now, frames = 0.0, []
+    while now < seconds:
+        # Troca de comandos de vez em quando, com boost em boa parte do tempo
+        if rng.random() < 0.02:
+            inputs = FlightInput(
+                pitch=rng.choice((-1, 0, 1)), roll=rng.choice((-1, 0, 1)),
+                yaw=rng.choice((-1, 0, 1)), boost=rng.random() < 0.6
+            )
+        elapsed = 0.1 if rng.random() < 0.01 else rng.uniform(0.012, 0.022)
+        now += elapsed
+        for _ in range(timestep.advance(elapsed)):
+            state = step(state, inputs, params)
+        frames.append((now, [state.position[i] + drift[i] * now for i in range(3)]))
+    return frames
+
+
+def serve(frames, validator, rng, tick=1.0 / server.TICK_RATE):
+    """Passar o voo pelo validador como o servidor faria; retorna quantas posições foram corrigidas
+
+    O cliente envia a cada 0.1 a 1 s (dead reckoning com keyframe), cada
+    pacote chega com latência variável, e a cada tick só o último pacote
+    chegado é validado, contra o tempo do servidor desde a última aceita.
+    """
+    packets, next_send, last = [], 0.0, None
+    for now, position in frames:
+        if now < next_send:
+            continue
+        velocity = [0.0, 0.0, 0.0]
+        if last is not None:
+            velocity = [(position[i] - last[1][i]) / (now - last[0]) for i in range(3)]
+        packets.append((now + rng.uniform(0.03, 0.15), now, position, velocity))
+        last = (now, position)
+        next_send = now + rng.uniform(0.1, 1.0)
+    packets.sort()
+
+    accepted, validated_at, client_time = None, None, np.nan
+    corrected, index, server_time = 0, 0, 0.0
+    while index < len(packets):
+        server_time += tick
+        pending = None
+        while index < len(packets) and packets[index][0] <= server_time:
+            pending = packets[index]
+            index += 1
+        if pending is None:
+            continue
+        _, sent, position, velocity = pending
+        previous = accepted if accepted is not None else position
+        result = validator.validate(
+            np.array([previous], dtype=float), np.array([position], dtype=float),
+            np.zeros((1, 3)), np.array([velocity], dtype=float),
+            np.array([server_time - validated_at if validated_at is not None else np.inf]),
+            np.array([sent]), np.array([client_time])
+        )
+        if not result.accepted[0]:
+            continue
+        corrected += int(result.corrected[0])
+        accepted = result.positions[0].tolist()
+        validated_at, client_time = server_time, sent
+    return corrected
+
+
+@check
+def check_voo_normal():
+    """Voo legítimo na velocidade configurada nunca é corrigido pelo servidor"""
+    rng = random.Random(47)
+    # O speed das cenas, e uma cena que o aumentou junto com FLIGHT_SPEED
+    for speed in (server.FLIGHT_SPEED, server.FLIGHT_SPEED * 4):
+        validator = MovementValidator(server.speed_limit(speed), server.FALL_SPEED)
+        for _ in range(5):
+            frames = fly(FlightParams(speed=speed), 60.0, rng)
+            corrected = serve(frames, validator, rng)
+            assert corrected == 0, f"speed {speed}: {corrected} posições corrigidas"
+
+    # Caindo na velocidade da queda ao mesmo tempo, também não
+    validator = MovementValidator(server.speed_limit(), server.FALL_SPEED)
+    frames = fly(FlightParams(), 60.0, rng, drift=(0.0, 0.0, -server.FALL_SPEED))
+    assert serve(frames, validator, rng) == 0, "a queda foi corrigida"
+
+    # Mas o mesmo voo rápido com o speed padrão, ou a folga da queda usada na
+    # horizontal, é corrigido
+    frames = fly(FlightParams(speed=server.FLIGHT_SPEED * 4), 60.0, rng)
+    assert serve(frames, validator, rng) > 0, "o voo rápido passou pelo limite do speed padrão"
+    frames = fly(FlightParams(), 60.0, rng, drift=(server.FALL_SPEED, 0.0, 0.0))
+    assert serve(frames, validator, rng) > 0, "a folga da queda valeu na horizontal"
+
+
+@check
+def check_movimento_sem_horario():
+    """Depois do primeiro horário aceito, pacote sem horário ou repetido é descartado"""
+    validator = MovementValidator(server.speed_limit(), server.FALL_SPEED)
+    zeros = np.zeros((3, 3))
+    result = validator.validate(
+        zeros, zeros, zeros, zeros, np.full(3, 0.1),
+        np.array([np.nan, 10.0, 10.5]), np.array([10.0, 10.0, np.nan])
+    )
+    assert result.accepted.tolist() == [False, False, True], result.accepted
+
+
+@check
+def check_reconexao_sem_teleporte():
+    """Quem reconecta continua da última posição aceita, sem salto livre"""
+    with LocalServer() as local:
+        with Session(local.url, "teleporte@teste") as session:
+            session.position([0.0, 0.0, 100.0])
+            time.sleep(3.0 / server.TICK_RATE)
+        time.sleep(0.1)
+        with Session(local.url, "teleporte@teste") as session:
+            session.position([5000.0, 0.0, 100.0])
+            correction = session.receive("position_correction")
+            assert correction["position"][0] < 100.0, correction
+
+
+@check
+def check_voo_reto_remoto():
+    """Aeronave remota em voo reto anda todo frame, sem congelar nem saltar no keyframe"""
+    args = SimpleNamespace(**dict(jogador.Jogador.args))
+    buffer = jogador.Jogador.novo_buffer(args)
+    preditor = PreditorDeadReckoning(args.sync_limite_posicao, args.sync_limite_rotacao, args.sync_keyframe)
+    velocidade = [0.0, FlightParams().max_speed(), 0.0]
+    passo = velocidade[1] / 60.0
+
+    chegadas, parados, maior = [], 0, 0.0
+    anterior = None
+    for frame in range(600):
+        agora = frame / 60.0
+        posicao = [0.0, velocidade[1] * agora, 100.0]
+        # Quem envia: dead reckoning a cada sync_interval, chegada com latência
+        if frame % 6 == 0 and preditor.precisa_enviar(posicao, [0.0, 0.0, 0.0], agora):
+            preditor.registrar(posicao, [0.0, 0.0, 0.0], velocidade, agora)
+            chegadas.append((agora + 0.08, agora, posicao))
+        while chegadas and chegadas[0][0] <= agora:
+            _, tempo, enviada = chegadas.pop(0)
+            buffer.adicionar(tempo, enviada, jogador.orientacao_de_euler([0.0, 0.0, 0.0]), velocidade)
+
+        estado = buffer.amostrar(agora)
+        if estado is None or frame < 60:
+            continue
+        atual = list(estado[0])
+        if anterior is not None:
+            deslocamento = distancia(atual, anterior)
+            parados += deslocamento < passo / 2
+            maior = max(maior, deslocamento)
+        anterior = atual
+    assert parados == 0, f"{parados} frames sem movimento"
+    assert maior < passo * 2, f"salto de {maior:.2f} m num frame (passo normal {passo:.2f} m)"
+
+
+def disparo_contra(obstaculo):
+    """Atirar de 0 numa aeronave a 50 m, com ou sem obstáculo no meio; retorna os acertos"""
+    scene = Scene("checks", {})
+    atirador, alvo = GameObject("Atirador", scene), GameObject("Alvo", scene)
+    alvo.worldPosition = (0.0, 50.0, 0.0)
+    if obstaculo:
+        scene.obstacles.append((GameObject("Rocha", scene), (0.0, 25.0, 0.0), 5.0))
+
+    manager = ProjectileManager(scene, capacity=4)
+    acertos = []
+    manager.on_hit(lambda atirador, alvo, dano, tag: acertos.append(alvo))
+    manager.disparar((0.0, 0.0, 0.0), atirador.worldOrientation, (0.0, 200.0, 0.0), atirador)
+    fim = time.time() + 0.5
+    while time.time() < fim and manager.ativo.any():
+        time.sleep(1 / 60)
+        manager.update([atirador, alvo])
+    return acertos
+
+
+@check
+def check_projetil_e_cenario():
+    """Projétil acerta a aeronave em campo aberto, mas não através de um obstáculo"""
+    assert len(disparo_contra(obstaculo=False)) == 1, "o tiro em campo aberto não acertou"
+    assert disparo_contra(obstaculo=True) == [], "o tiro atravessou o obstáculo"
+
+
+@check
+def check_morte_por_colisao():
+    """Batidas no cenário causam dano uma vez por contato e a morte vai para o diário"""
+    import harness as headless
+    import network_session
+    from Range import logic
+
+    h = headless.Harness(headless.default_templates())
+    try:
+        script = headless.scenario_partida(h, 1)
+        h.run(5, script)
+        objeto = next(obj for obj in h.scene.objects if obj.name == "JogadorTemplate" and "remoto" not in obj)
+        jogador = objeto.components.get("Jogador")
+        client = network_session.current_client()
+        rocha = GameObject("Rocha", h.scene)
+        remoto = next(obj for obj in h.scene.objects if "remoto" in obj)
+
+        def tocar(outro, frames):
+            for _ in range(frames):
+                for callback in objeto.collisionCallbacks:
+                    callback(outro)
+                h.run(1, script)
+
+        tocar(remoto, 3)
+        assert jogador.health == jogador.max_health, "o contato com outra aeronave causou dano"
+        tocar(rocha, 3)
+        assert jogador.health == jogador.max_health - jogador.dano_colisao, "um contato contínuo deu dano mais de uma vez"
+        h.run(1, script)
+        tocar(rocha, 1)
+        assert jogador.is_dead, "a segunda batida não matou"
+        assert client.sent["stats:death"] == 1, "a morte por colisão não foi para o diário"
+    finally:
+        logic._scenes.clear()
+        network_session.use_client(None)
+
+
+@check
+def check_troca_de_cena_no_timeout():
+    """Com a carga em segundo plano atrasada, a troca pelo caminho antigo mantém a sessão"""
+    import harness as headless
+    import network_session
+    import startup
+    from Range import logic
+
+    logic._libraries["lenta.range"] = logic.LibLoadStatus()
+    startup._pipeline = startup.StartupPipeline(bibliotecas=["lenta.range"], timeout_cena=2.0)
+    try:
+        h = headless.Harness(headless.default_templates())
+        h.run(300, headless.scenario_login(h, 0))
+        assert startup._pipeline.substituida, "a troca pelo caminho antigo não aconteceu"
+        assert network_session.current_client() is not None, "a cena descartada encerrou a sessão"
+        partidas = [c for c in h.components if type(c).__name__ == "GameScene" and not c.descartada]
+        assert len(partidas) == 1 and partidas[0].jogador is not None, "a partida nova não criou o jogador"
+    finally:
+        logic._libraries.clear()
+        logic._scenes.clear()
+        startup._pipeline = None
+        network_session.use_client(None)
+
+
+@check
+def check_diario_apos_login():
+    """Eventos pendentes gravados em disco continuam no diário depois de um novo login"""
+    with LocalServer() as local:
+        client = connect(local.url)
+        assert client.login("diario@teste", "senha")["success"]
+        player_id = client.player_id
+        client.close()
+
+        # Mortes registradas sem conexão, gravadas no arquivo do cliente
+        store = LocalStore(client.local_data_file)
+        store.load()
+        journal = StatsJournal(store, player_id)
+        for _ in range(3):
+            journal.record("death", 1)
+        store.close()
+
+        client = connect(local.url)
+        try:
+            assert client.login("diario@teste", "senha")["success"]
+            wait_for(client, lambda: client.server_stats.get("deaths") == 3 and not client.journal.pending(),
+                     "o ack das 3 mortes gravadas")
+        finally:
+            client.close()
+
+
+@check
+def check_reconexao():
+    """Depois de uma queda o cliente refaz o login sozinho e o diário é confirmado"""
+    with LocalServer() as local:
+        client = connect(local.url)
+        try:
+            assert client.login("reconexao@teste", "senha")["success"]
+            player_id = client.player_id
+            local.drop_connections()
+            wait_for(client, lambda: not client.connected, "a queda")
+
+            # Registrado sem conexão; só pode ser enviado depois do relogin
+            client.record_stat("death", 1)
+            wait_for(client, lambda: client.logged_in, "o relogin", timeout=10.0)
+            assert [p['id'] for p in local.game.players.values()] == [player_id]
+            wait_for(client, lambda: client.server_stats.get("deaths") == 1 and not client.journal.pending(),
+                     "o ack da morte registrada na queda")
+        finally:
+            client.close()
+
+
+@check
+def check_estatisticas_do_servidor():
+    """Pontos e abates vêm só de acertos validados; o que o diário alega não conta"""
+    with LocalServer() as local, Session(local.url, "atirador@teste") as shooter, \
+            Session(local.url, "alvo@teste") as target:
+        shooter.position([0.0, 0.0, 0.0])
+        target.position([0.0, 50.0, 0.0])
+        time.sleep(3.0 / server.TICK_RATE)
+
+        # Pontos e um abate alegados pelo diário são ignorados; a morte conta
+        shooter.send({
+            "type": "stats_batch", "journal": "diario", "first_seq": 1,
+            "events": [["score", 1000], ["death", 1, target.player_id]]
+        })
+        ack = shooter.receive("stats_ack")
+        assert ack["seq"] == 2 and ack["stats"] == {"score": 0, "kills": 0, "deaths": 1}, ack
+
+        # Lote que pula sequências é recusado
+        shooter.send({"type": "stats_batch", "journal": "diario", "first_seq": 5, "events": [["death", 1]]})
+        ack = shooter.receive("stats_ack")
+        assert ack["seq"] == 2 and ack["stats"] == {"score": 0, "kills": 0, "deaths": 1}, ack
+
+        # Quatro acertos de 25 zeram a vida do alvo: pontos por acerto e o abate
+        for seq in range(1, 6):
+            shooter.send({
+                "type": "shot", "player_id": shooter.player_id, "seq": seq, "time": time.time(),
+                "position": [0.0, 0.0, 0.0], "direction": [0.0, 1.0, 0.0]
+            })
+            assert shooter.receive("shot_ack")["accepted"]
+            shooter.send({"type": "damage", "seq": seq, "target_id": target.player_id, "amount": 25})
+            hit = shooter.receive("hit_ack")
+            if seq == 5:
+                assert hit["reason"] == "dead", hit
+                break
+            assert hit["accepted"], hit
+            stats = shooter.receive("stats_update")["stats"]
+            time.sleep(0.2)
+        assert stats == {"score": 4 * server.HIT_SCORE + server.KILL_SCORE, "kills": 1, "deaths": 1}, stats
+        assert target.receive("stats_update")["stats"] == {"score": 0, "kills": 0, "deaths": 1}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("checks", nargs="*", metavar="verificação", help=", ".join(sorted(CHECKS)))
+    options = parser.parse_args(argv)
+    unknown = set(options.checks) - set(CHECKS)
+    if unknown:
+        parser.error(f"verificações desconhecidas: {', '.join(sorted(unknown))}")
+
+    # O servidor e o cliente imprimem bastante; manter só o resultado na saída
+    logging.disable(logging.CRITICAL)
+    failed = 0
+    for name in options.checks or sorted(CHECKS):
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                CHECKS[name]()
+        except Exception:
+            failed += 1
+            print(f"FALHOU {name}")
+            traceback.print_exc()
+        else:
+            print(f"ok     {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Subconjunto puro-Python do mathutils usado pelos componentes do jogo
+
+Só é carregado pelo harness headless quando o mathutils real não está
+instalado. Implementa apenas o que Jogador, HUD e interpolacao usam.
+"""
+import math
+
+
+class Vector:
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._v = [float(v) for v in values]
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, i):
+        return self._v[i]
+
+    def __setitem__(self, i, value):
+        self._v[i] = float(value)
+
+    def __repr__(self):
+        return f"Vector({tuple(self._v)})"
+
+    def _get(i):
+        return property(lambda self: self._v[i], lambda self, value: self.__setitem__(i, value))
+
+    x = _get(0)
+    y = _get(1)
+    z = _get(2)
+    del _get
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._v, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._v, other))
+
+    def __mul__(self, scalar):
+        return Vector(a * scalar for a in self._v)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Vector(-a for a in self._v)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return False
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._v, other))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self))
+
+    def copy(self):
+        return Vector(self._v)
+
+    def lerp(self, other, factor):
+        return Vector(a + (b - a) * factor for a, b in zip(self._v, other))
+
+
+class Matrix:
+    def __init__(self, rows=((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))):
+        self._m = [[float(v) for v in row] for row in rows]
+
+    def __iter__(self):
+        return (Vector(row) for row in self._m)
+
+    def __getitem__(self, i):
+        return Vector(self._m[i])
+
+    def __repr__(self):
+        return f"Matrix({self._m})"
+
+    @classmethod
+    def Identity(cls, size):
+        return cls([[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def Rotation(cls, angle, size, axis):
+        c, s = math.cos(angle), math.sin(angle)
+        if axis == 'X':
+            rows = [[1, 0, 0], [0, c, -s], [0, s, c]]
+        elif axis == 'Y':
+            rows = [[c, 0, s], [0, 1, 0], [-s, 0, c]]
+        else:
+            rows = [[c, -s, 0], [s, c, 0], [0, 0, 1]]
+        return cls(rows)
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            b = other._m
+            return Matrix([[sum(self._m[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)])
+        v = list(other)
+        return Vector(sum(self._m[i][k] * v[k] for k in range(3)) for i in range(3))
+
+    def copy(self):
+        return Matrix(self._m)
+
+    def to_euler(self):
+        m = self._m
+        y = math.asin(max(-1.0, min(1.0, -m[2][0])))
+        x = math.atan2(m[2][1], m[2][2])
+        z = math.atan2(m[1][0], m[0][0])
+        return Euler((x, y, z))
+
+    def to_quaternion(self):
+        m = self._m
+        trace = m[0][0] + m[1][1] + m[2][2]
+        if trace > 0:
+            s = math.sqrt(trace + 1.0) * 2
+            return Quaternion(((0.25 * s), (m[2][1] - m[1][2]) / s, (m[0][2] - m[2][0]) / s, (m[1][0] - m[0][1]) / s))
+        if m[0][0] > m[1][1] and m[0][0] > m[2][2]:
+            s = math.sqrt(1.0 + m[0][0] - m[1][1] - m[2][2]) * 2
+            return Quaternion(((m[2][1] - m[1][2]) / s, 0.25 * s, (m[0][1] + m[1][0]) / s, (m[0][2] + m[2][0]) / s))
+        if m[1][1] > m[2][2]:
+            s = math.sqrt(1.0 + m[1][1] - m[0][0] - m[2][2]) * 2
+            return Quaternion(((m[0][2] - m[2][0]) / s, (m[0][1] + m[1][0]) / s, 0.25 * s, (m[1][2] + m[2][1]) / s))
+        s = math.sqrt(1.0 + m[2][2] - m[0][0] - m[1][1]) * 2
+        return Quaternion(((m[1][0] - m[0][1]) / s, (m[0][2] + m[2][0]) / s, (m[1][2] + m[2][1]) / s, 0.25 * s))
+
+
+class Euler(Vector):
+    def __init__(self, angles=(0.0, 0.0, 0.0), order='XYZ'):
+        super().__init__(angles)
+        self.order = order
+
+    def to_matrix(self):
+        return Matrix.Rotation(self.z, 3, 'Z') @ Matrix.Rotation(self.y, 3, 'Y') @ Matrix.Rotation(self.x, 3, 'X')
+
+    def to_quaternion(self):
+        return self.to_matrix().to_quaternion()
+
+
+class Quaternion:
+    def __init__(self, values=(1.0, 0.0, 0.0, 0.0)):
+        self.w, self.x, self.y, self.z = (float(v) for v in values)
+
+    def __iter__(self):
+        return iter((self.w, self.x, self.y, self.z))
+
+    def copy(self):
+        return Quaternion(self)
+
+    def slerp(self, other, factor):
+        a = list(self)
+        b = list(other)
+        dot = sum(p * q for p, q in zip(a, b))
+        if dot < 0:
+            b = [-q for q in b]
+            dot = -dot
+        if dot > 0.9995:
+            result = [p + (q - p) * factor for p, q in zip(a, b)]
+        else:
+            theta = math.acos(dot)
+            sin_theta = math.sin(theta)
+            wa = math.sin((1 - factor) * theta) / sin_theta
+            wb = math.sin(factor * theta) / sin_theta
+            result = [wa * p + wb * q for p, q in zip(a, b)]
+        norm = math.sqrt(sum(v * v for v in result))
+        return Quaternion(v / norm for v in result)
+
+    def to_matrix(self):
+        w, x, y, z = self.w, self.x, self.y, self.z
+        return Matrix([
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)]
+        ])
@@ -0,0 +1,482 @@
+"""Rodar componentes do jogo sem o engine e medir o custo por frame
+
+Carrega o pacote Range de headless/stubs no lugar do engine, instancia os
+componentes dos templates, avança N frames com entrada roteirizada e um
+relógio virtual, e reporta o tempo de update (e opcionalmente as alocações)
+por classe de componente, além das chamadas feitas ao engine.
+
+    python headless/harness.py --scenario partida --frames 600 --remotos 8
+    python headless/harness.py --scenario login --alloc --json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque, Counter
+from concurrent.futures import Future
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(HERE, "stubs"))
+try:
+    import mathutils  # noqa: F401
+except ImportError:
+    # Só usar o substituto puro-Python quando o mathutils real não existe
+    sys.path.append(os.path.join(HERE, "fallback"))
+
+from Range import logic, events, render  # noqa: E402
+from Range._engine import GameObject, Scene  # noqa: E402
+import network_session  # noqa: E402
+import profiler  # noqa: E402
+
+
+class VirtualClock:
+    """Substitui time.time para os frames avançarem em passos fixos
+
+    time.perf_counter continua real, e é ele que mede os componentes.
+    """
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+        self._original = None
+
+    def time(self):
+        return self.now
+
+    def advance(self, dt):
+        self.now += dt
+
+    def install(self):
+        self._original = time.time
+        time.time = self.time
+
+    def uninstall(self):
+        if self._original:
+            time.time = self._original
+            self._original = None
+
+
+class HeadlessClient:
+    """Cliente sem rede com a mesma interface usada pelos componentes
+
+    Eventos injetados pelo roteiro são entregues em process_events, e as
+    mensagens que seriam enviadas ficam contadas em `sent`.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.callbacks = {}
+        self.inbound_events = deque()
+        self.sent = Counter()
+        self.player_id = None
+        self.timeout = 15
+        self.connect_timeout = 10
+        self.max_events_per_frame = 64
+        self.event_budget = 0.004
+        self.remote_players = {}
+        self.radar = None
+
+    def _resolved(self, value):
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def connect_async(self):
+        return self._resolved(True)
+
+    def login_async(self, email, password):
+        self.player_id = email.split("@")[0] or "local"
+        return self._resolved({"type": "login_response", "success": True, "player_id": self.player_id})
+
+    def inject(self, data):
+        """Entregar um evento como se tivesse chegado do servidor"""
+        self.inbound_events.append(data)
+
+    def process_events(self):
+        processed = 0
+        while self.inbound_events and processed < self.max_events_per_frame:
+            data = self.inbound_events.popleft()
+            if data.get("type") == "position_update":
+                self.remote_players[data["player_id"]] = data
+            callback = self.callbacks.get(data.get("type"))
+            if callback:
+                callback(data)
+            processed += 1
+        return processed
+
+    def server_time(self):
+        return self.clock.time()
+
+    def on(self, event_type, callback):
+        self.callbacks[event_type] = profiler.wrap("net." + event_type, callback)
+
+    def send_message(self, message):
+        self.sent[message.get("type")] += 1
+
+    def flush(self):
+        pass
+
+    def update_position(self, player_id, position, rotation, velocity=None, health=None):
+        self.send_message({"type": "position_update"})
+
+    def send_respawn(self, position, rotation):
+        self.send_message({"type": "respawn"})
+
+    def send_shot(self, player_id, position, direction, tick=0):
+        self.send_message({"type": "shot"})
+        return None
+
+    def send_damage(self, target_id, amount, seq=None):
+        self.send_message({"type": "damage"})
+        return False
+
+    def get_net_stats(self):
+        return {
+            "rtt": None, "msgs_in": 0, "bytes_in": 0, "msgs_out": 0, "bytes_out": 0,
+            "send_queue": 0, "dropped": 0, "reconnects": 0, "tick_age": None
+        }
+
+    def get_radar(self):
+        return self.radar
+
+    def get_hit_markers(self):
+        return []
+
+    def record_stat(self, kind, amount=1, *extra):
+        self.sent["stats:" + kind] += 1
+
+    def get_stats(self):
+        return {"score": 0, "kills": 0, "deaths": 0}
+
+    def get_other_players(self):
+        return self.remote_players
+
+    def get_remote_player(self, player_id):
+        return self.remote_players.get(player_id)
+
+    def close(self):
+        pass
+
+
+class ComponentStats:
+    def __init__(self):
+        self.times = []
+        self.alloc_bytes = 0
+        self.alloc_peak = 0
+
+    def summary(self, frames):
+        times = sorted(self.times)
+        if not times:
+            return {"calls": 0}
+        total = sum(times)
+        return {
+            "calls": len(times),
+            "total_ms": total * 1000,
+            "per_frame_ms": total * 1000 / max(frames, 1),
+            "mean_us": total / len(times) * 1e6,
+            "p50_us": times[len(times) // 2] * 1e6,
+            "p99_us": times[min(len(times) - 1, int(len(times) * 0.99))] * 1e6,
+            "max_us": times[-1] * 1e6,
+            "alloc_kb": self.alloc_bytes / 1024,
+            "alloc_peak_kb": self.alloc_peak / 1024,
+        }
+
+
+class Harness:
+    """Cena simulada que instancia componentes e avança frames"""
+
+    def __init__(self, templates, dt=1.0 / 60.0, track_alloc=False):
+        self.templates = templates
+        self.dt = dt
+        self.track_alloc = track_alloc
+        self.clock = VirtualClock()
+        self.pending = []  # (componente, args) aguardando start
+        self.components = []
+        self.stats = defaultdict(ComponentStats)
+        self.frame = 0
+        self.scene = None
+        self.scenes = []
+        self.scene_builders = {}  # {nome: função(harness)} para addScene e replace
+
+    def new_scene(self, name):
+        """Criar uma cena ativa; add_object passa a colocar objetos nela"""
+        self.scene = Scene(name, self.templates, self)
+        self.scenes.append(self.scene)
+        logic._scenes.append(self.scene)
+        logic._set_scene(self.scene)
+        builder = self.scene_builders.get(name)
+        if builder:
+            builder(self)
+        return self.scene
+
+    def add_object(self, name, components=(), properties=None):
+        """Objeto já presente na cena, como os colocados no editor"""
+        obj = GameObject(name, self.scene, properties)
+        self.scene.objects.append(obj)
+        for component_class in components:
+            self.attach(obj, component_class)
+        return obj
+
+    def attach(self, obj, component_class, args=None):
+        """Criar o componente; o start roda no início do próximo frame, como no engine"""
+        defaults = component_class.args
+        values = dict(defaults) if isinstance(defaults, list) else dict(defaults or {})
+        values.update(args or {})
+        component = component_class(obj)
+        obj.components.append(component)
+        self.pending.append((component, values))
+        return component
+
+    def _running(self, component):
+        scene = component.object.scene
+        return not (component.object.invalid or scene.ended or scene.suspended)
+
+    def _start_pending(self):
+        # Componentes de cenas suspensas continuam esperando o resume
+        while True:
+            ready = [item for item in self.pending if self._running(item[0])]
+            if not ready:
+                return
+            self.pending = [item for item in self.pending if not self._running(item[0])]
+            for component, values in ready:
+                logic._set_scene(component.object.scene)
+                component.start(values)
+                self.components.append(component)
+
+    def _end_frame(self):
+        """Aplicar trocas, remoções e adições de cena pedidas no frame"""
+        for scene in [scene for scene in logic._scenes if scene.ended]:
+            logic._scenes.remove(scene)
+            # O engine chama on_remove dos componentes da cena encerrada
+            for component in [c for c in self.components if c.object.scene is scene]:
+                logic._set_scene(scene)
+                component.on_remove()
+            if scene.replaced_by:
+                logic._added_scenes.append((scene.replaced_by, 0))
+        self.components = [c for c in self.components if not c.object.scene.ended]
+        while logic._added_scenes:
+            name, _ = logic._added_scenes.pop(0)
+            self.new_scene(name)
+
+    def _measure(self, component):
+        stats = self.stats[type(component).__name__]
+        if self.track_alloc:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        component.update()
+        stats.times.append(time.perf_counter() - start)
+        if self.track_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            stats.alloc_bytes += max(current - before, 0)
+            stats.alloc_peak = max(stats.alloc_peak, peak - before)
+
+    def step(self, pressed=()):
+        """Avançar um frame com as teclas pressionadas"""
+        self.clock.advance(self.dt)
+        logic.keyboard.set_pressed(pressed)
+        self._start_pending()
+        for component in list(self.components):
+            if not self._running(component):
+                continue
+            logic._set_scene(component.object.scene)
+            self._measure(component)
+        self._end_frame()
+        self.frame += 1
+
+    def run(self, frames, script=None):
+        """Rodar frames; script(harness, frame) retorna as teclas do frame"""
+        self.clock.install()
+        if self.track_alloc:
+            tracemalloc.start()
+        try:
+            for frame in range(frames):
+                pressed = script(self, frame) if script else ()
+                self.step(pressed or ())
+        finally:
+            if self.track_alloc:
+                tracemalloc.stop()
+            self.clock.uninstall()
+
+    def report(self):
+        engine_calls = Counter()
+        for scene in self.scenes:
+            engine_calls.update(scene.calls)
+            for obj in scene.objects:
+                engine_calls.update(obj.calls)
+        engine_calls.update({f"overlay.{k}": v for k, v in render.getOverlay().calls.items()})
+        return {
+            "frames": self.frame,
+            "components": {name: stats.summary(self.frame) for name, stats in self.stats.items()},
+            "engine_calls": dict(engine_calls),
+        }
+
+
+def default_templates():
+    from jogador import Jogador
+    from projetil import Projetil
+    return {
+        "JogadorTemplate": {
+            "components": [Jogador],
+            "properties": {"health": 100.0, "ammo": 100, "fuel": 100.0},
+        },
+        "BulletTemplate": {"components": [Projetil]},
+        "BulletVisual": {},  # Usado pelo pool de projéteis
+    }
+
+
+def build_game_scene(harness):
+    from game_scene import GameScene
+    harness.add_object("SpawnPoint")
+    harness.add_object("GameScene", [GameScene])
+
+
+def scenario_partida(harness, remotos):
+    """Jogador local voando com HUD, e remotos em círculo enviando posição"""
+    from hud import HUD
+
+    client = network_session.use_client(HeadlessClient(harness.clock))
+    client.player_id = "local"
+    logic.globalDict["player_id"] = "local"
+
+    harness.scene_builders["GameScene"] = build_game_scene
+    harness.new_scene("GameScene")
+
+    # Estado do mundo recebido no login, entregue no primeiro update do Jogador
+    client.inject({
+        "type": "world_snapshot",
+        "server_time": harness.clock.time(),
+        "players": [
+            {"player_id": f"remoto-{i}", "position": [300.0 + 20 * i, 0.0, 200.0], "rotation": [0.0, 0.0, 0.0],
+             "velocity": [0.0, 0.0, 0.0], "health": 100.0, "team": None, "stats": {}}
+            for i in range(remotos)
+        ],
+    })
+
+    def script(harness, frame):
+        # GameScene cria o jogador no frame 0 e o start dele roda no frame 1
+        if frame == 2:
+            jogador = next(
+                obj for obj in harness.scene.objects
+                if obj.name == "JogadorTemplate" and "remoto" not in obj
+            )
+            comp = jogador.components.get("Jogador")
+            comp.ligando = True  # Pular a decolagem por colisão com o gatilho
+            harness.attach(jogador, HUD)
+
+        # Remotos a 10 Hz, longe da linha de tiro, e radar a 2 Hz
+        agora = harness.clock.time()
+        if frame % 30 == 0:
+            client.radar = {"type": "radar", "grid": 10.0, "server_time": agora, "blips": [
+                [f"remoto-{i}", round(300 * math.cos(agora * 0.5 + i) / 10), round(300 * math.sin(agora * 0.5 + i) / 10), None]
+                for i in range(remotos)
+            ]}
+        if frame % 6 == 0:
+            for i in range(remotos):
+                angulo = agora * 0.5 + i * 2 * math.pi / max(remotos, 1)
+                raio = 300 + 20 * i
+                client.inject({
+                    "type": "position_update",
+                    "player_id": f"remoto-{i}",
+                    "position": [raio * math.cos(angulo), raio * math.sin(angulo), 200.0],
+                    "rotation": [0.0, 0.0, angulo],
+                    "velocity": [-raio * 0.5 * math.sin(angulo), raio * 0.5 * math.cos(angulo), 0.0],
+                    "server_time": agora,
+                })
+
+        pressed = {events.WKEY}
+        fase = (frame // 120) % 4
+        pressed.add((events.UPARROWKEY, events.LEFTARROWKEY, events.DOWNARROWKEY, events.RIGHTARROWKEY)[fase])
+        if frame % 30 == 0:
+            pressed.add(events.SPACEKEY)
+        if frame == 300:
+            pressed.add(events.F3KEY)
+        return pressed
+
+    return script
+
+
+def scenario_login(harness, remotos):
+    """Digitar email e senha, confirmar e entrar na partida carregada em segundo plano"""
+    from login_scene import LoginScene
+
+    network_session.use_client(HeadlessClient(harness.clock))
+    harness.scene_builders["GameScene"] = build_game_scene
+    harness.new_scene("LoginScene")
+    for name in ("TitleText", "EmailText", "PasswordText", "InstructionsText", "ErrorText"):
+        harness.add_object(name)
+    harness.add_object("LoginScene", [LoginScene])
+
+    def key_for(char):
+        if char.isdigit():
+            return events.ZEROKEY + int(char)
+        if char == "@":
+            return events.ACCENTGRAVEKEY
+        if char == ".":
+            return events.PERIODKEY
+        return events.AKEY + ord(char) - ord("a")
+
+    # Uma tecla a cada dois frames, para haver "activated" em todas
+    teclas = [key_for(c) for c in "piloto@tla.com"] + [events.TABKEY] + [key_for(c) for c in "senha123"] + [events.ENTERKEY]
+
+    def script(harness, frame):
+        i, solta = divmod(frame, 2)
+        if i < len(teclas) and not solta:
+            return {teclas[i]}
+        return ()
+
+    return script
+
+
+SCENARIOS = {
+    "partida": scenario_partida,
+    "login": scenario_login,
+}
+
+
+def print_report(report):
+    print(f"{report['frames']} frames")
+    print(f"{'componente':<14}{'calls':>7}{'ms/frame':>10}{'p50 us':>9}{'p99 us':>9}{'max us':>9}{'alloc KB':>10}{'pico KB':>9}")
+    for name, s in sorted(report["components"].items(), key=lambda item: -item[1].get("total_ms", 0)):
+        if not s["calls"]:
+            continue
+        print(f"{name:<14}{s['calls']:>7}{s['per_frame_ms']:>10.3f}{s['p50_us']:>9.1f}{s['p99_us']:>9.1f}"
+              f"{s['max_us']:>9.1f}{s['alloc_kb']:>10.1f}{s['alloc_peak_kb']:>9.1f}")
+    print("chamadas ao engine:")
+    for name, count in sorted(report["engine_calls"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<24}{count:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="partida")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--remotos", type=int, default=8, help="aeronaves remotas simuladas")
+    parser.add_argument("--alloc", action="store_true", help="medir alocações com tracemalloc (mais lento)")
+    parser.add_argument("--json", action="store_true", help="imprimir o relatório em JSON")
+    options = parser.parse_args(argv)
+
+    # Os componentes imprimem bastante; manter só o relatório na saída
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        harness = Harness(default_templates(), track_alloc=options.alloc)
+        script = SCENARIOS[options.scenario](harness, options.remotos)
+        harness.run(options.frames, script)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    report = harness.report()
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
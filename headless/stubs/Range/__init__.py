@@ -0,0 +1,4 @@
+"""Stand-in do módulo Range para rodar componentes do jogo sem o engine"""
+from Range import types, logic, events, render
+
+__all__ = ["types", "logic", "events", "render"]
@@ -0,0 +1,269 @@
+"""Objetos de cena, entrada e overlay simulados para o harness headless
+
+Cada objeto conta as chamadas de API que recebe em `calls`, para o harness
+reportar o que os componentes pediram ao engine.
+"""
+from collections import Counter
+from mathutils import Vector, Matrix, Euler
+
+
+class ComponentList(list):
+    def get(self, name, default=None):
+        for component in self:
+            if type(component).__name__ == name:
+                return component
+        return default
+
+
+class ObjectList(list):
+    def get(self, name, default=None):
+        for obj in self:
+            if obj.name == name:
+                return obj
+        return default
+
+
+class GameObject:
+    def __init__(self, name, scene=None, properties=None):
+        self.name = name
+        self.scene = scene
+        self.props = dict(properties or {})
+        self.components = ComponentList()
+        self.collisionCallbacks = []
+        self.calls = Counter()
+        self.invalid = False
+        self.visible = True
+        self.dynamics = True
+        self.linearVelocity = Vector((0, 0, 0))
+        self.angularVelocity = Vector((0, 0, 0))
+        self._position = Vector((0, 0, 0))
+        self._orientation = Matrix.Identity(3)
+
+    def __repr__(self):
+        return f"<GameObject {self.name}>"
+
+    # Propriedades de jogo
+    def __getitem__(self, key):
+        return self.props[key]
+
+    def __setitem__(self, key, value):
+        self.props[key] = value
+
+    def __contains__(self, key):
+        return key in self.props
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    # Transformações
+    @property
+    def worldPosition(self):
+        return self._position
+
+    @worldPosition.setter
+    def worldPosition(self, value):
+        self._position = Vector(value)
+
+    @property
+    def worldOrientation(self):
+        return self._orientation
+
+    @worldOrientation.setter
+    def worldOrientation(self, value):
+        if hasattr(value, "to_matrix"):
+            value = value.to_matrix()
+        self._orientation = Matrix(value)
+
+    def applyMovement(self, movement, local=False):
+        self.calls["applyMovement"] += 1
+        delta = Vector(movement)
+        if local:
+            delta = self._orientation @ delta
+        self._position = self._position + delta
+
+    def applyRotation(self, rotation, local=False):
+        self.calls["applyRotation"] += 1
+        delta = Euler(rotation).to_matrix()
+        self._orientation = self._orientation @ delta if local else delta @ self._orientation
+
+    def getAxisVect(self, axis):
+        self.calls["getAxisVect"] += 1
+        return self._orientation @ Vector(axis)
+
+    # Física e visibilidade
+    def setLinearVelocity(self, velocity, local=False):
+        self.calls["setLinearVelocity"] += 1
+        self.linearVelocity = Vector(velocity)
+
+    def setAngularVelocity(self, velocity, local=False):
+        self.calls["setAngularVelocity"] += 1
+        self.angularVelocity = Vector(velocity)
+
+    def setDamping(self, linear, angular):
+        self.calls["setDamping"] += 1
+
+    def suspendDynamics(self, ghost=False):
+        self.calls["suspendDynamics"] += 1
+        self.dynamics = False
+
+    def restoreDynamics(self):
+        self.calls["restoreDynamics"] += 1
+        self.dynamics = True
+
+    def setVisible(self, visible, recursive=False):
+        self.calls["setVisible"] += 1
+        self.visible = visible
+
+    def rayCast(self, objto, objfrom=None, dist=0, prop="", face=False, xray=False, poly=0, mask=0xFFFF):
+        self.calls["rayCast"] += 1
+        if self.scene is None or not self.scene.obstacles:
+            return None, None, None
+        start = Vector(objfrom) if objfrom is not None else self._position
+        return self.scene.ray_test(self, start, Vector(objto))
+
+    def endObject(self):
+        self.calls["endObject"] += 1
+        if self.invalid:
+            return
+        self.invalid = True
+        if self.scene:
+            self.scene.remove_object(self)
+
+
+class Scene:
+    """Cena com templates {nome: {"components": [...], "properties": {...}}}"""
+
+    def __init__(self, name, templates, harness=None):
+        self.name = name
+        self.templates = templates
+        self.harness = harness
+        self.objects = ObjectList()
+        self.props = {}
+        self.calls = Counter()
+        self.active_camera = None
+        self.suspended = False
+        self.ended = False
+        self.replaced_by = None
+        self.obstacles = []  # [(objeto, centro, raio)]: a única geometria que rayCast enxerga
+
+    def __getitem__(self, key):
+        return self.props[key]
+
+    def __setitem__(self, key, value):
+        self.props[key] = value
+
+    def __contains__(self, key):
+        return key in self.props
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    def addObject(self, name, reference=None, time=0):
+        self.calls["addObject"] += 1
+        template = self.templates.get(name, {})
+        obj = GameObject(name, self, template.get("properties"))
+        if reference is not None:
+            obj.worldPosition = reference.worldPosition
+            obj.worldOrientation = reference.worldOrientation
+        self.objects.append(obj)
+        if self.harness:
+            for component_class in template.get("components", []):
+                self.harness.attach(obj, component_class)
+        return obj
+
+    def ray_test(self, caller, start, end):
+        """Primeira esfera de obstacles cruzada pelo segmento: (objeto, ponto, normal)"""
+        direction = end - start
+        length = direction.length
+        if length == 0:
+            return None, None, None
+        direction = direction * (1.0 / length)
+        best = None
+        for obj, center, radius in self.obstacles:
+            if obj is caller:
+                continue
+            relative = start - Vector(center)
+            b = relative.dot(direction)
+            c = relative.dot(relative) - radius * radius
+            disc = b * b - c
+            if disc < 0:
+                continue
+            t = -b - disc ** 0.5
+            if 0 <= t <= length and (best is None or t < best[0]):
+                best = (t, obj, Vector(center))
+        if best is None:
+            return None, None, None
+        t, obj, center = best
+        point = start + direction * t
+        normal = point - center
+        return obj, point, normal * (1.0 / max(normal.length, 1e-9))
+
+    def remove_object(self, obj):
+        if obj in self.objects:
+            self.objects.remove(obj)
+
+    def replace(self, name):
+        self.calls["replace"] += 1
+        self.replaced_by = name
+        self.ended = True
+
+    def suspend(self):
+        self.calls["suspend"] += 1
+        self.suspended = True
+
+    def resume(self):
+        self.calls["resume"] += 1
+        self.suspended = False
+
+    def end(self):
+        self.calls["end"] += 1
+        self.ended = True
+
+
+class InputEvent:
+    def __init__(self):
+        self.active = False
+        self.activated = False
+        self.released = False
+
+
+class KeyInputs(dict):
+    """Dicionário de teclas que cria o evento sob demanda, como no engine"""
+
+    def __missing__(self, key):
+        event = self[key] = InputEvent()
+        return event
+
+
+class Keyboard:
+    """Teclado com estado definido pelo roteiro do harness a cada frame"""
+
+    def __init__(self):
+        self.inputs = KeyInputs()
+        self.activeInputs = {}
+
+    def set_pressed(self, keys):
+        """Atualizar o estado a partir do conjunto de teclas pressionadas no frame"""
+        keys = set(keys)
+        for key in keys:
+            self.inputs[key]
+        for key, event in self.inputs.items():
+            was_active = event.active
+            event.active = key in keys
+            event.activated = event.active and not was_active
+            event.released = was_active and not event.active
+        self.activeInputs = {key: self.inputs[key] for key in keys}
+
+
+class Overlay:
+    def __init__(self):
+        self.calls = Counter()
+
+    def clear(self):
+        self.calls["clear"] += 1
+
+    def drawText(self, text, x, y, color):
+        self.calls["drawText"] += 1
+
+    def drawLine(self, x1, y1, x2, y2, color):
+        self.calls["drawLine"] += 1
@@ -0,0 +1,80 @@
+"""Códigos de teclado do harness headless; letras e números são contíguos, como no engine"""
+
+ZEROKEY = 48
+ONEKEY = 49
+TWOKEY = 50
+THREEKEY = 51
+FOURKEY = 52
+FIVEKEY = 53
+SIXKEY = 54
+SEVENKEY = 55
+EIGHTKEY = 56
+NINEKEY = 57
+AKEY = 97
+BKEY = 98
+CKEY = 99
+DKEY = 100
+EKEY = 101
+FKEY = 102
+GKEY = 103
+HKEY = 104
+IKEY = 105
+JKEY = 106
+KKEY = 107
+LKEY = 108
+MKEY = 109
+NKEY = 110
+OKEY = 111
+PKEY = 112
+QKEY = 113
+RKEY = 114
+SKEY = 115
+TKEY = 116
+UKEY = 117
+VKEY = 118
+WKEY = 119
+XKEY = 120
+YKEY = 121
+ZKEY = 122
+LEFTARROWKEY = 137
+DOWNARROWKEY = 138
+RIGHTARROWKEY = 139
+UPARROWKEY = 140
+CAPSLOCKKEY = 211
+LEFTCTRLKEY = 212
+LEFTALTKEY = 213
+RIGHTALTKEY = 214
+RIGHTCTRLKEY = 215
+RIGHTSHIFTKEY = 216
+LEFTSHIFTKEY = 217
+ESCKEY = 218
+TABKEY = 219
+ENTERKEY = 220
+RETKEY = 220
+SPACEKEY = 221
+LINEFEEDKEY = 222
+BACKSPACEKEY = 223
+DELKEY = 224
+SEMICOLONKEY = 225
+PERIODKEY = 226
+COMMAKEY = 227
+QUOTEKEY = 228
+ACCENTGRAVEKEY = 229
+MINUSKEY = 230
+SLASHKEY = 232
+BACKSLASHKEY = 233
+EQUALKEY = 234
+LEFTBRACKETKEY = 235
+RIGHTBRACKETKEY = 236
+F1KEY = 300
+F2KEY = 301
+F3KEY = 302
+F4KEY = 303
+F5KEY = 304
+F6KEY = 305
+F7KEY = 306
+F8KEY = 307
+F9KEY = 308
+F10KEY = 309
+F11KEY = 310
+F12KEY = 311
@@ -0,0 +1,41 @@
+"""Estado global do engine: cenas, teclado e globalDict"""
+from Range._engine import Keyboard
+
+globalDict = {}
+keyboard = Keyboard()
+_scene = None
+_scenes = []
+_added_scenes = []  # Pedidos de addScene, criados pelo harness no fim do frame
+_libraries = {}  # {caminho: status}, para simular LibLoad assíncronos
+
+
+def getCurrentScene():
+    return _scene
+
+
+def getSceneList():
+    return list(_scenes)
+
+
+def addScene(name, overlay=1):
+    _added_scenes.append((name, overlay))
+
+
+def LibList():
+    return []
+
+
+def LibLoad(path, kind, **kwargs):
+    """Status da carga; sem biblioteca registrada em _libraries, já termina carregada"""
+    return _libraries.get(path) or LibLoadStatus(finished=True, progress=1.0)
+
+
+class LibLoadStatus:
+    def __init__(self, finished=False, progress=0.0):
+        self.finished = finished
+        self.progress = progress
+
+
+def _set_scene(scene):
+    global _scene
+    _scene = scene
@@ -0,0 +1,16 @@
+"""Renderização: só o overlay usado pelo HUD"""
+from Range._engine import Overlay
+
+_overlay = Overlay()
+
+
+def getOverlay():
+    return _overlay
+
+
+def getWindowWidth():
+    return 1280
+
+
+def getWindowHeight():
+    return 720
@@ -0,0 +1,18 @@
+"""Tipos do engine usados pelos componentes"""
+from Range._engine import GameObject as KX_GameObject, Scene as KX_Scene
+
+
+class KX_PythonComponent:
+    args = {}
+
+    def __init__(self, obj):
+        self.object = obj
+
+    def start(self, args):
+        pass
+
+    def update(self):
+        pass
+
+    def on_remove(self):
+        pass
@@ -0,0 +1,4 @@
+"""Alias bge -> Range, como no engine"""
+from Range import types, logic, events, render
+
+__all__ = ["types", "logic", "events", "render"]
@@ -1,88 +1,201 @@
 import bge
+from bge import types
 from mathutils import Vector
 import math
+import time
+import numpy as np
+import network_session
+import profiler
+from aircraft_registry import get_registry
+from input_map import get_input_map
 
 class HUD(types.KX_PythonComponent):
     args = {
         'radar_size': 200,
         'radar_range': 1000,
         'radar_position': Vector([100, 100]),
+        'net_panel_visible': False,
+        'radar_hz': 5.0,
     }
 
     def start(self, args):
         self.radar_size = args['radar_size']
         self.radar_range = args['radar_range']
         self.radar_position = args['radar_position']
+        self.radar_interval = 1.0 / args.get('radar_hz', 5.0)
+        
+        self.net_panel_visible = args.get('net_panel_visible', False)
+        self.redraw = False
+        profiler.instrument(self)
+        
+        # F3 alterna o painel de diagnóstico de rede
+        get_input_map(bge.logic.getCurrentScene()).on("painel_rede", self.on_painel_rede)
+        
+        # Aeronaves rastreadas, mantidas pelo registro da cena
+        self.aeronaves = get_registry(bge.logic.getCurrentScene())
+        
+        # Elementos estáticos calculados uma vez
+        half = self.radar_size / 2
+        self.radar_border = (
+            int(self.radar_position.x - half),
+            int(self.radar_position.y - half),
+            int(self.radar_position.x + half),
+            int(self.radar_position.y + half)
+        )
+        
+        # Cache entre atualizações do radar
+        self.blips = []
+        self.hud_lines = None
+        self.hit_markers = []
+        self.last_radar_update = 0
         
         # Configurar overlay do radar
         self.overlay = bge.render.getOverlay()
         
-    def world_to_radar(self, world_pos, player_pos, player_rot):
-        # Converter posição do mundo para coordenadas do radar
-        diff = world_pos - player_pos
+    def on_painel_rede(self, pressionada):
+        if pressionada:
+            self.net_panel_visible = not self.net_panel_visible
+            self.redraw = True
+    
+    def radar_sources(self):
+        """Posições (x, y) e tipos dos blips, do feed de radar do servidor
+        
+        Sem feed (offline ou antes da primeira publicação), usa as aeronaves
+        rastreadas pelo registro da cena.
+        """
+        client = network_session.current_client()
+        radar = client.get_radar() if client else None
+        if not radar:
+            objects = list(self.aeronaves.objects.values())
+            return [tuple(obj.worldPosition)[:2] for obj in objects], ["enemy"] * len(objects)
         
-        # Rotacionar baseado na orientação do jogador
-        angle = math.atan2(diff.y, diff.x) - player_rot.z
-        distance = diff.length
+        grid = radar['grid']
+        own_id = client.player_id
+        own_team = None
+        positions = []
+        teams = []
+        for player_id, x, y, team in radar['blips']:
+            if player_id == own_id:
+                own_team = team
+            else:
+                positions.append((x * grid, y * grid))
+                teams.append(team)
+        kinds = ["ally" if own_team is not None and team == own_team else "enemy" for team in teams]
+        return positions, kinds
+    
+    def compute_blips(self, player_pos, player_yaw):
+        """Posições no radar de todos os blips dentro do alcance, numa passada"""
+        positions, kinds = self.radar_sources()
+        if not positions:
+            return []
         
-        # Normalizar distância para o tamanho do radar
-        radar_distance = (distance / self.radar_range) * (self.radar_size / 2)
+        diff = np.array(positions) - (player_pos.x, player_pos.y)
         
-        # Converter para coordenadas polares
-        x = self.radar_position.x + radar_distance * math.cos(angle)
-        y = self.radar_position.y + radar_distance * math.sin(angle)
+        # Girar pela orientação do jogador e escalar para o tamanho do radar
+        half = self.radar_size / 2
+        scale = half / self.radar_range
+        cos_yaw = math.cos(player_yaw)
+        sin_yaw = math.sin(player_yaw)
+        dx = scale * (diff[:, 0] * cos_yaw + diff[:, 1] * sin_yaw)
+        dy = scale * (diff[:, 1] * cos_yaw - diff[:, 0] * sin_yaw)
         
-        return Vector([x, y])
+        # O feed cobre o mapa todo; só desenhar o que cabe no radar
+        inside = np.flatnonzero((np.abs(dx) <= half) & (np.abs(dy) <= half))
+        x = (self.radar_position.x + dx[inside]).astype(int).tolist()
+        y = (self.radar_position.y + dy[inside]).astype(int).tolist()
+        return [(x[i], y[i], kinds[j]) for i, j in enumerate(inside.tolist())]
     
     def update(self):
-        # Limpar radar
-        self.overlay.clear()
+        now = time.time()
+        redraw = self.redraw
+        self.redraw = False
         
-        # Desenhar borda do radar
-        self.draw_radar_border()
+        # Radar atualizado na sua própria frequência
+        if now - self.last_radar_update >= self.radar_interval:
+            self.last_radar_update = now
+            player = self.object
+            self.blips = self.compute_blips(player.worldPosition, player.worldOrientation.to_euler().z)
+            redraw = True
         
-        # Obter posição e rotação do jogador
-        player = self.object
-        player_pos = player.worldPosition
-        player_rot = player.worldOrientation.to_euler()
+        # Textos só mudam quando os valores mudam
+        hud_lines = self.hud_info_lines()
+        if hud_lines != self.hud_lines:
+            self.hud_lines = hud_lines
+            redraw = True
         
-        # Desenhar outros jogadores no radar
-        scene = bge.logic.getCurrentScene()
-        for obj in scene.objects:
-            if obj.name.startswith("Player") and obj != player:
-                radar_pos = self.world_to_radar(obj.worldPosition, player_pos, player_rot)
-                self.draw_blip(radar_pos, "enemy")
+        # Marcadores de acerto: previstos na hora, confirmados ou apagados pelo servidor
+        client = network_session.current_client()
+        hit_markers = client.get_hit_markers() if client else []
+        if hit_markers != self.hit_markers:
+            self.hit_markers = hit_markers
+            redraw = True
         
-        # Desenhar HUD
+        if not redraw:
+            return
+        
+        self.overlay.clear()
+        self.draw_radar_border()
+        for x, y, kind in self.blips:
+            self.draw_blip((x, y), kind)
         self.draw_hud_info()
+        if self.hit_markers:
+            self.draw_hit_marker("confirmed" in self.hit_markers)
+        if self.net_panel_visible:
+            self.draw_net_panel()
     
     def draw_radar_border(self):
-        self.overlay.drawLine(
-            int(self.radar_position.x - self.radar_size/2),
-            int(self.radar_position.y - self.radar_size/2),
-            int(self.radar_position.x + self.radar_size/2),
-            int(self.radar_position.y + self.radar_size/2),
-            [1, 1, 1, 0.5]
-        )
+        x1, y1, x2, y2 = self.radar_border
+        self.overlay.drawLine(x1, y1, x2, y2, [1, 1, 1, 0.5])
+    
+    def draw_blip(self, position, kind):
+        color = [1, 0, 0, 1] if kind == "enemy" else [0, 1, 0, 1]
+        x, y = position
+        self.overlay.drawLine(x - 2, y - 2, x + 2, y + 2, color)
+    
+    def draw_hit_marker(self, confirmed):
+        """X no centro da tela; branco enquanto previsto, vermelho quando confirmado"""
+        color = [1, 0.2, 0.2, 1] if confirmed else [1, 1, 1, 0.8]
+        x = bge.render.getWindowWidth() // 2
+        y = bge.render.getWindowHeight() // 2
+        for sx, sy in ((1, 1), (1, -1)):
+            self.overlay.drawLine(x - 10 * sx, y - 10 * sy, x - 4 * sx, y - 4 * sy, color)
+            self.overlay.drawLine(x + 4 * sx, y + 4 * sy, x + 10 * sx, y + 10 * sy, color)
     
-    def draw_blip(self, position, type):
-        color = [1, 0, 0, 1] if type == "enemy" else [0, 1, 0, 1]
-        self.overlay.drawLine(
-            int(position.x - 2),
-            int(position.y - 2),
-            int(position.x + 2),
-            int(position.y + 2),
-            color
+    def hud_info_lines(self):
+        player = self.object
+        
+        # Placar do servidor, com as mortes do diário ainda não confirmadas
+        client = network_session.current_client()
+        stats = client.get_stats() if client else {"score": 0, "kills": 0, "deaths": 0}
+        
+        # Informações do jogador
+        return (
+            f"Vida: {player['health']:.0f}",
+            f"Munição: {player['ammo']}",
+            f"Combustível: {player['fuel']:.0f}",
+            f"Pontos: {stats['score']}  Abates: {stats['kills']}  Mortes: {stats['deaths']}"
         )
     
     def draw_hud_info(self):
-        player = self.object
+        for i, line in enumerate(self.hud_lines):
+            self.overlay.drawText(line, 10, 10 + i * 20, [1, 1, 1, 1])
+    
+    def draw_net_panel(self):
+        client = network_session.current_client()
+        if not client:
+            return
         
-        # Desenhar informações do jogador
-        health_text = f"Vida: {player['health']:.0f}"
-        ammo_text = f"Munição: {player['ammo']}"
-        fuel_text = f"Combustível: {player['fuel']:.0f}"
+        stats = client.get_net_stats()
+        rtt = f"{stats['rtt'] * 1000:.0f} ms" if stats['rtt'] is not None else "-"
+        tick_age = f"{stats['tick_age']:.1f} s" if stats['tick_age'] is not None else "-"
+        lines = [
+            f"RTT: {rtt}",
+            f"Entrada: {stats['msgs_in']:.0f} msg/s {stats['bytes_in'] / 1024:.1f} KB/s",
+            f"Saída: {stats['msgs_out']:.0f} msg/s {stats['bytes_out'] / 1024:.1f} KB/s",
+            f"Fila de envio: {stats['send_queue']} (descartadas: {stats['dropped']})",
+            f"Reconexões: {stats['reconnects']}",
+            f"Último tick do servidor: {tick_age}",
+        ]
         
-        self.overlay.drawText(health_text, 10, 10, [1, 1, 1, 1])
-        self.overlay.drawText(ammo_text, 10, 30, [1, 1, 1, 1])
-        self.overlay.drawText(fuel_text, 10, 50, [1, 1, 1, 1]) 
\ No newline at end of file
+        for i, line in enumerate(lines):
+            self.overlay.drawText(line, 10, 100 + i * 20, [0.6, 1, 0.6, 1])
@@ -0,0 +1,93 @@
+from Range import logic, events
+
+# Ações da partida; cada ação pode ter várias teclas
+GAME_BINDINGS = {
+    "pitch+": (events.DOWNARROWKEY,),
+    "pitch-": (events.UPARROWKEY,),
+    "roll+": (events.RIGHTARROWKEY,),
+    "roll-": (events.LEFTARROWKEY,),
+    "yaw+": (events.AKEY,),
+    "yaw-": (events.DKEY,),
+    "boost": (events.WKEY,),
+    "atirar": (events.SPACEKEY,),
+    "painel_rede": (events.F3KEY,),
+    "perfil": (events.F9KEY,),
+}
+
+
+class InputMap:
+    """Ações ligadas a teclas, lidas uma vez por frame
+
+    Em vez de cada componente consultar suas teclas todo frame, a cena
+    chama update uma vez: só keyboard.activeInputs é lido e comparado com
+    o frame anterior, e os inscritos das ações que mudaram são avisados.
+    O custo por frame acompanha as teclas pressionadas, não o teclado
+    todo. Estados contínuos, como os eixos de voo, são lidos com `ativa`.
+    """
+
+    def __init__(self, bindings=None, keyboard=None):
+        self.keyboard = keyboard or logic.keyboard
+        self.actions = {}  # {tecla: (ações)}
+        self.subscribers = {}  # {ação: [callback(pressionada)]}
+        self.key_subscribers = []  # callback(tecla) a cada tecla pressionada, para texto
+        self.keys = frozenset()  # Teclas ativas no último update
+        self.held = {}  # {ação: teclas ativas ligadas a ela}
+        for action, keys in (bindings or {}).items():
+            self.bind(action, *keys)
+
+    def bind(self, action, *keys):
+        for key in keys:
+            self.actions[key] = self.actions.get(key, ()) + (action,)
+
+    def on(self, action, callback):
+        """Registrar callback(pressionada) chamado quando a ação começa ou termina"""
+        self.subscribers.setdefault(action, []).append(callback)
+
+    def on_key(self, callback):
+        """Registrar callback(tecla) para toda tecla pressionada, ligada ou não a uma ação"""
+        self.key_subscribers.append(callback)
+
+    def update(self):
+        """Ler as teclas que mudaram desde o último frame e avisar os inscritos"""
+        keys = frozenset(key for key, status in self.keyboard.activeInputs.items() if status.active)
+        if keys == self.keys:
+            return
+        pressed = keys - self.keys
+        released = self.keys - keys
+        self.keys = keys
+
+        for key in released:
+            for action in self.actions.get(key, ()):
+                self.held[action] -= 1
+                if not self.held[action]:
+                    del self.held[action]
+                    self._notify(action, False)
+
+        for key in pressed:
+            for callback in self.key_subscribers:
+                callback(key)
+            for action in self.actions.get(key, ()):
+                count = self.held.get(action, 0)
+                self.held[action] = count + 1
+                if not count:
+                    self._notify(action, True)
+
+    def _notify(self, action, pressed):
+        for callback in self.subscribers.get(action, ()):
+            callback(pressed)
+
+    def ativa(self, action):
+        return action in self.held
+
+    def eixo(self, negative, positive):
+        """-1, 0 ou 1 conforme as duas ações opostas"""
+        return (positive in self.held) - (negative in self.held)
+
+
+def get_input_map(scene, bindings=GAME_BINDINGS):
+    """Mapa de entrada da cena, criado na primeira chamada; a cena chama update"""
+    input_map = scene.get("input")
+    if input_map is None:
+        input_map = InputMap(bindings)
+        scene["input"] = input_map
+    return input_map
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+from mathutils import Vector, Euler
+from dead_reckoning import extrapolar_posicao
+
+
+class BufferInterpolacao:
+    """Snapshots com horário do servidor de uma aeronave remota
+
+    A aeronave é desenhada um atraso fixo atrás do horário estimado do
+    servidor, interpolando entre os dois snapshots que cercam esse instante.
+    Quando os dados acabam, extrapola com a velocidade, a mesma predição de
+    quem envia: em voo reto o próximo pacote só vem no keyframe, então
+    max_extrapolacao precisa cobrir esse intervalo mais a latência.
+    """
+
+    def __init__(self, atraso=0.1, max_extrapolacao=1.35, capacidade=32):
+        self.atraso = atraso
+        self.max_extrapolacao = max_extrapolacao
+        self.capacidade = capacidade
+        self.tempos = []
+        self.snapshots = []  # [(posicao, orientacao, velocidade)]
+
+    def adicionar(self, tempo, posicao, orientacao, velocidade=None):
+        """Inserir snapshot mantendo a ordem pelo horário do servidor"""
+        if self.tempos and tempo <= self.tempos[0]:
+            return
+
+        indice = bisect_right(self.tempos, tempo)
+        self.tempos.insert(indice, tempo)
+        self.snapshots.insert(indice, (
+            Vector(posicao),
+            orientacao,
+            velocidade or [0.0, 0.0, 0.0]
+        ))
+
+        if len(self.tempos) > self.capacidade:
+            del self.tempos[0]
+            del self.snapshots[0]
+
+    def amostrar(self, agora_servidor):
+        """Posição e orientação a desenhar, ou None se o buffer estiver vazio"""
+        if not self.tempos:
+            return None
+
+        t = agora_servidor - self.atraso
+        indice = bisect_right(self.tempos, t)
+
+        # Antes do primeiro snapshot: segurar no primeiro
+        if indice == 0:
+            posicao, orientacao, _ = self.snapshots[0]
+            return posicao.copy(), orientacao.copy()
+
+        # Depois do último snapshot: extrapolar por tempo limitado
+        if indice == len(self.tempos):
+            posicao, orientacao, velocidade = self.snapshots[-1]
+            dt = min(t - self.tempos[-1], self.max_extrapolacao)
+            return Vector(extrapolar_posicao(posicao, velocidade, dt)), orientacao.copy()
+
+        # Descartar snapshots que não serão mais usados
+        if indice > 1:
+            del self.tempos[:indice - 1]
+            del self.snapshots[:indice - 1]
+            indice = 1
+
+        t0 = self.tempos[indice - 1]
+        t1 = self.tempos[indice]
+        fator = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+        p0, q0, _ = self.snapshots[indice - 1]
+        p1, q1, _ = self.snapshots[indice]
+        return p0.lerp(p1, fator), q0.slerp(q1, fator)
+
+
+def orientacao_de_euler(rotacao):
+    """Converter rotação de Euler recebida da rede em quaternion"""
+    return Euler((rotacao[0], rotacao[1], rotacao[2]), 'XYZ').to_quaternion()
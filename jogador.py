@@ -2,7 +2,14 @@ from Range import *
 from collections import OrderedDict
 from mathutils import Vector, Matrix
 import time
-from websocket_client import GameClient
+import network_session
+import profiler
+from dead_reckoning import PreditorDeadReckoning
+from interpolacao import BufferInterpolacao, orientacao_de_euler
+from aircraft_registry import get_registry
+from projectile_manager import get_projectile_manager
+from input_map import get_input_map
+from flight_model import FlightParams, FlightState, FlightInput, FixedTimestep, step as step_voo
 
 
 class Jogador(types.KX_PythonComponent):
@@ -17,9 +24,21 @@ class Jogador(types.KX_PythonComponent):
         ("ammo", 100),
         ("max_ammo", 100),
         ("shoot_delay", 0.2),
-        ("dano_colisao", 50.0),
+        ("dano_colisao", 50.0),  # Dano ao bater no cenário em voo, uma vez por contato
         ("pontos_abate", 100),
         ("tempo_respawn", 5.0),
+        ("sync_limite_posicao", 0.5),  # Erro de predição (m) que força um envio
+        ("sync_limite_rotacao", 0.05),  # Erro de rotação (rad) que força um envio
+        ("sync_keyframe", 1.0),  # Intervalo máximo entre envios
+        ("interp_atraso", 0.1),  # Atraso de renderização das aeronaves remotas
+        ("interp_folga_extrapolacao", 0.25),  # Extrapolação além do keyframe, para latência e jitter
+        ("eventos_por_frame", 64),  # Máximo de eventos de rede aplicados por frame
+        ("orcamento_eventos", 0.004),  # Tempo máximo (s) de eventos de rede por frame
+        ("pool_aeronaves", 8),  # Aeronaves remotas pré-criadas no início da cena
+        ("pool_projeteis", 64),  # Projéteis pré-criados no início da cena
+        ("pool_projeteis_esgotado", "recycle"),  # "recycle" reusa o mais antigo, "drop" recusa o tiro
+        ("velocidade_projetil", 200.0),  # m/s; equivale à física + movimento por frame do antigo Projetil
+        ("avanco_tiro_remoto", 0.5),  # Atraso máximo (s) compensado ao mostrar tiros de outros jogadores
         ("player_id", "")  # ID único para cada jogador
     ]
 
@@ -32,23 +51,73 @@ class Jogador(types.KX_PythonComponent):
         self.kills = 0
         self.deaths = 0
         self.respawn_time = 0
-        self.last_key_state = False
         self.last_sync_time = 0
-        self.sync_interval = 0.1  # Sincronizar a cada 100ms
+        self.sync_interval = 0.1  # Intervalo mínimo entre envios
         
         # Configurar valores dos argumentos
         for key, value in self.args:
             setattr(self, key, args.get(key, value))
         
-        # Inicializar cliente WebSocket
-        self.client = GameClient()
+        # Aeronaves remotas usam o mesmo template, mas são controladas pela rede
+        self.remoto = "remoto" in self.object
+        profiler.instrument(self, "Jogador.remoto" if self.remoto else None)
+        if self.remoto:
+            return
+        
+        if not self.player_id:
+            self.player_id = self.object.get("player_id") or logic.globalDict.get("player_id", "")
+        
+        # Dead reckoning: só enviar quando a predição dos outros clientes divergir
+        self.preditor = PreditorDeadReckoning(
+            self.sync_limite_posicao,
+            self.sync_limite_rotacao,
+            self.sync_keyframe
+        )
+        self.velocidade = [0.0, 0.0, 0.0]
+        self.ultima_posicao = None
+        self.ultimo_tempo = time.time()
+        self.remotos = {}  # {player_id: BufferInterpolacao}
+        
+        # Modelo de voo em passo fixo, independente da taxa de quadros
+        self.parametros_voo = FlightParams(speed=self.speed, rotation_speed=self.rotation_speed)
+        self.passo_fixo = FixedTimestep()
+        self.ultimo_voo = None
+        self.tick = 0  # Passos fixos simulados; enviado com cada tiro
+        self.aeronaves = get_registry(logic.getCurrentScene(), self.pool_aeronaves)
+        self.projeteis = get_projectile_manager(logic.getCurrentScene(), self.pool_projeteis, self.pool_projeteis_esgotado)
+        self.projeteis.on_hit(self.on_projetil_acertou)
+        
+        # Teclado lido uma vez por frame pela GameScene
+        self.input = get_input_map(logic.getCurrentScene())
+        self.input.on("atirar", self.on_atirar)
+        
+        # Decolagem pelo gatilho da pista e batidas no cenário; registrados uma única vez
+        self.object.collisionCallbacks.append(self.on_colisao_decolagem)
+        self.object.collisionCallbacks.append(self.on_colisao_cenario)
+        self.contatos = set()  # Objetos tocados no passo de física anterior
+        self.contatos_frame = set()  # Objetos tocados no passo atual
+        
+        # Usar a conexão já autenticada da sessão
+        self.client = network_session.get_client()
+        
+        self.client.max_events_per_frame = self.eventos_por_frame
+        self.client.event_budget = self.orcamento_eventos
         
         # Registrar callbacks para eventos
-        self.client.on("player_update", self.on_player_update)
-        self.client.on("player_shot", self.on_player_shot)
+        self.client.on("world_snapshot", self.on_world_snapshot)
+        self.client.on("players_joined", self.on_players_joined)
+        self.client.on("interest_entered", self.on_players_joined)
+        self.client.on("interest_left", self.on_interest_left)
+        self.client.on("position_update", self.on_player_update)
+        self.client.on("shot_fired", self.on_player_shot)
+        self.client.on("shot_ack", self.on_shot_ack)
+        self.client.on("hit_ack", self.on_hit_ack)
         self.client.on("player_hit", self.on_player_hit)
+        self.client.on("take_damage", self.on_take_damage)
         self.client.on("player_spawn", self.on_player_spawn)
+        self.client.on("position_correction", self.on_position_correction)
         self.client.on("player_die", self.on_player_die)
+        self.client.on("player_left", self.on_player_left)
         
         # Configurar física
         self.object.setDamping(0.5, 0.5)
@@ -67,63 +136,197 @@ class Jogador(types.KX_PythonComponent):
         """Callback quando outro jogador atualiza sua posição"""
         if data["player_id"] != self.player_id:
             # Atualizar ou criar outro jogador
-            outro_jogador = logic.getCurrentScene().objects.get(f"Jogador_{data['player_id']}")
-            if not outro_jogador:
-                outro_jogador = logic.getCurrentScene().addObject("JogadorTemplate", self.object)
-                outro_jogador.name = f"Jogador_{data['player_id']}"
+            self.aeronaves.acquire(data["player_id"])
             
-            # Atualizar posição e rotação
-            pos = data["position"]
-            rot = data["rotation"]
-            outro_jogador.worldPosition = Vector((pos[0], pos[1], pos[2]))
-            outro_jogador.worldOrientation = Matrix.Rotation(rot[2], 3, 'Z') @ Matrix.Rotation(rot[1], 3, 'Y') @ Matrix.Rotation(rot[0], 3, 'X')
+            buffer = self.remotos.get(data["player_id"])
+            if not buffer:
+                buffer = self.novo_buffer()
+                self.remotos[data["player_id"]] = buffer
+            
+            # Guardar snapshot; a posição é aplicada em interpolar_remotos
+            tempo = data.get("server_time", self.client.server_time())
+            buffer.adicionar(
+                tempo,
+                data["position"],
+                orientacao_de_euler(data["rotation"]),
+                data.get("velocity")
+            )
+
+    def on_world_snapshot(self, data):
+        """Callback com o estado de todos os jogadores, recebido ao entrar na partida"""
+        self.spawn_remotos(data["players"], data.get("server_time", self.client.server_time()))
+
+    def on_players_joined(self, data):
+        """Callback com os jogadores que entraram na partida ou no raio de interesse"""
+        self.spawn_remotos(data["players"], data.get("server_time", self.client.server_time()))
+
+    def on_interest_left(self, data):
+        """Callback com os jogadores que saíram do raio de interesse; seguem só no radar"""
+        for player_id in data["player_ids"]:
+            self.on_player_left({"player_id": player_id})
+    
+    def spawn_remotos(self, entradas, tempo):
+        """Posicionar várias aeronaves remotas de uma vez a partir de um snapshot"""
+        entradas = [e for e in entradas if e["player_id"] != self.player_id]
+        objetos = self.aeronaves.acquire_many([e["player_id"] for e in entradas])
+        for entrada, objeto in zip(entradas, objetos):
+            pos = entrada["position"]
+            orientacao = orientacao_de_euler(entrada["rotation"])
+            objeto.worldPosition = Vector((pos[0], pos[1], pos[2]))
+            objeto.worldOrientation = orientacao.to_matrix()
+            objeto["health"] = entrada.get("health", self.max_health)
+            objeto["stats"] = entrada.get("stats", {})
+            
+            buffer = self.remotos.get(entrada["player_id"])
+            if not buffer:
+                buffer = self.novo_buffer()
+                self.remotos[entrada["player_id"]] = buffer
+            buffer.adicionar(tempo, pos, orientacao, entrada.get("velocity"))
+
+    def novo_buffer(self):
+        """Buffer de uma aeronave remota; extrapola até o keyframe seguinte chegar"""
+        limite = self.sync_keyframe + self.interp_atraso + self.interp_folga_extrapolacao
+        return BufferInterpolacao(self.interp_atraso, limite)
+
+    def interpolar_remotos(self):
+        """Desenhar aeronaves remotas um atraso fixo atrás do servidor"""
+        agora_servidor = self.client.server_time()
+        for player_id, buffer in self.remotos.items():
+            objeto = self.aeronaves.get(player_id)
+            if objeto is None:
+                continue
+            estado = buffer.amostrar(agora_servidor)
+            if estado:
+                objeto.worldPosition = estado[0]
+                objeto.worldOrientation = estado[1].to_matrix()
 
     def on_player_shot(self, data):
         """Callback quando outro jogador atira"""
         if data["player_id"] != self.player_id:
             # Criar projétil na posição do outro jogador
-            outro_jogador = logic.getCurrentScene().objects.get(f"Jogador_{data['player_id']}")
+            outro_jogador = self.aeronaves.get(data["player_id"])
             if outro_jogador:
                 pos = data["position"]
                 dir = data["direction"]
-                bullet = logic.getCurrentScene().addObject("BulletTemplate", outro_jogador)
-                bullet.worldPosition = Vector((pos[0], pos[1], pos[2]))
-                bullet.setLinearVelocity([dir[0] * 50, dir[1] * 50, dir[2] * 50])
+                velocidade = self.velocidade_projetil
+                # Começar o traçado onde o projétil já estaria, e não onde saiu
+                atraso = self.client.server_time() - data.get("fired_at", self.client.server_time())
+                avanco = velocidade * min(max(atraso, 0.0), self.avanco_tiro_remoto)
+                self.projeteis.disparar(
+                    Vector((pos[0] + dir[0] * avanco, pos[1] + dir[1] * avanco, pos[2] + dir[2] * avanco)),
+                    outro_jogador.worldOrientation,
+                    [dir[0] * velocidade, dir[1] * velocidade, dir[2] * velocidade],
+                    outro_jogador
+                )
 
     def on_player_hit(self, data):
         """Callback quando este jogador é atingido"""
         if data["target_id"] == self.player_id:
             self.take_damage(data["damage"], data["shooter_id"])
 
+    def on_take_damage(self, data):
+        """Callback quando o servidor repassa um acerto reportado por quem atirou"""
+        if data["target_id"] == self.player_id:
+            self.take_damage(data["amount"], data["attacker_id"])
+
+    def on_projetil_acertou(self, atirador, alvo, dano, seq=None):
+        """Acerto detectado pelo gerenciador de projéteis"""
+        # Só quem atirou reporta o acerto; o alvo recebe o dano pelo servidor
+        if atirador is not self.object:
+            return
+        
+        alvo_id = alvo.get("player_id")
+        if alvo_id and self.client.send_damage(alvo_id, dano, seq):
+            # Mostrar o dano na hora; hit_ack confirma, corrige ou desfaz
+            alvo["health"] = alvo.get("health", self.max_health) - dano
+            print(f"Jogador {self.player_id} acertou {alvo_id} - Dano previsto: {dano}")
+            return
+        self.add_score(10)  # 10 pontos por acerto
+    
+    def on_shot_ack(self, data):
+        """Resposta do servidor a um tiro previsto; rejeitado, o tiro é desfeito"""
+        if data["accepted"]:
+            return
+        tiro = data["shot"]
+        self.projeteis.cancelar(tiro.visual, tiro.seq)
+        self.ammo = min(self.ammo + 1, self.max_ammo)
+        print(f"Tiro {tiro.seq} rejeitado pelo servidor ({data.get('reason')})")
+    
+    def on_hit_ack(self, data):
+        """Resposta do servidor a um acerto previsto; vale o dano decidido por ele"""
+        alvo = self.aeronaves.get(data["target_id"])
+        if alvo is not None:
+            alvo["health"] = alvo.get("health", self.max_health) + data["predicted"] - data.get("amount", 0)
+        if data["accepted"]:
+            self.add_score(10)  # 10 pontos por acerto confirmado
+        else:
+            print(f"Acerto em {data['target_id']} rejeitado pelo servidor ({data.get('reason')})")
+
     def on_player_spawn(self, data):
         """Callback quando outro jogador spawna"""
         if data["player_id"] != self.player_id:
-            outro_jogador = logic.getCurrentScene().objects.get(f"Jogador_{data['player_id']}")
+            outro_jogador = self.aeronaves.get(data["player_id"])
             if outro_jogador:
                 pos = data["position"]
                 rot = data["rotation"]
                 outro_jogador.worldPosition = Vector((pos[0], pos[1], pos[2]))
                 outro_jogador.worldOrientation = Matrix.Rotation(rot[2], 3, 'Z') @ Matrix.Rotation(rot[1], 3, 'Y') @ Matrix.Rotation(rot[0], 3, 'X')
+                
+                # Recomeçar a interpolação no spawn, sem deslizar desde onde morreu
+                buffer = self.novo_buffer()
+                buffer.adicionar(data.get("server_time", self.client.server_time()), pos, orientacao_de_euler(rot), [0.0, 0.0, 0.0])
+                self.remotos[data["player_id"]] = buffer
                 logic.getCurrentScene().addObject("RespawnEffect", outro_jogador)
 
     def on_player_die(self, data):
         """Callback quando outro jogador morre"""
         if data["player_id"] != self.player_id:
-            outro_jogador = logic.getCurrentScene().objects.get(f"Jogador_{data['player_id']}")
+            outro_jogador = self.aeronaves.get(data["player_id"])
             if outro_jogador:
                 logic.getCurrentScene().addObject("ExplosionEffect", outro_jogador)
 
+    def on_player_left(self, data):
+        """Callback quando outro jogador sai ou expira"""
+        self.remotos.pop(data["player_id"], None)
+        self.aeronaves.release(data["player_id"])
+
+    def on_position_correction(self, data):
+        """O servidor limitou o movimento: voltar para a posição que ele aceitou"""
+        pos = data["position"]
+        self.object.worldPosition = Vector((pos[0], pos[1], pos[2]))
+        self.velocidade = list(data.get("velocity", (0.0, 0.0, 0.0)))
+        self.ultima_posicao = list(pos)
+        self.ultimo_tempo = time.time()
+        
+        # A predição dos outros clientes também parte daqui
+        rot = self.object.worldOrientation.to_euler()
+        self.preditor.registrar(list(pos), [rot.x, rot.y, rot.z], self.velocidade, time.time())
+        print(f"Posição corrigida pelo servidor: {pos}")
+    
     def sync_position(self):
-        """Sincronizar posição com o servidor"""
-        if time.time() - self.last_sync_time > self.sync_interval:
-            pos = self.object.worldPosition
-            rot = self.object.worldOrientation.to_euler()
-            self.client.update_position(
-                self.player_id,
-                [pos.x, pos.y, pos.z],
-                [rot.x, rot.y, rot.z]
-            )
-            self.last_sync_time = time.time()
+        """Sincronizar posição com o servidor quando a predição divergir"""
+        agora = time.time()
+        pos = self.object.worldPosition
+        posicao = [pos.x, pos.y, pos.z]
+        
+        # Estimar velocidade pelo deslocamento (o avião se move com applyMovement)
+        dt = agora - self.ultimo_tempo
+        if self.ultima_posicao is not None and dt > 0:
+            self.velocidade = [(posicao[i] - self.ultima_posicao[i]) / dt for i in range(3)]
+        self.ultima_posicao = posicao
+        self.ultimo_tempo = agora
+        
+        if agora - self.last_sync_time < self.sync_interval:
+            return
+        
+        rot = self.object.worldOrientation.to_euler()
+        rotacao = [rot.x, rot.y, rot.z]
+        if not self.preditor.precisa_enviar(posicao, rotacao, agora):
+            return
+        
+        self.client.update_position(self.player_id, posicao, rotacao, self.velocidade, self.health)
+        self.preditor.registrar(posicao, rotacao, self.velocidade, agora)
+        self.last_sync_time = agora
 
     def shoot(self):
         if self.is_dead:
@@ -134,83 +337,107 @@ class Jogador(types.KX_PythonComponent):
             direcao = self.object.getAxisVect([0, 1, 0])
             posicao_tiro = self.object.worldPosition + direcao * 2.0
             
-            # Criar projétil
-            bullet = logic.getCurrentScene().addObject("BulletTemplate", self.object)
-            bullet.worldPosition = posicao_tiro
-            bullet.worldOrientation = self.object.worldOrientation
-            
-            # Configurar projétil
-            bullet_comp = bullet.components.get("Projetil")
-            if bullet_comp:
-                bullet_comp.jogador_origem = self.object
-                print("Projétil configurado com sucesso!")
-            else:
-                print("ERRO: Componente Projetil não encontrado!")
-                bullet.endObject()
+            # Reativar projétil do pool; None se esgotado com a política "drop"
+            bullet = self.projeteis.disparar(
+                posicao_tiro,
+                self.object.worldOrientation,
+                direcao * self.velocidade_projetil,
+                self.object
+            )
+            if bullet is None:
                 return
             
-            # Aplicar velocidade e notificar servidor
-            bullet.setLinearVelocity(direcao * 50.0)
-            self.client.send_shot(self.player_id, [posicao_tiro.x, posicao_tiro.y, posicao_tiro.z], [direcao.x, direcao.y, direcao.z])
+            # Notificar servidor; o projétil local fica até a confirmação ou rejeição
+            tiro = self.client.send_shot(
+                self.player_id,
+                [posicao_tiro.x, posicao_tiro.y, posicao_tiro.z],
+                [direcao.x, direcao.y, direcao.z],
+                self.tick
+            )
+            if tiro is not None:
+                tiro.visual = bullet
+                self.projeteis.marcar(bullet, tiro.seq)
             
             self.ammo -= 1
             self.last_shot_time = time.time()
             print(f"Tiro disparado! Munição restante: {self.ammo}")
 
     def update(self):
+        if self.remoto:
+            return
+        
+        # Contatos do passo de física anterior; um contato contínuo só causa dano no início
+        self.contatos, self.contatos_frame = self.contatos_frame, set()
+        
+        # Aplicar eventos de rede recebidos desde o último frame
+        self.client.process_events()
+        self.interpolar_remotos()
+        
         if not self.is_dead:
             self.direcaoPlane()
             self.sync_position()
-            
-            # Verificar tecla de tiro
-            keyboard = logic.keyboard.inputs
-            if keyboard[events.SPACEKEY].active and not self.last_key_state:
-                self.shoot()
-            self.last_key_state = keyboard[events.SPACEKEY].active
         elif time.time() > self.respawn_time:
             self.respawn()
+        
+        # Enviar tudo que foi enfileirado neste frame numa única escrita
+        self.client.flush()
             
     def on_remove(self):
-        if hasattr(self, 'client') and self.client:
-            self.client.close()
+        # A conexão pertence à sessão e é fechada pela GameScene
+        pass
 
-    def direcaoPlane(self):
-        keyboard = logic.keyboard.inputs
-        
-        if not self.ligando:
-            def trigger1Collision(objeto):
-                if "obj" in objeto:
-                    print(objeto)
-                    if keyboard[events.SPACEKEY].active:
-                        self.object.applyMovement([0, self.speed/4, 0], True)
-                        self.ligando = True
-                    return True
-            self.object.collisionCallbacks.append(trigger1Collision)
+    def on_atirar(self, pressionada):
+        if pressionada:
+            self.shoot()
+    
+    def on_colisao_decolagem(self, objeto):
+        """Ligar o avião ao tocar o gatilho da pista com o tiro pressionado"""
+        if self.ligando or "obj" not in objeto:
+            return
+        if self.input.ativa("atirar"):
+            self.object.applyMovement([0, self.speed/4, 0], True)
+            self.ligando = True
             print('ligado')
-        else:        
-            if self.fuel > 0:
-                if keyboard[events.WKEY].active:
-                    self.object.applyMovement([0, self.speed*1.5, 0.04], True)
-                    self.fuel -= 0.00001
-                else:
-                    # Aceleração gradual sem while loop
-                    self.object.applyMovement([0, self.speed, 0.04], True)
-                    self.fuel -= 0.00005
-                    
+    
+    def on_colisao_cenario(self, objeto):
+        """Bater no cenário em voo causa dano; a morte assim não tem atacante"""
+        if not self.ligando or self.is_dead or "obj" in objeto or "remoto" in objeto:
+            return
+        novo = objeto not in self.contatos and objeto not in self.contatos_frame
+        self.contatos_frame.add(objeto)
+        if novo:
+            print(f"Colisão com {objeto.name}")
+            self.take_damage(self.dano_colisao)
+    
+    def direcaoPlane(self):
         if self.ligando:
-            keyboard = logic.keyboard.inputs
-            if keyboard[events.UPARROWKEY].active:
-                self.object.applyRotation([-self.rotation_speed, 0, 0], True)
-            if keyboard[events.DOWNARROWKEY].active:
-                self.object.applyRotation([self.rotation_speed, 0, 0], True)
-            if keyboard[events.LEFTARROWKEY].active:
-                self.object.applyRotation([0, -self.rotation_speed, 0], True)
-            if keyboard[events.RIGHTARROWKEY].active:
-                self.object.applyRotation([0, self.rotation_speed, 0], True)
-            if keyboard[events.AKEY].active:
-                self.object.applyRotation([0, 0, self.rotation_speed/5], True)
-            if keyboard[events.DKEY].active:
-                self.object.applyRotation([0, 0, -self.rotation_speed/5], True)
+            # Comandos do frame para o modelo de voo, do estado das ações
+            comandos = FlightInput(
+                pitch=self.input.eixo("pitch-", "pitch+"),
+                roll=self.input.eixo("roll-", "roll+"),
+                yaw=self.input.eixo("yaw-", "yaw+"),
+                boost=self.input.ativa("boost")
+            )
+            self.voar(comandos)
+
+    def voar(self, comandos):
+        """Avançar o modelo de voo em passos fixos e aplicar ao objeto"""
+        agora = time.time()
+        if self.ultimo_voo is None:
+            self.ultimo_voo = agora
+        passos = self.passo_fixo.advance(agora - self.ultimo_voo)
+        self.ultimo_voo = agora
+        self.tick += passos
+        if not passos:
+            return
+        
+        estado = FlightState(self.object.worldPosition, self.object.worldOrientation, self.fuel, True)
+        for _ in range(passos):
+            estado = step_voo(estado, comandos, self.parametros_voo)
+        
+        self.object.worldPosition = estado.position
+        self.object.worldOrientation = estado.orientation
+        self.fuel = estado.fuel
                 
     def take_damage(self, amount, attacker_id=None):
         if self.is_dead:
@@ -220,24 +447,20 @@ class Jogador(types.KX_PythonComponent):
         print(f"Vida restante: {self.health}")
         
         if self.health <= 0:
-            if attacker_id:
-                # Atualizar estatísticas do atacante
-                attacker_data = self.client.get_player_data(attacker_id)
-                if attacker_data:
-                    self.client.update_player_stats(
-                        attacker_id,
-                        kills=attacker_data['stats'].get('kills', 0) + 1,
-                        score=attacker_data['stats'].get('score', 0) + self.pontos_abate
-                    )
-            self.die()
+            self.die(attacker_id)
     
-    def die(self):
+    def die(self, attacker_id=None):
         if not self.is_dead:
             self.is_dead = True
             self.deaths += 1
             self.respawn_time = time.time() + self.tempo_respawn
             print("Jogador morreu!")
             
+            # Morte por outro jogador o servidor já contou ao validar o acerto;
+            # as de colisão com o cenário vão pelo diário
+            if attacker_id is None:
+                self.client.record_stat("death", 1)
+            
             # Desativar física e colisões
             self.object.suspendDynamics()
             
@@ -250,9 +473,15 @@ class Jogador(types.KX_PythonComponent):
         self.ammo = self.max_ammo
         print("Jogador renasceu!")
         
-        # Restaurar posição inicial
+        # Restaurar posição inicial; o servidor autoriza o teleporte para o mesmo ponto
         self.object.worldPosition = self.spawn_position.copy()
         self.object.worldOrientation = self.spawn_orientation.copy()
+        pos = self.spawn_position
+        rot = self.spawn_orientation.to_euler()
+        self.client.send_respawn([pos.x, pos.y, pos.z], [rot.x, rot.y, rot.z])
+        self.velocidade = [0.0, 0.0, 0.0]
+        self.ultima_posicao = [pos.x, pos.y, pos.z]
+        self.ultimo_tempo = time.time()
         
         # Reativar física
         self.object.restoreDynamics()
@@ -263,19 +492,12 @@ class Jogador(types.KX_PythonComponent):
         logic.getCurrentScene().addObject("RespawnEffect", self.object)
     
     def add_score(self, points):
+        # Só o placar local; o servidor credita os pontos pelos acertos que ele validou
         self.score += points
-        self.client.update_player_stats(
-            self.player_id,
-            kills=self.kills,
-            deaths=self.deaths,
-            score=self.score
-        )
         print(f"Pontuação: {self.score}")
     
     def add_kill(self):
+        # Só o placar local; o servidor credita o abate pelo acerto que zerou a vida do alvo
         self.kills += 1
-        self.add_score(self.pontos_abate)
+        self.score += self.pontos_abate
         print(f"Abates: {self.kills}")
-    
-            
-        
\ No newline at end of file
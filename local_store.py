@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class LocalStore:
+    """Dados locais do cliente, gravados em segundo plano
+
+    As alterações marcam o arquivo como sujo; uma thread espera a janela de
+    debounce, descarta entradas antigas e grava tudo de uma vez com arquivo
+    temporário + rename, para nunca deixar o JSON pela metade.
+    """
+
+    def __init__(self, path, debounce=2.0, retention=30 * 24 * 3600):
+        self.path = path
+        self.debounce = debounce
+        self.retention = retention  # Segundos sem atividade até descartar uma entrada
+        self.data = {}
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()  # Uma gravação por vez, da thread ou de close
+        self.dirty = threading.Event()
+        self.should_run = True
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def load(self):
+        """Carregar dados salvos e iniciar a thread de gravação"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self.data = json.load(f)
+        except Exception:
+            self.data = {}
+
+        if not self.thread.is_alive():
+            self.thread.start()
+        return self.data
+
+    def update(self, key, **fields):
+        """Alterar campos de uma entrada e agendar gravação"""
+        with self.lock:
+            entry = self.data.setdefault(key, {})
+            entry.update(fields)
+        self.dirty.set()
+
+    def set(self, key, value):
+        """Substituir uma entrada e agendar gravação"""
+        with self.lock:
+            self.data[key] = value
+        self.dirty.set()
+
+    def mark_dirty(self):
+        """Agendar gravação sem alterar dados"""
+        self.dirty.set()
+
+    def prune(self, now=None):
+        """Remover entradas sem atividade há mais que retention segundos
+
+        Entradas sem last_update/last_login são mantidas.
+        """
+        cutoff = (now or time.time()) - self.retention
+        with self.lock:
+            expired = [
+                key for key, entry in self.data.items()
+                if isinstance(entry, dict)
+                and 0 < max(entry.get("last_update", 0), entry.get("last_login", 0)) < cutoff
+            ]
+            for key in expired:
+                del self.data[key]
+        return len(expired)
+
+    def _run(self):
+        """Gravar no máximo uma vez por janela de debounce"""
+        while self.should_run:
+            self.dirty.wait()
+            if self.should_run:
+                time.sleep(self.debounce)
+            self.dirty.clear()
+            self._write()
+
+    def _write(self):
+        """Gravar o arquivo de forma atômica"""
+        with self.write_lock:
+            self._write_file()
+
+    def _write_file(self):
+        self.prune()
+        with self.lock:
+            content = json.dumps(self.data)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(self.path), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Erro ao salvar dados locais: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def close(self, timeout=2.0):
+        """Encerrar a thread e gravar o estado final no próprio chamador
+
+        A gravação não depende da thread terminar a tempo: o que ela não
+        gravou (a espera de debounce pode passar do timeout) é gravado aqui.
+        """
+        self.should_run = False
+        self.dirty.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+        self._write()
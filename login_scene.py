@@ -2,10 +2,27 @@ import sys
 print("Python path:", sys.executable)
 
 from Range import *
-from websocket_client import GameClient
+import time
+import startup
+from input_map import get_input_map
+
+LOGIN_BINDINGS = {
+    "alternar": (events.TABKEY,),
+    "confirmar": (events.ENTERKEY,),
+    "apagar": (events.BACKSPACEKEY,),
+}
+
+# Caracteres digitados por tecla; pontuação só vale no email ("@" usa a tecla ´)
+TEXT_KEYS = {events.AKEY + i: chr(ord('a') + i) for i in range(26)}
+TEXT_KEYS.update({events.ZEROKEY + i: str(i) for i in range(10)})
+TEXT_KEYS.update({events.PERIODKEY: ".", events.MINUSKEY: "-", events.ACCENTGRAVEKEY: "@"})
+EMAIL_ONLY = ".-@"
 
 class LoginScene(types.KX_PythonComponent):
-    args = []
+    args = [
+        ("cena_jogo", "GameScene"),  # Cena carregada em segundo plano durante o login
+        ("bibliotecas", ""),  # Arquivos .range extras, separados por vírgula, carregados com LibLoad assíncrono
+    ]
 
     def start(self, args):
         print("LoginScene iniciada!")
@@ -15,9 +32,24 @@ class LoginScene(types.KX_PythonComponent):
         self.show_error = False
         self.error_message = ""
         self.logged_in = False
+        self.login_future = None
+        self.login_start = 0
+        self.in_game = False
         
-        # Inicializar cliente WebSocket
-        self.client = GameClient()
+        # Conexão e carga da partida começam já, em paralelo com a digitação
+        bibliotecas = [b.strip() for b in args.get("bibliotecas", "").split(",") if b.strip()]
+        self.startup = startup.get_pipeline(cena_jogo=args.get("cena_jogo", "GameScene"), bibliotecas=bibliotecas)
+        self.startup.begin()
+        self.client = self.startup.client
+        self.connect_future = self.startup.connect_future
+        self.connect_start = self.startup.inicio
+        
+        # Teclado lido uma vez por frame em handle_input
+        self.input = get_input_map(logic.getCurrentScene(), LOGIN_BINDINGS)
+        self.input.on("alternar", self.on_alternar)
+        self.input.on("confirmar", self.on_confirmar)
+        self.input.on("apagar", self.on_apagar)
+        self.input.on_key(self.on_tecla)
         
         # Obter referências aos objetos de texto
         scene = logic.getCurrentScene()
@@ -49,52 +81,58 @@ class LoginScene(types.KX_PythonComponent):
             self.error_text.visible = self.show_error
             if self.show_error:
                 self.error_text.text = self.error_message
+        
+        if self.instructions_text:
+            self.instructions_text.text = self.status_text()
+    
+    def status_text(self):
+        """Texto de progresso da conexão e do login"""
+        dots = "." * (int(time.time() * 3) % 4)
+        if self.logged_in:
+            return f"Carregando partida {self.startup.progresso() * 100:.0f}%" + dots
+        if self.login_future:
+            return "Entrando" + dots
+        if not self.connect_future.done():
+            if time.time() - self.connect_start > self.client.connect_timeout:
+                return "Servidor sem resposta, tentando novamente" + dots
+            return "Conectando ao servidor" + dots
+        return "TAB: Alternar campos | ENTER: Login"
     
     def handle_input(self):
-        keyboard = logic.keyboard.inputs
-        
+        self.input.update()
+    
+    def on_alternar(self, pressionada):
         # Alternar entre campos com TAB
-        if keyboard[events.TABKEY].activated:
+        if pressionada:
             self.is_typing_email = not self.is_typing_email
+    
+    def on_confirmar(self, pressionada):
+        if pressionada:
+            self.try_login()
+    
+    def on_apagar(self, pressionada):
+        if not pressionada:
             return
-            
-        # Processar teclas
-        for key, status in keyboard.items():
-            if status.activated:
-                if key == events.ENTERKEY:
-                    self.try_login()
-                elif key == events.BACKSPACEKEY:
-                    if self.is_typing_email:
-                        self.email = self.email[:-1]
-                    else:
-                        self.password = self.password[:-1]
-                # Letras
-                elif events.AKEY <= key <= events.ZKEY:
-                    char = chr(key - events.AKEY + ord('a'))
-                    if self.is_typing_email:
-                        self.email += char
-                    else:
-                        self.password += char
-                # Números
-                elif events.ZEROKEY <= key <= events.NINEKEY:
-                    char = chr(key - events.ZEROKEY + ord('0'))
-                    if self.is_typing_email:
-                        self.email += char
-                    else:
-                        self.password += char
-                # Caracteres especiais para email
-                elif key == events.PERIODKEY:  # Ponto
-                    if self.is_typing_email:
-                        self.email += "."
-                elif key == events.MINUSKEY:  # Hífen
-                    if self.is_typing_email:
-                        self.email += "-"
-                elif key == events.ACCENTGRAVEKEY:  # @ (usando a tecla ´)
-                    if self.is_typing_email:
-                        self.email += "@"
+        if self.is_typing_email:
+            self.email = self.email[:-1]
+        else:
+            self.password = self.password[:-1]
+    
+    def on_tecla(self, tecla):
+        """Digitar o caractere da tecla no campo atual"""
+        char = TEXT_KEYS.get(tecla)
+        if char is None:
+            return
+        if self.is_typing_email:
+            self.email += char
+        elif char not in EMAIL_ONLY:
+            self.password += char
     
     def try_login(self):
         print("Tentando fazer login...")
+        if self.login_future:
+            return
+        
         if not self.email or not self.password:
             self.show_error = True
             self.error_message = "Preencha todos os campos!"
@@ -102,39 +140,59 @@ class LoginScene(types.KX_PythonComponent):
         
         print(f"Email: {self.email}, Senha: {self.password}")
         
+        # Login assíncrono; a resposta é verificada em check_login a cada frame
+        self.show_error = False
+        self.login_future = self.client.login_async(self.email, self.password)
+        self.login_start = time.time()
+    
+    def check_login(self):
+        """Verificar o andamento do login sem bloquear o frame"""
+        if not self.login_future:
+            return
+        
+        if not self.login_future.done():
+            if time.time() - self.login_start > self.client.timeout:
+                # Desistir: não enviar se a conexão abrir depois nem aceitar resposta atrasada
+                self.login_future.cancel()
+                self.login_future = None
+                self.show_error = True
+                self.error_message = "Timeout esperando resposta do servidor"
+            return
+        
         try:
-            # Login (funciona offline e online)
-            response = self.client.login(self.email, self.password)
+            response = self.login_future.result()
+            self.login_future = None
             
             if response["success"]:
                 print("Login bem sucedido!")
                 
                 # Armazenar dados nas variáveis globais
                 logic.globalDict["player_id"] = response["player_id"]
-                logic.globalDict["game_client"] = self.client
                 
-                # Mudar para a cena do jogo
-                print("Mudando para a cena do jogo...")
+                # A troca de cena espera a partida terminar de carregar
                 self.logged_in = True
-                
-                # Carregar cena do jogo
-                scene = logic.getCurrentScene()
-                scene.replace("GameScene")
-                print("Cena do jogo carregada!")
             else:
                 print(f"Erro no login: {response.get('error', 'Erro desconhecido')}")
                 self.show_error = True
                 self.error_message = response.get("error", "Erro desconhecido no login")
         except Exception as e:
             print(f"Erro inesperado no login: {str(e)}")
+            self.login_future = None
             self.show_error = True
             self.error_message = f"Erro inesperado: {str(e)}"
     
     def update(self):
+        if self.in_game:
+            return
+        
+        self.startup.update()
+        self.update_display()
         if not self.logged_in:
-            self.update_display()
             self.handle_input()
+            self.check_login()
+        else:
+            self.in_game = self.startup.enter_game(logic.getCurrentScene())
             
     def on_remove(self):
-        # Não fechar o cliente aqui, pois ele será usado na GameScene
+        # Não fechar o cliente aqui, a sessão continua na GameScene
         pass 
\ No newline at end of file
@@ -0,0 +1,99 @@
+import math
+from collections import Counter
+import numpy as np
+
+
+def vec3(value):
+    """Vetor de 3 floats recebido da rede; NaN se o formato for inválido"""
+    try:
+        x, y, z = value
+        return [float(x), float(y), float(z)]
+    except (TypeError, ValueError):
+        return [math.nan, math.nan, math.nan]
+
+
+def as_float(value):
+    """Número recebido da rede; NaN se ausente ou inválido"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class ValidationResult:
+    """Saída de MovementValidator.validate, alinhada com a ordem da entrada"""
+
+    def __init__(self, positions, velocities, accepted, corrected):
+        self.positions = positions  # (N, 3) posições aceitas, já corrigidas
+        self.velocities = velocities  # (N, 3)
+        self.accepted = accepted  # (N,) False para pacotes descartados
+        self.corrected = corrected  # (N,) True quando a posição foi limitada
+
+
+class MovementValidator:
+    """Validação de movimento de todos os jogadores numa passada por tick
+
+    Descarta pacotes com NaN/inf ou timestamp que não avança (ou ausente,
+    depois do primeiro), e limita ao mapa e à velocidade máxima (com
+    tolerância para jitter de rede) quem passou disso. max_speed, em m/s,
+    vem da configuração de voo do servidor (ver speed_limit em server.py);
+    fall_speed é a queda que a física soma ao voo, aceita só para baixo.
+    Os contadores ficam em `counters`.
+    """
+
+    def __init__(self, max_speed, fall_speed=0.0, bounds_min=(-20000.0, -20000.0, -500.0),
+                 bounds_max=(20000.0, 20000.0, 20000.0), tolerance=1.5, slack=2.0):
+        self.max_speed = max_speed
+        self.fall_speed = fall_speed
+        self.bounds_min = np.array(bounds_min, dtype=float)
+        self.bounds_max = np.array(bounds_max, dtype=float)
+        self.tolerance = tolerance
+        self.slack = slack  # Metros de folga por pacote, para arredondamentos e o primeiro passo
+        self.counters = Counter()
+
+    def validate(self, previous, proposed, rotations, velocities, elapsed, timestamps, last_timestamps):
+        """Validar N atualizações de posição
+
+        previous, proposed, rotations e velocities são (N, 3); elapsed (N,) é
+        o tempo no servidor desde a última posição aceita de cada jogador
+        (inf para a primeira), e timestamps/last_timestamps (N,) são os
+        horários informados pelo cliente (NaN quando ausentes).
+        """
+        n = len(proposed)
+        self.counters["checked"] += n
+
+        finite = np.isfinite(proposed).all(axis=1) & np.isfinite(rotations).all(axis=1)
+        # Sem timestamp anterior não há o que comparar; depois dele, o atual é obrigatório
+        monotonic = ~np.isfinite(last_timestamps) | (timestamps > last_timestamps)
+        accepted = finite & monotonic
+        self.counters["rejected_invalid"] += int(np.count_nonzero(~finite))
+        self.counters["rejected_stale"] += int(np.count_nonzero(finite & ~monotonic))
+
+        # Limites do mapa
+        positions = np.where(finite[:, None], proposed, previous)
+        clipped = np.clip(positions, self.bounds_min, self.bounds_max)
+        out_of_bounds = accepted & (clipped != positions).any(axis=1)
+        self.counters["clamped_bounds"] += int(np.count_nonzero(out_of_bounds))
+
+        # Deslocamento máximo desde a última posição aceita; a parte da descida
+        # que cabe na queda fica fora do limite do voo
+        delta = clipped - previous
+        fall_room = self.fall_speed * self.tolerance * np.where(np.isfinite(elapsed), elapsed, 0.0)
+        fall = np.minimum(np.maximum(-delta[:, 2], 0.0), fall_room)
+        delta[:, 2] += fall
+        distance = np.linalg.norm(delta, axis=1)
+        allowed = self.max_speed * self.tolerance * elapsed + self.slack
+        too_fast = accepted & (distance > allowed)
+        self.counters["clamped_speed"] += int(np.count_nonzero(too_fast))
+        scale = np.where(too_fast, allowed / np.maximum(distance, 1e-9), 1.0)
+        positions = previous + delta * scale[:, None]
+        positions[:, 2] -= fall
+
+        # Velocidade informada também limitada, já que os clientes extrapolam com ela
+        velocities = np.where(np.isfinite(velocities), velocities, 0.0)
+        speed = np.linalg.norm(velocities, axis=1)
+        limit = (self.max_speed + self.fall_speed) * self.tolerance
+        velocities = velocities * np.minimum(1.0, limit / np.maximum(speed, 1e-9))[:, None]
+
+        corrected = out_of_bounds | too_fast
+        return ValidationResult(positions, velocities, accepted, corrected)
@@ -0,0 +1,69 @@
+import time
+
+
+class RateCounter:
+    """Mensagens e bytes por segundo em janelas de um segundo"""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.window_start = time.time()
+        self.messages = 0
+        self.bytes = 0
+        self.messages_per_second = 0.0
+        self.bytes_per_second = 0.0
+
+    def add(self, size, count=1):
+        """Contabilizar mensagens enviadas ou recebidas"""
+        now = time.time()
+        if now - self.window_start >= self.window:
+            self._roll(now)
+        self.messages += count
+        self.bytes += size
+
+    def _roll(self, now):
+        """Fechar a janela atual e guardar as taxas"""
+        elapsed = now - self.window_start
+        # Janelas sem tráfego também contam como taxa zero
+        if elapsed >= 2 * self.window:
+            self.messages_per_second = 0.0
+            self.bytes_per_second = 0.0
+        else:
+            self.messages_per_second = self.messages / elapsed
+            self.bytes_per_second = self.bytes / elapsed
+        self.window_start = now
+        self.messages = 0
+        self.bytes = 0
+
+    def rates(self):
+        """Taxas da última janela fechada"""
+        now = time.time()
+        if now - self.window_start >= self.window:
+            self._roll(now)
+        return self.messages_per_second, self.bytes_per_second
+
+
+class NetStats:
+    """Contadores baratos de saúde da rede, atualizados pelas threads do cliente"""
+
+    def __init__(self, rtt_smoothing=0.2):
+        self.rtt_smoothing = rtt_smoothing
+        self.rtt = None  # Média móvel em segundos
+        self.last_rtt = None
+        self.incoming = RateCounter()
+        self.outgoing = RateCounter()
+        self.reconnects = 0
+        self.last_server_message = None  # Horário local do último pacote com server_time
+
+    def record_rtt(self, rtt):
+        """Registrar uma medida de ping/pong"""
+        self.last_rtt = rtt
+        if self.rtt is None:
+            self.rtt = rtt
+        else:
+            self.rtt += (rtt - self.rtt) * self.rtt_smoothing
+
+    def server_tick_age(self):
+        """Segundos desde o último pacote com horário do servidor"""
+        if self.last_server_message is None:
+            return None
+        return time.time() - self.last_server_message
@@ -0,0 +1,42 @@
+import atexit
+import threading
+
+# Uma única conexão por processo, compartilhada por todas as cenas
+_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """Cliente compartilhado; na primeira chamada cria e começa a conectar"""
+    global _client
+    with _lock:
+        if _client is None:
+            from websocket_client import GameClient
+            _client = GameClient(auto_connect=False)
+            _client.connect_async()
+        return _client
+
+
+def use_client(client):
+    """Instalar um cliente já criado como o da sessão (ex.: o harness headless)"""
+    global _client
+    with _lock:
+        _client = client
+    return client
+
+
+def current_client():
+    """Cliente compartilhado, ou None se a sessão não foi iniciada"""
+    return _client
+
+
+def shutdown():
+    """Fechar a conexão compartilhada uma única vez"""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client:
+        client.close()
+
+
+atexit.register(shutdown)
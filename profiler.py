@@ -0,0 +1,193 @@
+import json
+import math
+import os
+import time
+from array import array
+
+# Ligado só com TLA_PROFILE=1; desligado, instrument e wrap não alteram nada
+ENABLED = os.getenv("TLA_PROFILE") == "1"
+
+
+class RollingHistogram:
+    """Percentis das últimas N amostras com buckets logarítmicos
+
+    As amostras ficam num buffer circular de tamanho fixo; cada inserção
+    incrementa o bucket da nova e decrementa o da amostra que saiu, então
+    os percentis sempre refletem só a janela, sem alocar por frame.
+    """
+
+    MIN = 1e-5  # 10 us
+    GROWTH = 1.25
+    BUCKETS = 64  # Até ~16 s
+
+    def __init__(self, size=600):
+        self.samples = array('d', [0.0]) * size
+        self.buckets = array('l', [0]) * self.BUCKETS
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.max = 0.0
+
+    def _bucket(self, value):
+        if value <= self.MIN:
+            return 0
+        return min(int(math.log(value / self.MIN, self.GROWTH)) + 1, self.BUCKETS - 1)
+
+    def add(self, value):
+        if self.count == self.size:
+            self.buckets[self._bucket(self.samples[self.index])] -= 1
+        else:
+            self.count += 1
+        self.samples[self.index] = value
+        self.buckets[self._bucket(value)] += 1
+        self.index = (self.index + 1) % self.size
+        if value > self.max:
+            self.max = value
+
+    def last(self, n=None):
+        """Amostras em ordem cronológica, as n mais recentes"""
+        n = self.count if n is None else min(n, self.count)
+        return [self.samples[(self.index - n + i) % self.size] for i in range(n)]
+
+    def percentile(self, p):
+        """Limite superior do bucket que contém o percentil p (0 a 100), até o máximo visto"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(self.MIN * self.GROWTH ** i, self.max)
+        return self.max
+
+
+class Profiler:
+    """Tempo por frame de cada seção (update de componente ou callback de rede)
+
+    As chamadas de uma seção são somadas dentro do frame; end_frame fecha o
+    frame, guarda os totais nos histogramas e grava um dump quando o frame
+    passa do limite de hitch.
+    """
+
+    def __init__(self, path="profile.jsonl", window=600, hitch=0.05, cooldown=5.0):
+        self.path = path
+        self.window = window
+        self.hitch = hitch
+        self.cooldown = cooldown
+        self.sections = {}  # {nome: RollingHistogram}
+        self.current = {}  # {nome: segundos} do frame em andamento
+        self.last_frame = {}
+        self.frames = RollingHistogram(window)
+        self.frame_count = 0
+        self.frame_start = None
+        self.last_dump = 0.0
+        self.dumps = 0
+
+    def wrap(self, name, function):
+        """Função que mede cada chamada e soma ao frame atual"""
+        current = self.current
+        clock = time.perf_counter
+
+        def measured(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                current[name] = current.get(name, 0.0) + clock() - start
+        measured.__wrapped__ = function
+        return measured
+
+    def end_frame(self):
+        """Fechar o frame; retorna a duração medida desde o anterior"""
+        now = time.perf_counter()
+        duration = 0.0
+        if self.frame_start is not None:
+            duration = now - self.frame_start
+            self.frames.add(duration)
+        self.frame_start = now
+        self.frame_count += 1
+
+        for name, elapsed in self.current.items():
+            histogram = self.sections.get(name)
+            if histogram is None:
+                histogram = self.sections[name] = RollingHistogram(self.window)
+            histogram.add(elapsed)
+        self.last_frame = dict(self.current)
+        self.current.clear()
+
+        if duration > self.hitch and now - self.last_dump > self.cooldown:
+            self.dump("hitch")
+        return duration
+
+    def snapshot(self, reason):
+        ms = 1000.0
+        return {
+            "time": time.time(),
+            "reason": reason,
+            "frame": self.frame_count,
+            "frame_ms": {
+                "p50": round(self.frames.percentile(50) * ms, 3),
+                "p99": round(self.frames.percentile(99) * ms, 3),
+                "max": round(self.frames.max * ms, 3),
+                "recent": [round(d * ms, 2) for d in self.frames.last(120)],
+            },
+            "sections": {
+                name: {
+                    "last": round(self.last_frame.get(name, 0.0) * ms, 3),
+                    "p50": round(h.percentile(50) * ms, 3),
+                    "p99": round(h.percentile(99) * ms, 3),
+                    "max": round(h.max * ms, 3),
+                }
+                for name, h in self.sections.items()
+            },
+        }
+
+    def dump(self, reason="manual"):
+        """Acrescentar uma linha JSON com os histogramas ao arquivo de perfil"""
+        self.last_dump = time.perf_counter()
+        self.dumps += 1
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot(reason), separators=(",", ":")) + "\n")
+        print(f"Perfil gravado em {self.path} ({reason})")
+
+
+_profiler = None
+if ENABLED:
+    _profiler = Profiler(
+        os.getenv("TLA_PROFILE_FILE", "profile.jsonl"),
+        hitch=float(os.getenv("TLA_PROFILE_HITCH_MS", "50")) / 1000.0
+    )
+
+
+def enabled():
+    return _profiler is not None
+
+
+def get_profiler():
+    """Profiler do processo, ou None se desligado"""
+    return _profiler
+
+
+def wrap(name, function):
+    """Medir a função como seção `name`; desligado, retorna a própria função"""
+    if _profiler is None:
+        return function
+    return _profiler.wrap(name, function)
+
+
+def instrument(component, name=None):
+    """Medir o update de um KX_PythonComponent, agregado pelo nome da classe"""
+    if _profiler is None:
+        return
+    component.update = _profiler.wrap(name or type(component).__name__, component.update)
+
+
+def end_frame():
+    if _profiler is not None:
+        _profiler.end_frame()
+
+
+def dump(reason="manual"):
+    if _profiler is not None:
+        _profiler.dump(reason)
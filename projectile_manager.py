@@ -0,0 +1,174 @@
+import time
+import numpy as np
+from bullet_pool import BulletPool
+
+
+class ProjectileManager:
+    """Todos os projéteis da cena em arrays, atualizados numa única passada
+
+    Cada instância do pool ocupa um slot fixo nos arrays. Por frame, o
+    gerenciador expira, avança e testa colisão de todos os projéteis de uma
+    vez, com segmento varrido contra esferas das aeronaves, sem rodar um
+    componente Python por projétil. O cenário (terreno, obstáculos) é
+    testado com um rayCast por projétil vivo ao longo do mesmo segmento, e
+    bloqueia o projétil antes de uma aeronave que esteja atrás dele.
+    """
+
+    def __init__(self, scene, capacity=64, on_exhausted="recycle", tempo_vida=3.0,
+                 delay_colisao=0.1, dano=25.0, raio_aeronave=3.0):
+        self.tempo_vida = tempo_vida
+        self.delay_colisao = delay_colisao
+        self.dano = dano
+        self.raio_aeronave = raio_aeronave
+
+        self.pool = BulletPool(scene, size=capacity, on_exhausted=on_exhausted)
+        self.pool.prewarm()
+        self.objects = list(self.pool.free)
+        self.slot_of = {id(obj): i for i, obj in enumerate(self.objects)}
+
+        n = len(self.objects)
+        self.posicao = np.zeros((n, 3))
+        self.velocidade = np.zeros((n, 3))
+        self.criacao = np.zeros(n)
+        self.ativo = np.zeros(n, dtype=bool)
+        self.dono = np.zeros(n, dtype=np.int64)  # id() do objeto que atirou
+        self.donos = [None] * n
+        self.tags = [None] * n  # Sequência do tiro previsto, para casar com a resposta do servidor
+
+        self.hit_callbacks = []
+        self.ultimo_update = time.time()
+
+    def on_hit(self, callback):
+        """Registrar callback(atirador, alvo, dano, tag) chamado a cada acerto"""
+        self.hit_callbacks.append(callback)
+
+    def disparar(self, posicao, orientacao, velocidade, dono):
+        """Ativar um projétil; None se o pool estiver esgotado com a política "drop" """
+        obj = self.pool.acquire(posicao, orientacao)
+        if obj is None:
+            return None
+
+        i = self.slot_of[id(obj)]
+        self.posicao[i] = (posicao[0], posicao[1], posicao[2])
+        self.velocidade[i] = (velocidade[0], velocidade[1], velocidade[2])
+        self.criacao[i] = time.time()
+        self.ativo[i] = True
+        self.dono[i] = id(dono) if dono is not None else 0
+        self.donos[i] = dono
+        self.tags[i] = None
+        return obj
+
+    def marcar(self, obj, tag):
+        """Associar um projétil ativo ao tiro `tag`"""
+        self.tags[self.slot_of[id(obj)]] = tag
+
+    def cancelar(self, obj, tag):
+        """Remover o projétil se ele ainda for do tiro `tag` (o pool pode tê-lo reciclado)"""
+        i = self.slot_of.get(id(obj))
+        if i is not None and self.ativo[i] and self.tags[i] == tag:
+            self._liberar(i)
+
+    def update(self, aeronaves):
+        """Expirar, testar colisão e avançar todos os projéteis ativos"""
+        agora = time.time()
+        dt = agora - self.ultimo_update
+        self.ultimo_update = agora
+
+        idx = np.flatnonzero(self.ativo)
+        if idx.size == 0:
+            return
+
+        # Expirar por tempo de vida
+        idade = agora - self.criacao[idx]
+        vivos = idade <= self.tempo_vida
+        for i in idx[~vivos]:
+            self._liberar(i)
+        idx = idx[vivos]
+        idade = idade[vivos]
+        if idx.size == 0:
+            return
+
+        inicio = self.posicao[idx]
+        deslocamento = self.velocidade[idx] * dt
+        cenario = self._testar_cenario(idx, inicio, deslocamento, aeronaves)
+
+        # Colisão só depois do delay, para não acertar quem atirou na saída
+        armados_mask = idade > self.delay_colisao
+        armados = idx[armados_mask]
+        if aeronaves and armados.size:
+            centros = np.array([tuple(a.worldPosition) for a in aeronaves])
+            ids = np.array([id(a) for a in aeronaves], dtype=np.int64)
+            alvos, fracao = self._testar_segmentos(
+                inicio[armados_mask],
+                deslocamento[armados_mask],
+                self.dono[armados],
+                centros,
+                ids
+            )
+            # Só vale a aeronave alcançada antes do cenário
+            for k in np.flatnonzero((alvos >= 0) & (fracao < cenario[armados_mask])):
+                self._acertar(armados[k], aeronaves[alvos[k]])
+
+        # Quem bateu no cenário para ali
+        for i in idx[np.isfinite(cenario)]:
+            if self.ativo[i]:
+                self._liberar(i)
+
+        # Avançar os que continuam ativos
+        self.posicao[idx] = inicio + deslocamento
+        for i in idx:
+            if self.ativo[i]:
+                self.objects[i].worldPosition = self.posicao[i].tolist()
+
+    def _testar_cenario(self, idx, inicio, deslocamento, aeronaves):
+        """Fração do segmento em que cada projétil bate no cenário, ou inf
+
+        Aeronaves e outros projéteis não contam: aeronaves são testadas pelas
+        esferas em _testar_segmentos.
+        """
+        ignorar = {id(a) for a in aeronaves}
+        fim = inicio + deslocamento
+        comprimento = np.maximum(np.linalg.norm(deslocamento, axis=1), 1e-9)
+        fracao = np.full(len(idx), np.inf)
+        for k, i in enumerate(idx):
+            obj, ponto, _ = self.objects[i].rayCast(fim[k].tolist(), inicio[k].tolist(), 0.0)
+            if obj is None or id(obj) in ignorar or id(obj) in self.slot_of:
+                continue
+            fracao[k] = np.linalg.norm(np.subtract(tuple(ponto), inicio[k])) / comprimento[k]
+        return fracao
+
+    def _testar_segmentos(self, inicio, deslocamento, donos, centros, ids):
+        """Primeira aeronave cruzada por cada segmento (ou -1) e a fração do segmento até ela"""
+        relativo = centros[None, :, :] - inicio[:, None, :]
+        comprimento2 = np.maximum(np.einsum('kj,kj->k', deslocamento, deslocamento), 1e-12)
+        t = np.clip(np.einsum('kmj,kj->km', relativo, deslocamento) / comprimento2[:, None], 0.0, 1.0)
+        distancia2 = ((relativo - t[..., None] * deslocamento[:, None, :]) ** 2).sum(axis=-1)
+
+        acertou = (distancia2 <= self.raio_aeronave ** 2) & (donos[:, None] != ids[None, :])
+        fracoes = np.where(acertou, t, np.inf)
+        alvos = fracoes.argmin(axis=1)
+        fracao = fracoes[np.arange(len(alvos)), alvos]
+        alvos[~acertou.any(axis=1)] = -1
+        return alvos, fracao
+
+    def _acertar(self, i, alvo):
+        atirador = self.donos[i]
+        tag = self.tags[i]
+        self._liberar(i)
+        for callback in self.hit_callbacks:
+            callback(atirador, alvo, self.dano, tag)
+
+    def _liberar(self, i):
+        self.ativo[i] = False
+        self.donos[i] = None
+        self.tags[i] = None
+        self.pool.release(self.objects[i])
+
+
+def get_projectile_manager(scene, capacity=64, on_exhausted="recycle"):
+    """Gerenciador de projéteis da cena, criado na primeira chamada"""
+    manager = scene.get("projeteis")
+    if manager is None:
+        manager = ProjectileManager(scene, capacity, on_exhausted)
+        scene["projeteis"] = manager
+    return manager
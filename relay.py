@@ -0,0 +1,143 @@
+import asyncio
+import websockets
+import json
+import time
+import logging
+import os
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+from dotenv import load_dotenv
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Configurações
+PORT = int(os.getenv('RELAY_PORT', os.getenv('PORT', 10001)))
+HOST = '0.0.0.0'
+GAME_SERVER_URL = os.getenv('GAME_SERVER_URL', 'ws://127.0.0.1:10000')
+RELAY_TOKEN = os.getenv('RELAY_TOKEN', '')
+RELAY_DELAY = float(os.getenv('RELAY_DELAY', 2.0))  # Atraso da transmissão em segundos
+MAX_BUFFER = int(os.getenv('RELAY_MAX_BUFFER', 600))  # Snapshots guardados por sala
+MAX_PENDING_BYTES = int(os.getenv('RELAY_MAX_PENDING_BYTES', 256 * 1024))
+DEFAULT_ROOM = 'principal'
+
+
+class SpectatorRelay:
+    """Retransmite o feed de partidas do GameServer para espectadores
+
+    O relay é a única conexão de espectador no servidor do jogo: recebe um
+    snapshot já codificado por sala a cada tick, guarda com atraso e repassa
+    a mesma string para todos os espectadores da sala. O custo por
+    espectador fica aqui, fora do tick da partida.
+    """
+
+    def __init__(self, delay=RELAY_DELAY, max_buffer=MAX_BUFFER, max_pending_bytes=MAX_PENDING_BYTES):
+        self.delay = delay
+        self.max_buffer = max_buffer
+        self.max_pending_bytes = max_pending_bytes
+        self.buffers = {}  # {sala: deque[(liberar_em, snapshot)]}
+        self.latest = {}  # {sala: último snapshot liberado}
+        self.spectators = {}  # {sala: {websocket}}
+        self.skipped = 0  # Envios pulados para espectadores lentos
+
+    def receive(self, message):
+        """Guardar um snapshot do servidor para liberar depois do atraso"""
+        room = json.loads(message).get('room', DEFAULT_ROOM)
+        buffer = self.buffers.get(room)
+        if buffer is None:
+            buffer = self.buffers[room] = deque(maxlen=self.max_buffer)
+        buffer.append((time.monotonic() + self.delay, message))
+
+    def release(self):
+        """Repassar os snapshots cujo atraso já passou"""
+        now = time.monotonic()
+        for room, buffer in self.buffers.items():
+            while buffer and buffer[0][0] <= now:
+                _, message = buffer.popleft()
+                self.latest[room] = message
+                self.fan_out(room, message)
+
+    def fan_out(self, room, message):
+        """Enviar a mesma string a todos os espectadores da sala, pulando os lentos"""
+        spectators = self.spectators.get(room)
+        if not spectators:
+            return
+        ready = []
+        for websocket in spectators:
+            # Sem backpressure no broadcast: quem acumulou demais perde snapshots
+            if websocket.transport.get_write_buffer_size() > self.max_pending_bytes:
+                self.skipped += 1
+            else:
+                ready.append(websocket)
+        websockets.broadcast(ready, message)
+
+    async def run_release(self, rate=60):
+        """Liberar snapshots em intervalos curtos, independentes do servidor"""
+        while True:
+            await asyncio.sleep(1.0 / rate)
+            self.release()
+
+    async def consume(self, url, token):
+        """Manter a inscrição no feed do servidor, reconectando com backoff"""
+        delay = 1.0
+        while True:
+            try:
+                async with websockets.connect(url, max_size=None) as websocket:
+                    await websocket.send(json.dumps({'type': 'subscribe_feed', 'token': token}))
+                    logging.info(f"Inscrito no feed de {url}")
+                    delay = 1.0
+                    async for message in websocket:
+                        self.receive(message)
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                logging.warning(f"Feed indisponível ({e}), tentando em {delay:.0f} s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def handle_spectator(self, websocket, path=''):
+        """Conexão somente leitura; a sala vem de ?room= ou de {"type": "spectate", "room": ...}"""
+        room = parse_qs(urlparse(path).query).get('room', [None])[0]
+        if not room:
+            try:
+                first = await asyncio.wait_for(websocket.recv(), timeout=1.0)
+                room = json.loads(first).get('room')
+            except (asyncio.TimeoutError, json.JSONDecodeError, AttributeError):
+                pass
+            except websockets.exceptions.ConnectionClosed:
+                return
+        room = room or DEFAULT_ROOM
+
+        self.spectators.setdefault(room, set()).add(websocket)
+        logging.info(f"Espectador {id(websocket)} na sala {room}")
+        try:
+            # Estado atual imediato, sem esperar o próximo snapshot
+            if room in self.latest:
+                await websocket.send(self.latest[room])
+            # Mensagens de espectadores são ignoradas
+            async for _ in websocket:
+                pass
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            spectators = self.spectators.get(room)
+            if spectators is not None:
+                spectators.discard(websocket)
+                if not spectators:
+                    del self.spectators[room]
+
+
+async def main():
+    relay = SpectatorRelay()
+    print(f"Relay de espectadores em {HOST}:{PORT}, feed de {GAME_SERVER_URL}, atraso {relay.delay} s")
+    async with websockets.serve(relay.handle_spectator, HOST, PORT):
+        await asyncio.gather(
+            relay.consume(GAME_SERVER_URL, RELAY_TOKEN),
+            relay.run_release()
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
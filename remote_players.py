@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+
+
+class RemotePlayerTable:
+    """Jogadores remotos em memória, ordenados pela última atualização
+
+    Cada atualização move o jogador para o fim da tabela, então os mais
+    antigos ficam sempre no começo e a expiração só visita quem expirou.
+    """
+
+    def __init__(self, timeout=30.0):
+        self.timeout = timeout
+        self.players = OrderedDict()  # {player_id: dados}
+        self.expire_callbacks = []
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player_id):
+        return player_id in self.players
+
+    def get(self, player_id):
+        """Dados de um jogador, ou None"""
+        return self.players.get(player_id)
+
+    def update(self, player_id, fields, now=None):
+        """Atualizar um jogador e movê-lo para o fim da ordem de expiração"""
+        entry = self.players.get(player_id)
+        if entry is None:
+            entry = self.players[player_id] = {}
+        else:
+            self.players.move_to_end(player_id)
+        entry.update(fields)
+        entry["last_update"] = now or time.time()
+        return entry
+
+    def remove(self, player_id):
+        """Remover um jogador sem disparar callbacks de expiração"""
+        return self.players.pop(player_id, None)
+
+    def on_expire(self, callback):
+        """Registrar callback(player_id, dados) chamado quando um jogador expira"""
+        self.expire_callbacks.append(callback)
+
+    def expire(self, now=None):
+        """Remover jogadores sem atualização há mais que timeout segundos"""
+        cutoff = (now or time.time()) - self.timeout
+        expired = []
+        while self.players:
+            player_id, entry = next(iter(self.players.items()))
+            if entry["last_update"] >= cutoff:
+                break
+            self.players.popitem(last=False)
+            expired.append(player_id)
+            for callback in self.expire_callbacks:
+                callback(player_id, entry)
+        return expired
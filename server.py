@@ -4,11 +4,16 @@ import json
 import sqlite3
 import bcrypt
 import time
+from collections import OrderedDict, deque
 from datetime import datetime
 from typing import Dict
 import logging
 import os
+import numpy as np
 from dotenv import load_dotenv
+from movement_validation import MovementValidator, vec3, as_float
+from shot_validation import ShotValidator
+from flight_model import FlightParams
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -22,12 +27,63 @@ logging.basicConfig(
 # Configurações
 PORT = int(os.getenv('PORT', 10000))
 HOST = '0.0.0.0'  # Necessário para o Render
+TICK_RATE = int(os.getenv('TICK_RATE', 20))  # Ticks por segundo para eventos agrupados
+RELAY_TOKEN = os.getenv('RELAY_TOKEN')  # Sem token, o feed de espectadores fica desligado
+RADAR_RATE = float(os.getenv('RADAR_RATE', 2))  # Publicações do radar por segundo
+RADAR_GRID = float(os.getenv('RADAR_GRID', 10))  # Quantização das posições do radar, em metros
+INTEREST_RADIUS = float(os.getenv('INTEREST_RADIUS', 1500))  # Distância máxima para receber posições em taxa cheia
+FLIGHT_SPEED = float(os.getenv('FLIGHT_SPEED', FlightParams().speed))  # O arg "speed" do Jogador nas cenas
+FALL_SPEED = float(os.getenv('FALL_SPEED', 15))  # m/s de queda pela física (gravidade com damping), só para baixo
+VIOLATION_LOG_EVERY = 20  # Avisar no log a cada N correções do mesmo jogador
+COUNTERS_LOG_INTERVAL = 60  # Segundos entre registros dos contadores de validação
+MAX_DEPARTED = 4096  # Últimas posições guardadas de jogadores desconectados
+HIT_SCORE = 10  # Pontos creditados ao atirador por acerto validado
+KILL_SCORE = 100  # Pontos creditados ao atirador pelo acerto que zera a vida do alvo
+MAX_STATS_BATCH = 256  # Maior número de eventos aceito num lote
+MAX_TRACKED_SHOTS = 32  # Tiros recentes por jogador que ainda podem acertar alguém
+HISTORY_SIZE = TICK_RATE * 4  # Posições aceitas guardadas para recuar alvos até o tiro
+MIN_RESPAWN_INTERVAL = 4.0  # Segundos entre teleportes de respawn autorizados
+MAX_HEALTH = 100.0
+
+# Quem recebe cada tipo de mensagem enviada pelo servidor:
+# "target" só o alvo, "room" todos da sala de quem originou (menos ele),
+# "nearby" quem está na sala a até INTEREST_RADIUS de quem originou,
+# "team" o time de quem originou (menos ele), "all" todos os conectados
+AUDIENCE = {
+    'players_joined': 'room',
+    'position_update': 'nearby',
+    'radar': 'room',
+    'shot_fired': 'room',
+    'player_spawn': 'room',
+    'take_damage': 'target',
+    'player_left': 'room',
+}
+
+DEFAULT_ROOM = 'principal'
 
 # Gerenciador de conexões
+def speed_limit(flight_speed=FLIGHT_SPEED):
+    """Velocidade máxima de voo, em m/s, com boost para o speed configurado nas cenas
+
+    A queda pela física fica de fora: a validação de movimento a aceita só
+    para baixo, até FALL_SPEED.
+    """
+    return FlightParams(speed=flight_speed).max_speed()
+
+
 class GameServer:
     def __init__(self):
         self.players = {}  # {websocket: player_data}
         self.connections = {}  # {player_id: websocket}
+        self.rooms = {}  # {sala: {player_id}}
+        self.teams = {}  # {time: {player_id}}
+        self.pending_joins = {}  # {sala: [player_id]} anunciados no próximo tick
+        self.neighbours = {}  # {player_id: {player_id}} dentro do raio de interesse, refeito a cada tick
+        self.feeds = set()  # Conexões de relay inscritas no feed de partidas
+        self.departed = OrderedDict()  # {player_id: (posição, spawn, horário)} da última posição aceita
+        self.validator = MovementValidator(speed_limit(), FALL_SPEED)
+        self.shot_validator = ShotValidator(speed_limit() + FALL_SPEED)
+        self.tick_count = 0
         self.init_db()
         logging.info("Servidor inicializado")
     
@@ -44,6 +100,15 @@ class GameServer:
                     stats TEXT
                 )
             ''')
+            # Última sequência aplicada de cada diário de estatísticas do cliente
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS stats_journals (
+                    player_id TEXT,
+                    journal_id TEXT,
+                    last_seq INTEGER,
+                    PRIMARY KEY (player_id, journal_id)
+                )
+            ''')
             conn.commit()
             conn.close()
             logging.info("Banco de dados inicializado")
@@ -62,6 +127,83 @@ class GameServer:
             logging.error(f"Erro na operação do banco: {e}")
             raise
     
+    def join(self, websocket, player_id, email, data, stats=None):
+        """Adicionar jogador autenticado aos índices de conexão, sala e time"""
+        room = data.get('room') or DEFAULT_ROOM
+        team = data.get('team')
+        
+        # Novo login na mesma conexão, ou do mesmo jogador em outra, substitui o anterior
+        self.leave(websocket)
+        previous = self.connections.get(player_id)
+        if previous is not None:
+            # A conexão antiga deixa de falar por este jogador e é fechada
+            self.leave(previous)
+            asyncio.ensure_future(previous.close(code=4001, reason='sessão substituída'))
+        
+        self.players[websocket] = {
+            'id': player_id,
+            'email': email,
+            'room': room,
+            'team': team,
+            'position': [0, 0, 0],
+            'rotation': [0, 0, 0],
+            'velocity': [0, 0, 0],
+            'health': MAX_HEALTH,
+            'stats': stats or {},
+            'last_update': time.time(),
+            'pending': None,  # Última posição recebida, validada no próximo tick
+            'validated_at': None,  # Horário do servidor da última posição aceita
+            'client_time': None,  # Horário do cliente da última posição aceita
+            'violations': 0,
+            'history': deque(maxlen=HISTORY_SIZE),  # (horário, posição, velocidade) aceitas
+            'shots': OrderedDict(),  # {seq: tiro} aceitos e ainda sem acerto decidido
+            'last_shot': None,  # Horário do cliente do último tiro aceito
+            'spawn': None,  # Primeira posição aceita; destino dos respawns
+            'respawned_at': 0.0
+        }
+        
+        # Quem volta continua de onde saiu, limitado pelo tempo fora como qualquer pacote
+        departed = self.departed.pop(player_id, None)
+        if departed is not None:
+            player = self.players[websocket]
+            player['position'], player['spawn'], player['validated_at'] = departed
+            player['history'].append((player['validated_at'], *player['position'], *player['velocity']))
+        
+        # Registrar conexão
+        self.connections[player_id] = websocket
+        self.rooms.setdefault(room, set()).add(player_id)
+        if team:
+            self.teams.setdefault(team, set()).add(player_id)
+    
+    def leave(self, websocket):
+        """Remover jogador dos índices; retorna seus dados ou None"""
+        player = self.players.pop(websocket, None)
+        if not player:
+            return None
+        
+        if player['validated_at'] is not None:
+            self.departed[player['id']] = (player['position'], player['spawn'], player['validated_at'])
+            self.departed.move_to_end(player['id'])
+            if len(self.departed) > MAX_DEPARTED:
+                self.departed.popitem(last=False)
+        
+        # Só remover a conexão se ela não foi substituída por outro login
+        if self.connections.get(player['id']) is websocket:
+            self.unindex(player)
+        return player
+    
+    def unindex(self, player):
+        """Tirar o jogador dos índices de conexão, sala e time"""
+        player_id = player['id']
+        self.connections.pop(player_id, None)
+        self.neighbours.pop(player_id, None)
+        for index, key in ((self.rooms, player['room']), (self.teams, player['team'])):
+            members = index.get(key)
+            if members is not None:
+                members.discard(player_id)
+                if not members:
+                    del index[key]
+    
     async def register(self, websocket, data):
         """Registrar novo jogador"""
         email = data.get('email')
@@ -76,47 +218,36 @@ class GameServer:
                 
                 c.execute(
                     'INSERT INTO players (id, email, password, stats) VALUES (?, ?, ?, ?)',
-                    (player_id, email, password, json.dumps({
-                        "score": 0,
-                        "kills": 0,
-                        "deaths": 0
-                    }))
+                    (player_id, email, password, json.dumps(stats))
                 )
                 conn.commit()
                 return player_id
                 
+            stats = {"score": 0, "kills": 0, "deaths": 0}
             player_id = self.db_operation(register_op)
             
-            # Adicionar jogador à lista de conectados
-            self.players[websocket] = {
-                'id': player_id,
-                'email': email,
-                'position': [0, 0, 0],
-                'rotation': [0, 0, 0],
-                'last_update': time.time()
-            }
-            
-            # Registrar conexão
-            self.connections[player_id] = websocket
+            self.join(websocket, player_id, email, data, stats)
             
             response = {
                 'type': 'login_response',
+                'request_id': data.get('request_id'),
                 'success': True,
                 'player_id': player_id,
-                'email': email
+                'email': email,
+                'stats': stats
             }
             
             await websocket.send(json.dumps(response))
             logging.info(f"Registro bem sucedido: {email} (ID: {player_id})")
             
-            # Notificar outros jogadores
-            await self.broadcast_player_joined(player_id)
+            await self.welcome(player_id)
             
         except Exception as e:
             error_msg = f"Erro no registro: {str(e)}"
             logging.error(error_msg)
             await websocket.send(json.dumps({
                 'type': 'login_response',
+                'request_id': data.get('request_id'),
                 'success': False,
                 'error': error_msg
             }))
@@ -131,7 +262,7 @@ class GameServer:
         try:
             def login_op(conn):
                 c = conn.cursor()
-                c.execute('SELECT id, password FROM players WHERE email = ?', (email,))
+                c.execute('SELECT id, password, stats FROM players WHERE email = ?', (email,))
                 return c.fetchone()
                 
             result = self.db_operation(login_op)
@@ -141,39 +272,31 @@ class GameServer:
                 await self.register(websocket, data)
                 return
                 
-            player_id, stored_password = result
+            player_id, stored_password, stats = result
             
             if password == stored_password:
-                # Adicionar jogador à lista de conectados
-                self.players[websocket] = {
-                    'id': player_id,
-                    'email': email,
-                    'position': [0, 0, 0],
-                    'rotation': [0, 0, 0],
-                    'last_update': time.time()
-                }
-                
-                # Registrar conexão
-                self.connections[player_id] = websocket
+                self.join(websocket, player_id, email, data, json.loads(stats or '{}'))
                 
                 response = {
                     'type': 'login_response',
+                    'request_id': data.get('request_id'),
                     'success': True,
                     'player_id': player_id,
-                    'email': email
+                    'email': email,
+                    'stats': self.players[websocket]['stats']
                 }
                 
                 await websocket.send(json.dumps(response))
                 logging.info(f"Login bem sucedido: {email} (ID: {player_id})")
                 
-                # Notificar outros jogadores
-                await self.broadcast_player_joined(player_id)
+                await self.welcome(player_id)
                 
             else:
                 error_msg = "Senha incorreta"
                 logging.warning(f"Tentativa de login com senha incorreta: {email}")
                 await websocket.send(json.dumps({
                     'type': 'login_response',
+                    'request_id': data.get('request_id'),
                     'success': False,
                     'error': error_msg
                 }))
@@ -183,6 +306,7 @@ class GameServer:
             logging.error(error_msg)
             await websocket.send(json.dumps({
                 'type': 'login_response',
+                'request_id': data.get('request_id'),
                 'success': False,
                 'error': error_msg
             }))
@@ -193,95 +317,567 @@ class GameServer:
             return
             
         player = self.players[websocket]
-        player['position'] = data.get('position', [0, 0, 0])
-        player['rotation'] = data.get('rotation', [0, 0, 0])
+        # Só a mais recente do tick importa; validate_positions aplica e repassa
+        player['pending'] = data
         player['last_update'] = time.time()
+    
+    def validate_positions(self):
+        """Validar numa passada as posições recebidas desde o último tick; retorna quem moveu"""
+        pending = [player for player in self.players.values() if player['pending'] is not None]
+        if not pending:
+            return []
         
-        # Enviar atualização para outros jogadores
-        await self.broadcast_position(player['id'], player['position'], player['rotation'])
+        now = time.time()
+        packets = [player['pending'] for player in pending]
+        timestamps = np.array([as_float(packet.get('time')) for packet in packets])
+        result = self.validator.validate(
+            np.array([player['position'] for player in pending], dtype=float),
+            np.array([vec3(packet.get('position')) for packet in packets]),
+            np.array([vec3(packet.get('rotation', (0, 0, 0))) for packet in packets]),
+            np.array([vec3(packet.get('velocity', (0, 0, 0))) for packet in packets]),
+            np.array([now - player['validated_at'] if player['validated_at'] else np.inf for player in pending]),
+            timestamps,
+            np.array([as_float(player['client_time']) for player in pending])
+        )
         
+        moved = []
+        for i, player in enumerate(pending):
+            packet = player['pending']
+            player['pending'] = None
+            if not result.accepted[i]:
+                continue
+            
+            player['position'] = result.positions[i].tolist()
+            if player['spawn'] is None:
+                player['spawn'] = list(player['position'])
+            player['rotation'] = vec3(packet.get('rotation', (0, 0, 0)))
+            player['velocity'] = result.velocities[i].tolist()
+            player['validated_at'] = now
+            player['history'].append((now, *player['position'], *player['velocity']))
+            if np.isfinite(timestamps[i]):
+                player['client_time'] = float(timestamps[i])
+            moved.append(player)
+            
+            if result.corrected[i]:
+                player['violations'] += 1
+                if player['violations'] % VIOLATION_LOG_EVERY == 1:
+                    logging.warning(f"Movimento corrigido de {player['id']} ({player['violations']} vezes)")
+                # O dono volta para a posição aceita, senão as duas visões divergem para sempre
+                self.send_now(player['id'], {
+                    'type': 'position_correction',
+                    'position': player['position'],
+                    'velocity': player['velocity'],
+                    'server_time': now
+                })
+        return moved
+        
+    async def handle_respawn(self, websocket, data):
+        """Autorizar o teleporte de volta ao ponto de spawn
+        
+        O destino é o spawn registrado pelo servidor, não o informado pelo
+        cliente, e os teleportes são espaçados por MIN_RESPAWN_INTERVAL. A
+        posição, o histórico e o horário da validação recomeçam dali, para o
+        limite de velocidade e a validação de tiros não medirem o salto.
+        """
+        if websocket not in self.players:
+            return
+        
+        player = self.players[websocket]
+        now = time.time()
+        if player['spawn'] is None:
+            return  # Sem posição aceita ainda, o próximo pacote já vale onde estiver
+        if now - player['respawned_at'] < MIN_RESPAWN_INTERVAL:
+            logging.warning(f"Respawn recusado de {player['id']}: intervalo curto")
+            return
+        
+        player['respawned_at'] = now
+        player['position'] = list(player['spawn'])
+        player['rotation'] = vec3(data.get('rotation', (0, 0, 0)))
+        player['velocity'] = [0.0, 0.0, 0.0]
+        player['health'] = MAX_HEALTH
+        player['pending'] = None  # Posições anteriores ao respawn
+        player['validated_at'] = now
+        player['history'].clear()
+        player['history'].append((now, *player['position'], *player['velocity']))
+        client_time = as_float(data.get('time'))
+        if np.isfinite(client_time):
+            player['client_time'] = client_time
+        
+        # O dono reaparece onde o servidor decidiu, se tiver informado outro lugar
+        claimed = np.array(vec3(data.get('position')))
+        if not np.isfinite(claimed).all() or np.linalg.norm(claimed - player['position']) > 1.0:
+            await self.send_to(player['id'], {
+                'type': 'position_correction',
+                'position': player['position'],
+                'velocity': player['velocity'],
+                'server_time': now
+            })
+        await self.route({
+            'type': 'player_spawn',
+            'player_id': player['id'],
+            'position': player['position'],
+            'rotation': player['rotation'],
+            'server_time': now
+        }, player['id'])
+    
     async def handle_shot(self, websocket, data):
-        """Processar tiro do jogador"""
+        """Confirmar ou rejeitar um tiro já mostrado pelo cliente"""
         if websocket not in self.players:
             return
             
         player = self.players[websocket]
+        seq = data.get('seq')
+        if not isinstance(seq, int):
+            logging.warning(f"Tiro sem sequência de {player['id']}")
+            return
+        
+        shot, reason = self.shot_validator.check_shot(
+            player, data.get('position'), data.get('direction'), as_float(data.get('time')), time.time()
+        )
+        await self.send_to(player['id'], {
+            'type': 'shot_ack',
+            'seq': seq,
+            'tick': data.get('tick'),
+            'accepted': shot is not None,
+            'reason': reason
+        })
+        if shot is None:
+            return
+        
+        player['shots'][seq] = shot
+        if len(player['shots']) > MAX_TRACKED_SHOTS:
+            player['shots'].popitem(last=False)
         
         # Enviar informação do tiro para outros jogadores
-        await self.broadcast_shot(player['id'], player['position'], player['rotation'])
+        await self.broadcast_shot(player['id'], shot['origin'].tolist(), shot['direction'].tolist(), shot['time'])
+        
+    def load_stats(self, cursor, player_id):
+        """Estatísticas gravadas de um jogador; None se ele não existir"""
+        row = cursor.execute('SELECT stats FROM players WHERE id = ?', (player_id,)).fetchone()
+        return json.loads(row[0] or '{}') if row else None
+    
+    def apply_stats_events(self, conn, player_id, journal_id, first_seq, events):
+        """Aplicar eventos novos de um diário numa transação; retorna (última sequência, stats)
+        
+        Sequências já aplicadas são ignoradas, então reenviar um lote não
+        conta nada duas vezes; um lote que pula sequências é recusado. O
+        diário só traz mortes sem atacante (queda, colisão): pontos e abates
+        vêm dos acertos validados em handle_damage, e eventos "score" ou o
+        atacante informado numa morte são ignorados.
+        """
+        c = conn.cursor()
+        row = c.execute(
+            'SELECT last_seq FROM stats_journals WHERE player_id = ? AND journal_id = ?',
+            (player_id, journal_id)
+        ).fetchone()
+        last_seq = row[0] if row else 0
+        stats = self.load_stats(c, player_id) or {}
+        if first_seq > last_seq + 1:
+            logging.warning(f"Lote de estatísticas de {player_id} pula da sequência {last_seq} para {first_seq}")
+            return last_seq, stats
         
+        for offset, event in enumerate(events):
+            if first_seq + offset <= last_seq or not isinstance(event, list) or not event:
+                continue
+            if event[0] == 'death':
+                stats['deaths'] = stats.get('deaths', 0) + 1
+        
+        new_seq = max(last_seq, first_seq + len(events) - 1)
+        if new_seq > last_seq:
+            c.execute('UPDATE players SET stats = ? WHERE id = ?', (json.dumps(stats), player_id))
+            c.execute(
+                'INSERT OR REPLACE INTO stats_journals (player_id, journal_id, last_seq) VALUES (?, ?, ?)',
+                (player_id, journal_id, new_seq)
+            )
+        return new_seq, stats
+    
+    async def handle_stats_batch(self, websocket, data):
+        """Aplicar um lote do diário de estatísticas e confirmar com stats_ack"""
+        if websocket not in self.players:
+            return
+        
+        player = self.players[websocket]
+        journal_id = str(data.get('journal', ''))
+        first_seq = data.get('first_seq')
+        events = data.get('events')
+        if not journal_id or not isinstance(first_seq, int) or first_seq < 1 \
+                or not isinstance(events, list) or len(events) > MAX_STATS_BATCH:
+            logging.warning(f"Lote de estatísticas inválido de {player['id']}")
+            return
+        
+        def stats_op(conn):
+            with conn:  # Uma transação por lote
+                return self.apply_stats_events(conn, player['id'], journal_id, first_seq, events)
+        
+        seq, stats = self.db_operation(stats_op)
+        player['stats'] = stats
+        await self.send_to(player['id'], {
+            'type': 'stats_ack',
+            'journal': journal_id,
+            'seq': seq,
+            'stats': stats
+        })
+    
+    def apply_hit(self, conn, shooter_id, target_id, killed):
+        """Creditar um acerto validado numa transação; retorna {jogador: stats} alterados
+        
+        O atirador ganha HIT_SCORE; se o acerto zerou a vida do alvo, ganha
+        também o abate e KILL_SCORE, e a morte conta para o alvo.
+        """
+        c = conn.cursor()
+        changed = {}
+        shooter = self.load_stats(c, shooter_id)
+        if shooter is not None:
+            shooter['score'] = shooter.get('score', 0) + HIT_SCORE
+            if killed:
+                shooter['kills'] = shooter.get('kills', 0) + 1
+                shooter['score'] += KILL_SCORE
+            changed[shooter_id] = shooter
+        if killed:
+            target = self.load_stats(c, target_id)
+            if target is not None:
+                target['deaths'] = target.get('deaths', 0) + 1
+                changed[target_id] = target
+        
+        for player_id, stats in changed.items():
+            c.execute('UPDATE players SET stats = ? WHERE id = ?', (json.dumps(stats), player_id))
+        return changed
+    
     async def handle_damage(self, websocket, data):
-        """Processar dano causado"""
+        """Decidir um acerto reportado por quem atirou, aplicar o dano e creditar o atirador"""
         if websocket not in self.players:
             return
             
         player = self.players[websocket]
+        seq = data.get('seq')
         target_id = data.get('target_id')
-        amount = data.get('amount', 0)
+        shot = player['shots'].get(seq) if isinstance(seq, int) else None
+        target = self.players.get(self.connections.get(target_id))
+        
+        amount, reason = self.shot_validator.check_hit(shot, player, target, data.get('amount', 0), time.time())
+        if amount is not None and target['health'] <= 0:
+            # Alvo já abatido, esperando o respawn
+            amount, reason = None, 'dead'
+        await self.send_to(player['id'], {
+            'type': 'hit_ack',
+            'seq': seq,
+            'target_id': target_id,
+            'accepted': amount is not None,
+            'amount': amount or 0,
+            'reason': reason
+        })
+        if amount is None:
+            return
+        
+        # Um acerto por tiro; a vida do alvo é a do servidor, não a informada pelo cliente
+        shot['hit'] = True
+        target['health'] -= amount
+        killed = target['health'] <= 0
+        
+        def hit_op(conn):
+            with conn:
+                return self.apply_hit(conn, player['id'], target_id, killed)
         
-        # Enviar dano para o jogador alvo
+        for player_id, stats in self.db_operation(hit_op).items():
+            player_socket = self.connections.get(player_id)
+            if player_socket in self.players:
+                self.players[player_socket]['stats'] = stats
+            await self.send_to(player_id, {'type': 'stats_update', 'stats': stats})
         await self.broadcast_damage(target_id, amount, player['id'])
         
-    async def broadcast_player_joined(self, player_id):
-        """Notificar todos sobre novo jogador"""
-        message = {
-            'type': 'player_joined',
-            'player_id': player_id,
-            'data': self.players[player_id]
+    def player_state(self, player):
+        """Estado público e compacto de um jogador para snapshots"""
+        return {
+            'player_id': player['id'],
+            'position': [round(v, 2) for v in player['position']],
+            'rotation': [round(v, 3) for v in player['rotation']],
+            'velocity': [round(v, 2) for v in player['velocity']],
+            'health': player['health'],
+            'team': player['team'],
+            'stats': player['stats']
         }
-        await self.broadcast(message, exclude=player_id)
+    
+    async def welcome(self, player_id):
+        """Enviar o estado do mundo ao jogador que entrou e agendar o anúncio da entrada"""
+        player = self.players[self.connections[player_id]]
+        room = player['room']
+        others = [
+            self.player_state(self.players[self.connections[pid]])
+            for pid in self.rooms.get(room, ())
+            if pid != player_id
+        ]
+        await self.send_to(player_id, {
+            'type': 'world_snapshot',
+            'players': others,
+            'server_time': time.time()
+        })
+        # O snapshot mostrou todos; quem estiver longe sai do interesse no próximo tick
+        self.neighbours[player_id] = {state['player_id'] for state in others}
+        
+        # Os outros jogadores recebem as entradas agrupadas no próximo tick
+        self.pending_joins.setdefault(room, []).append(player_id)
+    
+    async def flush_joins(self):
+        """Anunciar numa única mensagem por sala quem entrou desde o último tick"""
+        pending, self.pending_joins = self.pending_joins, {}
+        for room, player_ids in pending.items():
+            joined = [
+                self.player_state(self.players[self.connections[pid]])
+                for pid in player_ids
+                if pid in self.connections
+            ]
+            # Todos da sala passam a mostrar quem entrou, perto ou não
+            for member in self.rooms.get(room, ()):
+                self.neighbours.setdefault(member, set()).update(
+                    state['player_id'] for state in joined if state['player_id'] != member
+                )
+            if joined:
+                # Quem entrou também recebe; o cliente ignora a própria entrada
+                await self.route({
+                    'type': 'players_joined',
+                    'players': joined,
+                    'server_time': time.time()
+                }, room=room)
+    
+    def update_interest(self):
+        """Refazer os vizinhos de cada jogador numa passada por sala e avisar as mudanças
+        
+        Quem entra no raio recebe o estado do outro (interest_entered), para
+        aparecer na hora; quem sai é avisado (interest_left) e deixa de ser
+        desenhado em taxa cheia, continuando só no radar.
+        """
+        radius2 = INTEREST_RADIUS * INTEREST_RADIUS
+        now = time.time()
+        messages = []  # Enviados depois, para os índices não mudarem durante a passada
+        for room, members in self.rooms.items():
+            ids = list(members)
+            positions = np.array([self.players[self.connections[pid]]['position'] for pid in ids], dtype=float)
+            close = ((positions[:, None, :] - positions[None, :, :]) ** 2).sum(axis=-1) <= radius2
+            np.fill_diagonal(close, False)
+            
+            for i, pid in enumerate(ids):
+                current = {ids[j] for j in np.flatnonzero(close[i])}
+                previous = self.neighbours.get(pid, set()) & members
+                self.neighbours[pid] = current
+                left = previous - current
+                entered = current - previous
+                if left:
+                    messages.append((pid, {'type': 'interest_left', 'player_ids': sorted(left)}))
+                if entered:
+                    messages.append((pid, {
+                        'type': 'interest_entered',
+                        'players': [self.player_state(self.players[self.connections[other]]) for other in entered],
+                        'server_time': now
+                    }))
+        
+        for pid, message in messages:
+            self.send_now(pid, message)
+    
+    def publish_feed(self):
+        """Um snapshot por sala, codificado uma vez, para os relays de espectadores"""
+        if not self.feeds:
+            return
+        now = time.time()
+        for room, player_ids in self.rooms.items():
+            encoded = json.dumps({
+                'type': 'match_snapshot',
+                'room': room,
+                'tick': self.tick_count,
+                'server_time': now,
+                'players': [self.player_state(self.players[self.connections[pid]]) for pid in player_ids]
+            }, separators=(',', ':'))
+            websockets.broadcast(self.feeds, encoded)
+    
+    async def subscribe_feed(self, websocket, data):
+        """Inscrever um relay no feed; ele não entra como jogador"""
+        if not RELAY_TOKEN or data.get('token') != RELAY_TOKEN:
+            logging.warning(f"Inscrição de feed recusada: {id(websocket)}")
+            await websocket.close(code=4003, reason='token inválido')
+            return
+        self.feeds.add(websocket)
+        logging.info(f"Relay inscrito no feed: {id(websocket)}")
+    
+    async def publish_radar(self):
+        """Posições grosseiras de todos os jogadores da sala, em baixa frequência
+        
+        Cada blip é [player_id, x, y, team] com x e y em células de RADAR_GRID
+        metros; o cliente multiplica de volta pela grade e separa aliados de
+        inimigos pelo time.
+        """
+        now = time.time()
+        # Cópia: route é aguardado e uma entrada ou saída pode mudar as salas no meio
+        for room, player_ids in list(self.rooms.items()):
+            blips = []
+            for pid in player_ids:
+                player = self.players[self.connections[pid]]
+                x, y = player['position'][0], player['position'][1]
+                blips.append([pid, round(x / RADAR_GRID), round(y / RADAR_GRID), player['team']])
+            await self.route({
+                'type': 'radar',
+                'grid': RADAR_GRID,
+                'blips': blips,
+                'server_time': now
+            }, room=room)
+    
+    async def tick(self):
+        """Trabalho agrupado por tick, fora do caminho das mensagens"""
+        self.tick_count += 1
+        moved = self.validate_positions()
+        await self.flush_joins()
+        self.update_interest()
+        for player in moved:
+            if player['id'] in self.connections:
+                await self.broadcast_position(player['id'], player['position'], player['rotation'], player['velocity'])
+        self.publish_feed()
+        if self.tick_count % max(round(TICK_RATE / RADAR_RATE), 1) == 0:
+            await self.publish_radar()
+        if self.tick_count % (TICK_RATE * COUNTERS_LOG_INTERVAL) == 0:
+            self.log_counters()
+    
+    def log_counters(self):
+        """Registrar os contadores acumulados das validações de movimento e de tiros"""
+        logging.info(f"Validação de movimento: {dict(self.validator.counters)}")
+        logging.info(f"Validação de tiros: {dict(self.shot_validator.counters)}")
+    
+    async def run_ticks(self):
+        """Rodar tick() em intervalos fixos de 1/TICK_RATE"""
+        interval = 1.0 / TICK_RATE
+        next_tick = time.monotonic()
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+            try:
+                await self.tick()
+            except Exception as e:
+                logging.error(f"Erro no tick {self.tick_count}: {e}")
         
-    async def broadcast_position(self, player_id, position, rotation):
-        """Enviar posição do jogador para todos"""
+    async def broadcast_position(self, player_id, position, rotation, velocity=None):
+        """Enviar posição do jogador para a sala"""
         message = {
             'type': 'position_update',
             'player_id': player_id,
             'position': position,
-            'rotation': rotation
+            'rotation': rotation,
+            'velocity': velocity or [0, 0, 0],
+            'server_time': time.time()
         }
-        await self.broadcast(message, exclude=player_id)
+        await self.route(message, player_id)
         
-    async def broadcast_shot(self, player_id, position, direction):
-        """Enviar informação de tiro para todos"""
+    async def broadcast_shot(self, player_id, position, direction, fired_at):
+        """Enviar informação de tiro para a sala"""
         message = {
             'type': 'shot_fired',
             'player_id': player_id,
             'position': position,
-            'direction': direction
+            'direction': direction,
+            'fired_at': fired_at  # Horário do tiro no servidor, para os clientes compensarem o atraso
         }
-        await self.broadcast(message, exclude=player_id)
+        await self.route(message, player_id)
         
     async def broadcast_damage(self, target_id, amount, attacker_id):
-        """Enviar informação de dano para o alvo"""
-        message = json.dumps({
+        """Enviar informação de dano só para o alvo"""
+        message = {
             'type': 'take_damage',
             'target_id': target_id,
             'amount': amount,
             'attacker_id': attacker_id
-        })
-        await self.broadcast(message)
+        }
+        await self.route(message, attacker_id)
+        
+    def audience(self, message, sender_id=None, room=None):
+        """IDs que devem receber a mensagem, conforme AUDIENCE"""
+        kind = AUDIENCE.get(message['type'], 'all')
+        if kind == 'target':
+            return (message['target_id'],)
+        
+        sender = self.players.get(self.connections.get(sender_id))
+        if kind == 'nearby' and sender:
+            return self.nearby(sender)
+        if kind in ('room', 'nearby'):
+            members = self.rooms.get(room or (sender['room'] if sender else DEFAULT_ROOM), ())
+        elif kind == 'team':
+            members = self.teams.get(sender['team'], ()) if sender else ()
+        else:
+            members = self.connections.keys()
+        return [pid for pid in members if pid != sender_id]
+    
+    def nearby(self, sender):
+        """Jogadores da sala do remetente dentro do raio de interesse, do último tick"""
+        return self.neighbours.get(sender['id'], ())
+    
+    async def route(self, message, sender_id=None, room=None):
+        """Enviar mensagem só ao público declarado para o seu tipo"""
+        await self.multicast(self.audience(message, sender_id, room), message)
+    
+    async def send_to(self, player_id, message):
+        """Unicast esperando a escrita, para as respostas fora do tick; False se ele não estiver conectado"""
+        websocket = self.connections.get(player_id)
+        if websocket is None:
+            return False
+        try:
+            await websocket.send(json.dumps(message))
+            return True
+        except websockets.exceptions.ConnectionClosed:
+            return False
+    
+    def send_now(self, player_id, message):
+        """Unicast sem esperar o cliente, para o caminho do tick; False se ele não estiver conectado"""
+        websocket = self.connections.get(player_id)
+        if websocket is None:
+            return False
+        # Não espera clientes lentos; uma conexão fechada é ignorada
+        websockets.broadcast((websocket,), json.dumps(message))
+        return True
+    
+    async def multicast(self, player_ids, message):
+        """Enviar a mesma mensagem, codificada uma vez, a vários jogadores"""
+        targets = [self.connections[pid] for pid in player_ids if pid in self.connections]
+        if targets:
+            # Não espera clientes lentos, nem com um só destino (sala de um jogador,
+            # alvo de um acerto); conexões fechadas são ignoradas
+            websockets.broadcast(targets, json.dumps(message))
         
     async def broadcast(self, message, exclude=None):
         """Enviar mensagem para todos os jogadores exceto o especificado"""
-        for pid, websocket in self.connections.items():
-            if pid != exclude:
-                try:
-                    await websocket.send(json.dumps(message))
-                except:
-                    pass
+        await self.multicast([pid for pid in self.connections if pid != exclude], message)
                 
     async def remove_player(self, websocket):
         """Remover jogador quando desconectar"""
-        if websocket in self.players:
-            player_id = self.players[websocket]['id']
-            del self.players[websocket]
-            
-            # Notificar outros sobre a desconexão
-            message = json.dumps({
+        player = self.leave(websocket)
+        # Se o jogador já entrou por outra conexão, ele não saiu
+        if player and player['id'] not in self.connections:
+            # Notificar a sala sobre a desconexão
+            await self.route({
                 'type': 'player_left',
-                'player_id': player_id
-            })
-            await self.broadcast(message)
+                'player_id': player['id']
+            }, room=player['room'])
+            
+    async def handle_message(self, websocket, data):
+        """Despachar uma mensagem do cliente para o handler do seu tipo"""
+        message_type = data.get('type', '')
+        
+        if message_type == 'login':
+            await self.login(websocket, data)
+        elif message_type == 'position':
+            await self.update_position(websocket, data)
+        elif message_type == 'respawn':
+            await self.handle_respawn(websocket, data)
+        elif message_type == 'shot':
+            await self.handle_shot(websocket, data)
+        elif message_type == 'damage':
+            await self.handle_damage(websocket, data)
+        elif message_type == 'stats_batch':
+            await self.handle_stats_batch(websocket, data)
+        elif message_type == 'subscribe_feed':
+            await self.subscribe_feed(websocket, data)
+        elif message_type == 'ping':
+            await websocket.send(json.dumps({
+                'type': 'pong',
+                'client_time': data.get('client_time'),
+                'server_time': time.time()
+            }))
+        else:
+            logging.warning(f"Tipo de mensagem desconhecido: {message_type}")
             
     async def handle_connection(self, websocket, path):
         """Gerenciar conexão com cliente"""
@@ -292,19 +888,14 @@ class GameServer:
             async for message in websocket:
                 try:
                     data = json.loads(message)
-                    message_type = data.get('type', '')
-                    logging.debug(f"Mensagem recebida de {client_id}: {message_type}")
+                    logging.debug(f"Mensagem recebida de {client_id}: {data.get('type', '')}")
                     
-                    if message_type == 'login':
-                        await self.login(websocket, data)
-                    elif message_type == 'position':
-                        await self.update_position(websocket, data)
-                    elif message_type == 'shot':
-                        await self.handle_shot(websocket, data)
-                    elif message_type == 'damage':
-                        await self.handle_damage(websocket, data)
+                    if data.get('type') == 'batch':
+                        # Várias mensagens enviadas pelo cliente no mesmo frame
+                        for item in data.get('messages', []):
+                            await self.handle_message(websocket, item)
                     else:
-                        logging.warning(f"Tipo de mensagem desconhecido: {message_type}")
+                        await self.handle_message(websocket, data)
                         
                 except json.JSONDecodeError:
                     logging.error(f"Mensagem inválida recebida de {client_id}")
@@ -314,6 +905,7 @@ class GameServer:
         except websockets.exceptions.ConnectionClosed:
             logging.info(f"Conexão fechada: {client_id}")
         finally:
+            self.feeds.discard(websocket)
             await self.remove_player(websocket)
             logging.info(f"Cliente removido: {client_id}")
 
@@ -321,7 +913,7 @@ async def main():
     server = GameServer()
     print(f"Iniciando servidor em {HOST}:{PORT}")
     async with websockets.serve(server.handle_connection, HOST, PORT):
-        await asyncio.Future()  # Executar indefinidamente
+        await server.run_ticks()  # Executar indefinidamente
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
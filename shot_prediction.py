@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict, deque
+
+# Respostas do servidor casadas com as predições
+REPLIES = ("shot_ack", "hit_ack")
+
+
+class PredictedShot:
+    """Tiro mostrado localmente antes da confirmação do servidor"""
+
+    def __init__(self, seq, tick, fired_at, position, direction):
+        self.seq = seq
+        self.tick = tick  # Passo fixo do modelo de voo em que o tiro saiu
+        self.fired_at = fired_at
+        self.position = position
+        self.direction = direction
+        self.accepted = None  # None até o shot_ack
+        self.visual = None  # Projétil local, removido se o servidor rejeitar
+        self.hits = {}  # {alvo: (dano previsto, horário)} aguardando hit_ack
+
+
+class HitMarker:
+    def __init__(self, time, seq, target_id):
+        self.time = time
+        self.seq = seq
+        self.target_id = target_id
+        self.state = "predicted"  # "confirmed" ou "rejected" depois do hit_ack
+
+
+class ShotPredictor:
+    """Tiros e acertos previstos pelo cliente até o servidor responder
+
+    Cada tiro recebe uma sequência crescente; o servidor responde shot_ack
+    com a mesma sequência, e cada acerto reportado recebe um hit_ack. Uma
+    resposta que não chega em `timeout` conta como rejeição, para que o
+    que foi previsto seja desfeito mesmo se a conexão cair.
+    """
+
+    def __init__(self, timeout=1.0, retain=4.0, marker_duration=0.4):
+        self.timeout = timeout
+        self.retain = retain  # Tempo que um tiro confirmado ainda pode acertar algo
+        self.marker_duration = marker_duration
+        self.seq = 0
+        self.shots = OrderedDict()  # {seq: PredictedShot}
+        self.markers = deque(maxlen=8)
+
+    def fire(self, tick, position, direction, now=None):
+        self.seq += 1
+        shot = PredictedShot(self.seq, tick, now or time.time(), position, direction)
+        self.shots[shot.seq] = shot
+        return shot
+
+    def predict_hit(self, seq, target_id, amount, now=None):
+        """Registrar um acerto previsto; None se o tiro não estiver mais sendo acompanhado"""
+        shot = self.shots.get(seq)
+        if shot is None or shot.accepted is False:
+            return None
+        now = now or time.time()
+        shot.hits[target_id] = (amount, now)
+        self.markers.append(HitMarker(now, seq, target_id))
+        return shot
+
+    def resolve_shot(self, seq, accepted):
+        """Aplicar um shot_ack; None se o tiro já foi resolvido ou é desconhecido"""
+        shot = self.shots.get(seq)
+        if shot is None or shot.accepted is not None:
+            return None
+        shot.accepted = accepted
+        return shot
+
+    def resolve_hit(self, seq, target_id, accepted):
+        """Aplicar um hit_ack; retorna (tiro, dano previsto) ou None se não havia predição"""
+        shot = self.shots.get(seq)
+        if shot is None or target_id not in shot.hits:
+            return None
+        amount, _ = shot.hits.pop(target_id)
+        for marker in self.markers:
+            if marker.seq == seq and marker.target_id == target_id:
+                marker.state = "confirmed" if accepted else "rejected"
+        return shot, amount
+
+    def expire(self, now=None):
+        """Respostas que não chegaram a tempo, como rejeições; descarta tiros antigos"""
+        now = now or time.time()
+        lost = []
+        for seq, shot in list(self.shots.items()):
+            if shot.accepted is None and now - shot.fired_at > self.timeout:
+                lost.append({"type": "shot_ack", "seq": seq, "accepted": False, "reason": "timeout"})
+            for target_id, (_, predicted_at) in shot.hits.items():
+                if now - predicted_at > self.timeout:
+                    lost.append({
+                        "type": "hit_ack", "seq": seq, "target_id": target_id,
+                        "accepted": False, "amount": 0, "reason": "timeout"
+                    })
+            if now - shot.fired_at > self.retain and not shot.hits and shot.accepted is not None:
+                del self.shots[seq]
+        return lost
+
+    def active_markers(self, now=None):
+        """Estados dos marcadores de acerto recentes que não foram rejeitados"""
+        now = now or time.time()
+        return [
+            marker.state for marker in self.markers
+            if marker.state != "rejected" and now - marker.time <= self.marker_duration
+        ]
@@ -0,0 +1,127 @@
+import math
+from collections import Counter
+import numpy as np
+from movement_validation import vec3
+
+
+class ShotValidator:
+    """Decisão do servidor sobre tiros e acertos já mostrados pelos clientes
+
+    Um tiro vale se respeita a cadência e sai de perto da posição validada
+    de quem atirou. Um acerto vale uma vez por tiro, e só se o alvo, pelo
+    histórico de posições do servidor recuado até o horário do tiro, passou
+    perto da trajetória do projétil. Os contadores ficam em `counters`.
+    """
+
+    def __init__(self, max_speed, min_interval=0.15, projectile_speed=200.0, lifetime=3.0, hit_radius=3.0,
+                 max_damage=25.0, max_rewind=0.5, tolerance=1.5, slack=5.0):
+        self.max_speed = max_speed  # m/s, o mesmo limite da validação de movimento
+        self.min_interval = min_interval  # Menor intervalo entre tiros, com folga para jitter
+        self.projectile_speed = projectile_speed
+        self.lifetime = lifetime
+        self.hit_radius = hit_radius
+        self.max_damage = max_damage
+        self.max_rewind = max_rewind  # Atraso máximo compensado entre o cliente e o servidor
+        self.tolerance = tolerance
+        self.slack = slack  # Metros de folga na origem do tiro (o projétil sai à frente da aeronave)
+        self.counters = Counter()
+
+    def server_time(self, player, client_time, now):
+        """Horário do servidor de um evento marcado com o relógio do cliente"""
+        if not math.isfinite(client_time) or player['client_time'] is None:
+            return now
+        estimate = player['validated_at'] + (client_time - player['client_time'])
+        return min(max(estimate, now - self.max_rewind), now)
+
+    def check_shot(self, player, position, direction, client_time, now):
+        """Validar um tiro; retorna (tiro, None) ou (None, motivo)"""
+        self.counters["shots"] += 1
+        origin = np.array(vec3(position))
+        direction = np.array(vec3(direction))
+        norm = np.linalg.norm(direction)
+        if not (np.isfinite(origin).all() and 0.5 < norm < 1.5):
+            self.counters["shots_invalid"] += 1
+            return None, 'invalid'
+        direction /= norm
+
+        # Cadência pelo relógio do cliente, imune ao jitter de chegada
+        fired_at = client_time if math.isfinite(client_time) else now
+        if player['last_shot'] is not None and fired_at - player['last_shot'] < self.min_interval:
+            self.counters["shots_rate"] += 1
+            return None, 'rate'
+
+        # Origem perto da última posição aceita, extrapolada até agora
+        if player['validated_at'] is not None:
+            elapsed = min(now - player['validated_at'], self.max_rewind)
+            expected = np.array(player['position']) + np.array(player['velocity']) * elapsed
+            allowed = self.max_speed * self.tolerance * self.max_rewind + self.slack
+            if np.linalg.norm(origin - expected) > allowed:
+                self.counters["shots_origin"] += 1
+                return None, 'origin'
+
+        player['last_shot'] = fired_at
+        return {
+            'time': self.server_time(player, client_time, now),
+            'origin': origin,
+            'direction': direction,
+            'hit': False
+        }, None
+
+    def check_hit(self, shot, shooter, target, amount, now):
+        """Validar um acerto do tiro; retorna (dano, None) ou (None, motivo)"""
+        self.counters["hits"] += 1
+        if shot is None:
+            reason = 'unknown_shot'
+        elif shot['hit']:
+            reason = 'duplicate'
+        elif target is None or target is shooter or target['room'] != shooter['room']:
+            reason = 'target'
+        elif now - shot['time'] > self.lifetime + 2 * self.max_rewind:
+            reason = 'expired'
+        elif not self.crossed(shot, target, now):
+            reason = 'miss'
+        else:
+            try:
+                damage = min(max(float(amount), 0.0), self.max_damage)
+            except (TypeError, ValueError):
+                damage = self.max_damage
+            return damage, None
+        self.counters["hits_" + reason] += 1
+        return None, reason
+
+    def crossed(self, shot, target, now):
+        """Se o alvo passou perto da trajetória do projétil enquanto ele voava"""
+        history = target['history']
+        if history:
+            samples = np.array(history)  # (N, 7): horário, posição, velocidade
+        else:
+            samples = np.array([[now, *target['position'], *target['velocity']]])
+
+        # Posições do voo, recuadas até o tiro; sem nenhuma, vale a mais recente
+        start = shot['time'] - self.max_rewind
+        window = (samples[:, 0] >= start) & (samples[:, 0] <= shot['time'] + self.lifetime)
+        if window.any():
+            # Mais a amostra anterior à janela, onde o alvo estava quando o tiro saiu
+            first = int(np.argmax(window))
+            window[max(first - 1, 0)] = True
+            samples = samples[window]
+        else:
+            samples = samples[-1:]
+        times, positions, velocities = samples[:, 0], samples[:, 1:4], samples[:, 4:7]
+
+        # Onde o projétil passou mais perto de cada amostra, e quando
+        relative = positions - shot['origin']
+        along = np.clip(relative @ shot['direction'], 0.0, self.projectile_speed * self.lifetime)
+        arrival = shot['time'] + along / self.projectile_speed
+
+        # Alvo levado até a chegada do projétil pela velocidade informada
+        ahead = np.clip(arrival - times, 0.0, 1.0)
+        targets = positions + velocities * ahead[:, None]
+        relative = targets - shot['origin']
+        along = np.clip(relative @ shot['direction'], 0.0, self.projectile_speed * self.lifetime)
+        distance = np.linalg.norm(relative - along[:, None] * shot['direction'], axis=1)
+
+        # O projétil precisa ter tido tempo de chegar lá antes do aviso
+        reached = shot['time'] + along / self.projectile_speed <= now + self.max_rewind
+        allowed = self.hit_radius * self.tolerance + self.max_speed * self.tolerance * self.max_rewind
+        return bool(np.any(reached & (distance <= allowed)))
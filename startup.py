@@ -0,0 +1,145 @@
+import time
+from Range import logic
+import network_session
+
+
+class StartupPipeline:
+    """Conexão e carga da partida em paralelo com a tela de login
+
+    A conexão começa junto com a tela de login. A cena da partida é
+    adicionada em segundo plano, roda o start (que pré-cria pools) e fica
+    suspensa e escondida; bibliotecas extras são carregadas com LibLoad
+    assíncrono. A troca só acontece com o login feito e a partida carregada,
+    então o tempo até voar é o do mais lento dos dois, e não a soma.
+    """
+
+    def __init__(self, cena_jogo="GameScene", bibliotecas=(), timeout_cena=15.0):
+        self.cena_jogo = cena_jogo
+        self.bibliotecas = list(bibliotecas)
+        self.timeout_cena = timeout_cena
+        self.inicio = None
+        self.client = None
+        self.connect_future = None
+        self.carregamentos = []  # Status dos LibLoad assíncronos
+        self.cena = None
+        self.suspensa = False
+        self.no_jogo = False
+        self.substituida = False  # Troca pelo caminho antigo depois do timeout
+        self.cena_aceita = False  # Alguma GameScene já foi aceita depois da troca
+        self.marcos = {}  # {etapa: segundos desde o início}
+
+    def begin(self):
+        """Iniciar conexão e carga; chamadas seguintes não fazem nada"""
+        if self.inicio is not None:
+            return
+        self.inicio = time.time()
+
+        self.client = network_session.get_client()
+        self.connect_future = self.client.connect_async()
+        self.connect_future.add_done_callback(lambda _: self.marcar("conexao"))
+
+        carregadas = logic.LibList()
+        for caminho in self.bibliotecas:
+            if caminho not in carregadas:
+                self.carregamentos.append(logic.LibLoad(caminho, "Mesh", **{"async": True}))
+
+        # A cena só existe a partir do próximo frame; update a encontra
+        logic.addScene(self.cena_jogo, 0)
+
+    def marcar(self, etapa):
+        if etapa not in self.marcos:
+            self.marcos[etapa] = time.time() - self.inicio
+
+    def update(self):
+        """Acompanhar a carga; chamado a cada frame pela tela de login"""
+        if self.inicio is None or self.no_jogo:
+            return
+
+        if self.cena is None:
+            for cena in logic.getSceneList():
+                if cena.name == self.cena_jogo:
+                    self.cena = cena
+                    self._esconder(True)
+                    break
+
+        # Suspender só depois do start da GameScene, que marca a cena como carregada
+        if self.cena is not None and not self.suspensa and self.cena.get("carregada"):
+            self.cena.suspend()
+            self.suspensa = True
+            self.marcar("cena")
+
+        if all(status.finished for status in self.carregamentos):
+            self.marcar("bibliotecas")
+
+    def _esconder(self, esconder):
+        """Esconder a cena em segundo plano atrás de uma viewport de 1 pixel"""
+        camera = self.cena.active_camera
+        if camera is None:
+            return
+        if esconder:
+            camera.setViewport(0, 0, 1, 1)
+        camera.useViewport = esconder
+
+    def aceitar_cena(self, cena):
+        """Chamado pelo start da GameScene; False se ela deve ser encerrada
+
+        Depois da troca pelo caminho antigo, um addScene em segundo plano
+        ainda pendente pode criar uma segunda GameScene; só a primeira que
+        começar fica.
+        """
+        if not self.substituida:
+            return True
+        if self.cena_aceita:
+            return False
+        self.cena_aceita = True
+        return True
+
+    def pronta(self):
+        return "cena" in self.marcos and "bibliotecas" in self.marcos
+
+    def progresso(self):
+        """Fração carregada, para a tela de login"""
+        partes = [1.0 if "cena" in self.marcos else 0.0]
+        partes.extend(status.progress for status in self.carregamentos)
+        return sum(partes) / len(partes)
+
+    def enter_game(self, cena_login):
+        """Trocar para a partida se ela estiver pronta; retorna True ao trocar"""
+        if self.no_jogo:
+            return True
+
+        if not self.pronta():
+            # Sem a partida pronta a tempo, carregar do jeito antigo
+            if time.time() - self.inicio > self.timeout_cena:
+                print(f"Aviso: {self.cena_jogo} não carregou em segundo plano, trocando de cena")
+                if self.cena is not None:
+                    # Adicionada mas sem terminar a carga: descartar antes de criar outra.
+                    # Marcada antes, para o on_remove dela não encerrar a sessão compartilhada
+                    self.cena["descartada"] = True
+                    self.cena.end()
+                    self.cena = None
+                self.substituida = True
+                self.no_jogo = True
+                cena_login.replace(self.cena_jogo)
+                return True
+            return False
+
+        self._esconder(False)
+        self.cena.resume()
+        cena_login.end()
+        self.no_jogo = True
+        self.marcar("jogo")
+        etapas = ", ".join(f"{etapa} {tempo:.2f} s" for etapa, tempo in self.marcos.items())
+        print(f"Partida iniciada ({etapas})")
+        return True
+
+
+_pipeline = None
+
+
+def get_pipeline(**kwargs):
+    """Pipeline de inicialização do processo, criado na primeira chamada"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = StartupPipeline(**kwargs)
+    return _pipeline
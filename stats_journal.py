@@ -0,0 +1,84 @@
+import time
+import uuid
+
+# Eventos aceitos pelo servidor: ["death", 1] para mortes sem atacante; pontos e
+# abates o servidor credita sozinho pelos acertos que ele validou
+KINDS = ("death",)
+
+
+class StatsJournal:
+    """Eventos de estatística do jogador local, guardados até o servidor confirmar
+
+    Cada evento recebe um número de sequência dentro do diário (identificado
+    por um uuid, para o servidor não confundir diários de instalações
+    diferentes). O diário vive em LocalStore, sobrevive a desconexões e é
+    enviado em lotes; só o ack do servidor remove eventos, e o servidor
+    ignora sequências já aplicadas, então reenviar um lote é seguro.
+    """
+
+    def __init__(self, store, player_id, batch_size=32, retry_interval=10.0):
+        self.store = store
+        self.player_id = player_id
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+
+        state = (store.data.get(player_id) or {}).get("journal") or {}
+        self.journal_id = state.get("id") or uuid.uuid4().hex
+        self.next_seq = state.get("next_seq", 1)
+        self.acked = state.get("acked", 0)
+        self.events = [event for event in state.get("events", []) if event[0] > self.acked]
+        self.in_flight = 0  # Última sequência enviada e ainda sem ack
+        self.sent_at = 0.0
+
+    def record(self, kind, amount=1, *extra):
+        """Acrescentar um evento; gravado em disco pela thread do LocalStore"""
+        if kind not in KINDS:
+            raise ValueError(f"Evento de estatística desconhecido: {kind}")
+        self.events.append([self.next_seq, kind, amount, *extra])
+        self.next_seq += 1
+        self._save()
+
+    def next_batch(self, now=None):
+        """Mensagem com o próximo lote, ou None se não houver o que enviar agora"""
+        if not self.events:
+            return None
+        now = now or time.time()
+        # Lote em voo: esperar o ack, reenviando só depois de retry_interval
+        if self.in_flight and now - self.sent_at < self.retry_interval:
+            return None
+
+        batch = self.events[:self.batch_size]
+        self.in_flight = batch[-1][0]
+        self.sent_at = now
+        return {
+            "type": "stats_batch",
+            "journal": self.journal_id,
+            "first_seq": batch[0][0],
+            "events": [event[1:] for event in batch]
+        }
+
+    def ack(self, seq):
+        """Descartar eventos confirmados até seq"""
+        if seq >= self.in_flight:
+            self.in_flight = 0
+        if seq <= self.acked:
+            return
+        self.acked = seq
+        self.events = [event for event in self.events if event[0] > seq]
+        self._save()
+
+    def retry_now(self):
+        """Permitir reenviar o lote em voo, por exemplo depois de reconectar"""
+        self.in_flight = 0
+
+    def pending(self):
+        return len(self.events)
+
+    def _save(self):
+        # Uma cópia nova a cada alteração, já que a gravação roda em outra thread
+        self.store.update(self.player_id, journal={
+            "id": self.journal_id,
+            "next_seq": self.next_seq,
+            "acked": self.acked,
+            "events": [list(event) for event in self.events]
+        })
@@ -4,10 +4,19 @@ import threading
 import time
 import uuid
 import os
+from collections import deque, OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from local_store import LocalStore
+from net_stats import NetStats
+from remote_players import RemotePlayerTable
+from stats_journal import StatsJournal
+from shot_prediction import ShotPredictor, REPLIES as SHOT_REPLIES
+import profiler
 
 class GameClient:
-    def __init__(self):
+    def __init__(self, auto_connect=True):
         self.ws = None
+        self.thread = None
         self.callbacks = {}
         self.connected = False
         self.should_run = True
@@ -15,60 +24,103 @@ class GameClient:
         self.reconnect_delay = 1.0
         self.max_reconnect_delay = 30.0
         self.timeout = 15  # Aumentado para 15 segundos
-        self.login_response = None
+        self.connect_timeout = 10
+        self.connect_future = None  # Concluído quando a conexão abre
+        self.login_future = None  # Concluído quando chega login_response
+        self.login_request = None  # request_id do login em andamento; outras respostas são ignoradas
+        self.credentials = None  # (email, senha) do último login aceito, reenviados ao reconectar
+        self.logged_in = False  # Se o servidor já aceitou o login nesta conexão
         self.server_url = "wss://they-lie-above.onrender.com"  # URL do servidor no Render
         self.offline_mode = True  # Começar em modo offline
-        self.players_data = {}  # Dados dos jogadores
         self.local_data_file = "player_data.json"
+        self.local_store = LocalStore(self.local_data_file)  # Gravação em segundo plano
+        self.players_data = self.local_store.data  # Dados dos jogadores
+        
+        # Diagnóstico de rede; trace e logs por mensagem só com TLA_DEBUG_NET=1
+        self.debug = os.getenv("TLA_DEBUG_NET") == "1"
+        self.stats = NetStats()
+        self.ping_interval = 2.0
+        self.last_ping = 0
+        
+        # Estimativa de diferença entre relógio local e do servidor
+        self.clock_offset = 0.0
+        self.clock_samples = deque(maxlen=32)
+        
+        # Fila de envio consumida por uma thread dedicada
+        self.max_send_queue = 256
+        self.send_interval = 1 / 60  # Espera máxima por um flush antes de enviar
+        self.send_queue = deque()
+        self.pending_positions = {}  # {player_id: mensagem}, só a mais recente é enviada
+        self.send_condition = threading.Condition()
+        self.dropped_messages = 0
+        self.sender_thread = threading.Thread(target=self._run_sender)
+        self.sender_thread.daemon = True
+        self.sender_thread.start()
+        
+        # Eventos recebidos na thread do WebSocket, processados no thread principal
+        self.inbound_events = deque()
+        self.pending_events = OrderedDict()  # Só acessado pelo thread principal
+        self.coalesced_events = {"position_update"}  # Só a mais recente por jogador importa
+        self.max_events_per_frame = 64
+        self.event_budget = 0.004  # Tempo máximo (s) de callbacks por frame
+        self.event_seq = 0
+        
+        # Jogadores remotos ativos, só em memória (não vão para player_data.json)
+        self.remote_players = RemotePlayerTable(timeout=30.0)
+        self.remote_players.on_expire(self._on_remote_player_expired)
+        self.tracked_events = {
+            "position_update", "player_left", "world_snapshot", "players_joined",
+            "interest_entered", "interest_left", *SHOT_REPLIES
+        }
+        self.radar = None  # Último feed de radar, substituído a cada publicação
+        
+        # Estatísticas: diário local enviado em lotes, confirmado pelo servidor
+        self.journal = None  # Criado no thread principal quando houver player_id
+        self.server_stats = {}  # Totais confirmados pelo servidor
+        self.stats_ack = None  # (diário, sequência) do último stats_ack recebido
+        self.stats_retry = False
+        self.stats_sync_interval = 5.0
+        self.last_stats_sync = 0
+        
+        # Tiros e acertos mostrados na hora, confirmados ou desfeitos pelo servidor
+        self.shots = ShotPredictor()
         
         # Carregar dados locais
         self.load_local_data()
         
         # Iniciar conexão
-        self.connect()
+        if auto_connect:
+            self.connect()
     
     def load_local_data(self):
         """Carregar dados salvos localmente"""
-        try:
-            if os.path.exists(self.local_data_file):
-                with open(self.local_data_file, 'r') as f:
-                    self.players_data = json.load(f)
-        except:
-            self.players_data = {}
+        self.players_data = self.local_store.load()
     
     def save_local_data(self):
-        """Salvar dados localmente"""
-        try:
-            with open(self.local_data_file, 'w') as f:
-                json.dump(self.players_data, f)
-        except:
-            print("Erro ao salvar dados locais")
+        """Agendar gravação dos dados locais em segundo plano"""
+        self.local_store.mark_dirty()
     
-    def connect(self):
-        """Conectar ao servidor"""
-        try:
-            websocket.enableTrace(True)  # Ativar debug
-            self.ws = websocket.WebSocketApp(
-                self.server_url,
-                on_open=self._on_open,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close
-            )
-            
+    def connect_async(self):
+        """Iniciar conexão sem bloquear; o Future é concluído pela thread do WebSocket"""
+        if self.connect_future and (not self.connect_future.done() or self.connected):
+            return self.connect_future
+        
+        self.connect_future = Future()
+        if self.connected:
+            self.connect_future.set_result(True)
+        elif not self.thread or not self.thread.is_alive():
             # Iniciar thread do WebSocket
             self.thread = threading.Thread(target=self._run_websocket)
             self.thread.daemon = True
             self.thread.start()
-            
-            # Esperar conexão inicial
-            start_time = time.time()
-            while not self.connected and time.time() - start_time < 10:  # 10 segundos para conectar
-                time.sleep(0.1)
-                
-            if not self.connected:
-                print("Timeout ao conectar ao servidor")
-                
+        return self.connect_future
+    
+    def connect(self):
+        """Conectar ao servidor, esperando até connect_timeout segundos"""
+        try:
+            self.connect_async().result(timeout=self.connect_timeout)
+        except FutureTimeoutError:
+            print("Timeout ao conectar ao servidor")
         except Exception as e:
             print(f"Erro ao conectar: {e}")
     
@@ -76,178 +128,532 @@ class GameClient:
         """Executar WebSocket em loop com reconexão"""
         while self.should_run:
             try:
+                websocket.enableTrace(self.debug)
+                self.ws = websocket.WebSocketApp(
+                    self.server_url,
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                    on_error=self._on_error,
+                    on_close=self._on_close
+                )
                 self.ws.run_forever()
-                if self.should_run:
-                    print("Conexão perdida. Tentando reconectar...")
-                    time.sleep(self.reconnect_delay)
-                    self.reconnect_delay = min(self.reconnect_delay * 1.5, self.max_reconnect_delay)
-                    self.connect()
             except Exception as e:
                 print(f"Erro no WebSocket: {e}")
+            
+            if self.should_run:
+                print("Conexão perdida. Tentando reconectar...")
+                self.stats.reconnects += 1
                 time.sleep(self.reconnect_delay)
+                self.reconnect_delay = min(self.reconnect_delay * 1.5, self.max_reconnect_delay)
     
     def _on_open(self, ws):
         """Callback quando conexão é estabelecida"""
         print("Conexão WebSocket estabelecida")
         self.connected = True
+        self.logged_in = False
         self.reconnect_delay = 1.0  # Reset do delay de reconexão
         self.offline_mode = False
         
-        # Sincronizar dados offline
-        if self.player_id:
-            self.sync_offline_data()
+        # O servidor não conhece esta conexão: refazer o login antes de
+        # qualquer outra mensagem; o diário é reenviado quando ele for aceito
+        if self.player_id and self.credentials:
+            self._relogin()
+        
+        if self.connect_future and not self.connect_future.done():
+            self.connect_future.set_result(True)
+    
+    def _relogin(self):
+        """Reenviar o último login aceito na frente da fila, sem Future"""
+        email, password = self.credentials
+        self.login_request = uuid.uuid4().hex
+        with self.send_condition:
+            self.send_queue.appendleft({
+                "type": "login",
+                "request_id": self.login_request,
+                "email": email,
+                "password": password
+            })
+            self.send_condition.notify()
     
     def _on_message(self, ws, message):
         """Callback quando mensagem é recebida"""
         try:
+            self.stats.incoming.add(len(message))
             data = json.loads(message)
             event_type = data.get("type")
             
+            if "server_time" in data:
+                self.update_clock_offset(data["server_time"])
+                self.stats.last_server_message = time.time()
+            
+            if event_type == "pong":
+                self.stats.record_rtt(time.time() - data.get("client_time", time.time()))
+                return
+            
+            if event_type == "stats_ack":
+                # Aplicado ao diário no thread principal, em flush
+                self.server_stats = data.get("stats", self.server_stats)
+                self.stats_ack = (data.get("journal"), data.get("seq", 0))
+                return
+            
+            if event_type == "stats_update":
+                # Totais alterados por um acerto validado pelo servidor
+                self.server_stats = data.get("stats", self.server_stats)
+                return
+            
+            if event_type == "radar":
+                # Lido pelo HUD na sua própria frequência; só o mais recente importa
+                self.radar = data
+                return
+            
             if event_type == "login_response":
-                print(f"Resposta de login recebida: {data}")
-                self.login_response = data
+                self.log(f"Resposta de login recebida: {data}")
+                if data.get("request_id") != self.login_request:
+                    # Resposta de uma tentativa já abandonada ou substituída
+                    self.log("Resposta de login antiga ignorada")
+                    return
+                self.login_request = None
                 if data.get("success"):
                     self.player_id = data.get("player_id")
-                    self.players_data[self.player_id] = {
-                        "email": data.get("email"),
-                        "last_login": time.time()
-                    }
-                    self.save_local_data()
+                    self.server_stats = data.get("stats") or {}
+                    self.logged_in = True
+                    # update, e não set: o diário de estatísticas fica na mesma entrada
+                    self.local_store.update(
+                        self.player_id,
+                        email=data.get("email"),
+                        last_login=time.time()
+                    )
+                    self.sync_offline_data()
+                elif not self.login_future or self.login_future.done():
+                    # Relogin recusado (senha trocada, conta removida): não insistir
+                    self.credentials = None
+                
+                if self.login_future and not self.login_future.done():
+                    self.login_future.set_result({
+                        "success": data.get("success", False),
+                        "player_id": data.get("player_id"),
+                        "error": data.get("error")
+                    })
             
-            if event_type in self.callbacks:
-                self.callbacks[event_type](data)
+            # Callbacks rodam no thread principal via process_events
+            if event_type in self.callbacks or event_type in self.tracked_events:
+                self.inbound_events.append(data)
         except Exception as e:
             print(f"Erro ao processar mensagem: {e}")
     
+    def log(self, message):
+        """Log de diagnóstico, só com o modo debug ligado"""
+        if self.debug:
+            print(message)
+    
+    def process_events(self):
+        """Executar callbacks dos eventos recebidos; chamado uma vez por frame"""
+        # Mover eventos para a fila local, coalescendo atualizações por jogador
+        while self.inbound_events:
+            data = self.inbound_events.popleft()
+            event_type = data.get("type")
+            if event_type in self.coalesced_events:
+                key = (event_type, data.get("player_id"))
+            else:
+                self.event_seq += 1
+                key = self.event_seq
+            self.pending_events[key] = data
+        
+        # Processar dentro do orçamento; o restante fica para o próximo frame
+        start_time = time.perf_counter()
+        processed = 0
+        while self.pending_events and processed < self.max_events_per_frame:
+            _, data = self.pending_events.popitem(last=False)
+            processed += 1
+            if data.get("type") in SHOT_REPLIES and not self._reconcile_shot(data):
+                continue
+            self._track_remote_player(data)
+            self._dispatch(data)
+            if time.perf_counter() - start_time > self.event_budget:
+                break
+        
+        # Respostas que não vieram a tempo desfazem a predição como uma rejeição
+        for data in self.shots.expire():
+            if self._reconcile_shot(data):
+                self._dispatch(data)
+        
+        # Expirar jogadores sem atualização; custo proporcional aos expirados
+        self.remote_players.expire()
+        return processed
+    
+    def _dispatch(self, data):
+        """Executar o callback registrado para o tipo do evento"""
+        callback = self.callbacks.get(data.get("type"))
+        if callback:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Erro ao processar evento {data.get('type')}: {e}")
+    
+    def _reconcile_shot(self, data):
+        """Casar shot_ack/hit_ack com a predição; False se não há nada a confirmar ou desfazer
+        
+        O callback recebe o PredictedShot em data["shot"] e, para acertos,
+        o dano previsto em data["predicted"].
+        """
+        if data["type"] == "shot_ack":
+            shot = self.shots.resolve_shot(data.get("seq"), bool(data.get("accepted")))
+            data["shot"] = shot
+            return shot is not None
+        
+        result = self.shots.resolve_hit(data.get("seq"), data.get("target_id"), bool(data.get("accepted")))
+        if result is None:
+            return False
+        data["shot"], data["predicted"] = result
+        return True
+    
+    def _track_remote_player(self, data):
+        """Manter a tabela de jogadores remotos a partir dos eventos"""
+        event_type = data.get("type")
+        if event_type in ("world_snapshot", "players_joined", "interest_entered"):
+            for entry in data.get("players", ()):
+                if entry["player_id"] != self.player_id:
+                    self.remote_players.update(entry["player_id"], {
+                        "position": entry.get("position"),
+                        "rotation": entry.get("rotation"),
+                        "velocity": entry.get("velocity")
+                    })
+            return
+        if event_type == "interest_left":
+            # Fora do raio de interesse: só o radar continua mostrando
+            for player_id in data.get("player_ids", ()):
+                self.remote_players.remove(player_id)
+            return
+        
+        player_id = data.get("player_id")
+        if not player_id or player_id == self.player_id:
+            return
+        
+        if event_type == "position_update":
+            self.remote_players.update(player_id, {
+                "position": data.get("position"),
+                "rotation": data.get("rotation"),
+                "velocity": data.get("velocity")
+            })
+        elif event_type == "player_left":
+            self.remote_players.remove(player_id)
+    
+    def _on_remote_player_expired(self, player_id, data):
+        """Tratar expiração como se o servidor tivesse avisado a saída"""
+        self._dispatch({"type": "player_left", "player_id": player_id, "expired": True})
+    
+    def update_clock_offset(self, server_time):
+        """Atualizar a diferença de relógio com um novo horário do servidor"""
+        # O menor atraso observado na janela é a amostra com menos latência
+        self.clock_samples.append(time.time() - server_time)
+        self.clock_offset = min(self.clock_samples)
+    
+    def server_time(self):
+        """Horário estimado do servidor"""
+        return time.time() - self.clock_offset
+    
     def _on_error(self, ws, error):
         """Callback quando ocorre erro"""
         print(f"Erro WebSocket: {error}")
         self.offline_mode = True
         self.connected = False
+        self.logged_in = False
     
     def _on_close(self, ws, close_status_code, close_msg):
         """Callback quando conexão é fechada"""
         print(f"Conexão WebSocket fechada: {close_status_code} - {close_msg}")
         self.offline_mode = True
         self.connected = False
+        self.logged_in = False
+        if close_status_code == 4001:
+            # Sessão assumida por outro login; refazer o login a derrubaria de volta
+            self.credentials = None
+    
+    def login_async(self, email, password):
+        """Enviar login sem bloquear; o Future recebe o resultado do servidor
+        
+        Cancelar o Future desiste da tentativa: se a conexão ainda não abriu,
+        o login não é enviado, e uma resposta atrasada não o resolve.
+        """
+        # Um login novo substitui o anterior, que não recebe mais resposta
+        if self.login_future and not self.login_future.done():
+            self.login_future.cancel()
+        
+        future = Future()
+        request_id = uuid.uuid4().hex
+        self.login_future = future
+        self.login_request = request_id
+        
+        login_data = {
+            "type": "login",
+            "request_id": request_id,
+            "email": email,
+            "password": password
+        }
+        
+        def send_login(_=None):
+            if future.done():
+                return
+            self.log("Enviando requisição de login...")
+            if not self.send_message(login_data):
+                if not future.done():
+                    future.set_result({"success": False, "error": "Falha ao enviar login"})
+                return
+            # Pode rodar na thread do WebSocket; só acordar o envio
+            self._wake_sender()
+        
+        def remember(done):
+            # Guardadas só em memória, para o relogin depois de uma reconexão
+            if not done.cancelled() and done.result().get("success"):
+                self.credentials = (email, password)
+        future.add_done_callback(remember)
+        
+        # Se a conexão ainda está abrindo, enviar assim que ela abrir
+        if self.connected:
+            send_login()
+        else:
+            self.connect_async().add_done_callback(send_login)
+        return future
     
     def login(self, email, password):
-        """Login no servidor"""
+        """Login no servidor, esperando até timeout segundos pela resposta"""
         if not self.connected:
             return {"success": False, "error": "Não conectado ao servidor"}
         
+        future = self.login_async(email, password)
         try:
-            # Resetar resposta de login anterior
-            self.login_response = None
-            
-            # Enviar requisição de login
-            login_data = {
-                "type": "login",
-                "email": email,
-                "password": password
-            }
-            
-            print("Enviando requisição de login...")
-            if not self.send_message(login_data):
-                return {"success": False, "error": "Falha ao enviar login"}
-            
-            # Esperar resposta
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
-                if self.login_response:
-                    response = self.login_response
-                    self.login_response = None
-                    return {
-                        "success": response.get("success", False),
-                        "player_id": response.get("player_id"),
-                        "error": response.get("error")
-                    }
-                time.sleep(0.1)
-            
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
             return {"success": False, "error": "Timeout esperando resposta do servidor"}
-            
         except Exception as e:
             print(f"Erro no login: {e}")
             return {"success": False, "error": str(e)}
     
     def sync_offline_data(self):
-        """Sincronizar dados offline com servidor"""
-        if not self.connected or not self.player_id:
+        """Reenviar o diário de estatísticas no próximo flush (após reconectar)"""
+        self.stats_retry = True
+        self.last_stats_sync = 0
+    
+    def _get_journal(self):
+        if self.journal is None or self.journal.player_id != self.player_id:
+            self.journal = StatsJournal(self.local_store, self.player_id)
+        return self.journal
+    
+    def record_stat(self, kind, amount=1, *extra):
+        """Registrar um evento de estatística (só "death", sem atacante) no diário local"""
+        if not self.player_id:
             return
-            
-        try:
-            self.send_message({
-                "type": "sync",
-                "player_id": self.player_id,
-                "data": self.players_data.get(self.player_id, {})
-            })
-        except:
-            pass
+        journal = self._get_journal()
+        journal.record(kind, amount, *extra)
+        if journal.pending() >= journal.batch_size:
+            self.last_stats_sync = 0
+    
+    def get_stats(self):
+        """Totais confirmados pelo servidor somados aos eventos ainda não confirmados"""
+        stats = {"score": 0, "kills": 0, "deaths": 0}
+        stats.update(self.server_stats)
+        if self.journal:
+            stats["deaths"] += sum(1 for event in self.journal.events if event[1] == "death")
+        return stats
+    
+    def _sync_stats(self):
+        """Aplicar acks e enviar o próximo lote do diário, no máximo a cada stats_sync_interval"""
+        if not self.player_id:
+            return
+        journal = self._get_journal()
+        
+        ack, self.stats_ack = self.stats_ack, None
+        if ack and ack[0] == journal.journal_id:
+            journal.ack(ack[1])
+        if self.stats_retry:
+            self.stats_retry = False
+            journal.retry_now()
+        
+        now = time.time()
+        # Lotes de uma conexão sem login seriam descartados pelo servidor
+        if not self.logged_in or now - self.last_stats_sync < self.stats_sync_interval:
+            return
+        batch = journal.next_batch(now)
+        if batch and self.send_message(batch):
+            self.last_stats_sync = now
     
     def send_message(self, message):
-        """Enviar mensagem com retry"""
+        """Enfileirar mensagem para a thread de envio"""
         if not self.connected:
-            print("Não conectado ao servidor")
             return False
+        
+        with self.send_condition:
+            if len(self.send_queue) >= self.max_send_queue:
+                self._drop_message()
+                return False
+            self.send_queue.append(message)
+        return True
+    
+    def _drop_message(self):
+        """Contabilizar mensagem descartada por fila cheia"""
+        self.dropped_messages += 1
+        if self.dropped_messages == 1 or self.dropped_messages % 100 == 0:
+            print(f"Fila de envio cheia: {self.dropped_messages} mensagens descartadas")
+    
+    def flush(self):
+        """Enviar lotes pendentes e acordar a thread de envio; chamado uma vez por frame"""
+        self._sync_stats()
+        self._wake_sender()
+    
+    def _wake_sender(self):
+        with self.send_condition:
+            self.send_condition.notify()
+    
+    def _run_sender(self):
+        """Enviar tudo que foi enfileirado em um frame numa única escrita"""
+        while self.should_run:
+            with self.send_condition:
+                if not self.send_queue and not self.pending_positions:
+                    self.send_condition.wait(self.send_interval)
+                messages = list(self.send_queue)
+                messages.extend(self.pending_positions.values())
+                self.send_queue.clear()
+                self.pending_positions.clear()
             
-        try:
-            print(f"Enviando mensagem: {message}")
-            self.ws.send(json.dumps(message))
-            return True
-        except Exception as e:
-            print(f"Erro ao enviar mensagem: {e}")
-            self.connected = False
-            self.offline_mode = True
-            return False
+            if not self.connected:
+                continue
+            
+            # Ping periódico para medir RTT, junto com o restante do frame
+            now = time.time()
+            if now - self.last_ping >= self.ping_interval:
+                messages.append({"type": "ping", "client_time": now})
+                self.last_ping = now
+            
+            if not messages:
+                continue
+            
+            if len(messages) == 1:
+                payload = messages[0]
+            else:
+                payload = {"type": "batch", "messages": messages}
+            
+            try:
+                encoded = json.dumps(payload)
+                self.ws.send(encoded)
+                self.stats.outgoing.add(len(encoded), len(messages))
+            except Exception as e:
+                print(f"Erro ao enviar mensagem: {e}")
+                self.connected = False
+                self.offline_mode = True
     
-    def update_position(self, player_id, position, rotation):
+    def update_position(self, player_id, position, rotation, velocity=None, health=None):
         """Atualizar posição do jogador"""
         if not self.connected:
             return
         
-        self.players_data[player_id]["position"] = position
-        self.players_data[player_id]["rotation"] = rotation
-        self.players_data[player_id]["last_update"] = time.time()
+        self.local_store.update(
+            player_id,
+            position=position,
+            rotation=rotation,
+            last_update=time.time()
+        )
         
-        self.send_message({
+        message = {
             "type": "position",
             "player_id": player_id,
             "position": position,
-            "rotation": rotation
-        })
+            "rotation": rotation,
+            "time": time.time()  # Validado pelo servidor como sempre crescente
+        }
+        if velocity is not None:
+            message["velocity"] = velocity
+        if health is not None:
+            message["health"] = health
+        
+        # Posições antigas ainda não enviadas são substituídas pela nova
+        with self.send_condition:
+            self.pending_positions[player_id] = message
     
-    def send_shot(self, player_id, position, direction):
-        """Enviar informação de tiro"""
+    def send_respawn(self, position, rotation):
+        """Pedir ao servidor o teleporte de volta ao ponto de spawn"""
         if not self.connected:
             return
         
+        self.send_message({
+            "type": "respawn",
+            "position": position,
+            "rotation": rotation,
+            "time": time.time()
+        })
+    
+    def send_shot(self, player_id, position, direction, tick=0):
+        """Enviar tiro; retorna o PredictedShot a ser confirmado, ou None offline"""
+        if not self.connected:
+            return None
+        
+        shot = self.shots.fire(tick, position, direction)
         self.send_message({
             "type": "shot",
             "player_id": player_id,
+            "seq": shot.seq,
+            "tick": tick,
+            "time": shot.fired_at,
             "position": position,
             "direction": direction
         })
+        return shot
     
-    def get_other_players(self):
-        """Obter outros jogadores"""
-        current_time = time.time()
-        active_players = {}
-        
-        for pid, data in self.players_data.items():
-            if pid != self.player_id:
-                if current_time - data.get("last_update", 0) < 30:  # 30 segundos timeout
-                    active_players[pid] = data
+    def send_damage(self, target_id, amount, seq=None):
+        """Reportar acerto do tiro seq; True se o acerto aguarda confirmação do servidor"""
+        if not self.connected:
+            return False
         
-        return active_players
+        predicted = seq is not None and self.shots.predict_hit(seq, target_id, amount) is not None
+        self.send_message({
+            "type": "damage",
+            "seq": seq,
+            "target_id": target_id,
+            "amount": amount
+        })
+        return predicted
+    
+    def get_net_stats(self):
+        """Resumo dos contadores de rede para o HUD"""
+        msgs_in, bytes_in = self.stats.incoming.rates()
+        msgs_out, bytes_out = self.stats.outgoing.rates()
+        return {
+            "rtt": self.stats.rtt,
+            "msgs_in": msgs_in,
+            "bytes_in": bytes_in,
+            "msgs_out": msgs_out,
+            "bytes_out": bytes_out,
+            "send_queue": len(self.send_queue) + len(self.pending_positions),
+            "dropped": self.dropped_messages,
+            "reconnects": self.stats.reconnects,
+            "tick_age": self.stats.server_tick_age()
+        }
+    
+    def get_radar(self):
+        """Último feed de radar do servidor, ou None"""
+        return self.radar
+    
+    def get_hit_markers(self):
+        """Estados dos marcadores de acerto recentes, para o HUD"""
+        return self.shots.active_markers()
+    
+    def get_other_players(self):
+        """Obter outros jogadores ativos ({player_id: dados}, somente leitura)"""
+        return self.remote_players.players
+    
+    def get_remote_player(self, player_id):
+        """Dados de um jogador remoto ativo, ou None"""
+        return self.remote_players.get(player_id)
     
     def on(self, event_type, callback):
         """Registrar callback para tipo de evento"""
-        self.callbacks[event_type] = callback
+        self.callbacks[event_type] = profiler.wrap("net." + event_type, callback)
     
     def close(self):
         """Fechar conexão e salvar dados"""
         self.should_run = False
+        self.flush()
         if self.ws:
             self.ws.close()
-        self.save_local_data()
+        self.local_store.close()
         self.connected = False 
\ No newline at end of file